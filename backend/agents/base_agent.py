@@ -5,9 +5,12 @@
 Agent基类
 """
 
+import asyncio
+import time
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from typing import AsyncIterator, Dict, Any, Optional, Tuple
 from langchain_core.runnables import Runnable
+from backend.utils.model_manager import model_manager
 
 
 class BaseAgent(ABC):
@@ -15,6 +18,10 @@ class BaseAgent(ABC):
     所有Agent的基类，定义了Agent的基本接口和通用功能
     """
     
+    # 模型配置缓存的有效期（秒）和最大条目数
+    MODEL_CONFIG_TTL = 5.0
+    MODEL_CONFIG_CACHE_SIZE = 10000
+    
     def __init__(self, name: str):
         """
         初始化Agent
@@ -26,6 +33,9 @@ class BaseAgent(ABC):
         self.description = ""
         self.chain: Optional[Runnable] = None
         
+        # (Agent类型, 用户ID) -> (过期时间, 模型配置)
+        self._model_config_cache: Dict[Tuple[str, str], Tuple[float, Dict[str, Any]]] = {}
+        
     @abstractmethod
     def process(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -38,6 +48,64 @@ class BaseAgent(ABC):
             Dict[str, Any]: 处理结果
         """
         pass
+    
+    async def aprocess(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        异步处理输入数据，默认在线程池中执行同步的process，
+        需要真正异步I/O的子类可以重写该方法
+        
+        Args:
+            input_data (Dict[str, Any]): 输入数据
+            
+        Returns:
+            Dict[str, Any]: 处理结果
+        """
+        return await asyncio.to_thread(self.process, input_data)
+    
+    async def process_stream(self, input_data: Dict[str, Any]) -> AsyncIterator[str]:
+        """
+        流式处理输入数据，默认一次性产出aprocess的完整响应，
+        支持逐段生成的子类可以重写该方法
+        
+        Args:
+            input_data (Dict[str, Any]): 输入数据
+            
+        Yields:
+            str: 响应文本片段
+        """
+        result = await self.aprocess(input_data)
+        yield result.get('response', '')
+    
+    def get_model_config(self, agent_type: str, user_id: str) -> Dict[str, Any]:
+        """
+        获取用户的模型配置（支持A/B测试），结果在短时间内缓存，
+        避免高频请求重复解析同一用户的配置
+        
+        Args:
+            agent_type (str): Agent类型 (edu_agent, emotion_agent, safety_agent)
+            user_id (str): 用户ID
+            
+        Returns:
+            Dict[str, Any]: 模型配置
+        """
+        key = (agent_type, user_id)
+        now = time.monotonic()
+        entry = self._model_config_cache.get(key)
+        if entry is not None and entry[0] > now:
+            return entry[1]
+        
+        config = model_manager.get_agent_model_config(agent_type, user_id)
+        
+        # 缓存满时先清除过期条目，仍然已满则整体清空
+        if len(self._model_config_cache) >= self.MODEL_CONFIG_CACHE_SIZE:
+            self._model_config_cache = {
+                k: v for k, v in self._model_config_cache.items() if v[0] > now
+            }
+            if len(self._model_config_cache) >= self.MODEL_CONFIG_CACHE_SIZE:
+                self._model_config_cache.clear()
+        
+        self._model_config_cache[key] = (now + self.MODEL_CONFIG_TTL, config)
+        return config
         
     def get_name(self) -> str:
         """
@@ -5,33 +5,43 @@
 教育Agent
 """
 
+import functools
 from typing import Dict, Any
-from backend.agents.base_agent import BaseAgent
+from backend.agents.llm_agent import LLMAgent
 from backend.utils.config_loader import config_loader
-from backend.utils.model_manager import model_manager
-from langchain.llms import Ollama
-from langchain.prompts import PromptTemplate
-from langchain.chains import LLMChain
+from backend.utils.keyword_index import LeadCharIndex
 
 
-class EduAgent(BaseAgent):
+class EduAgent(LLMAgent):
     """
     教育Agent负责处理与教育相关的问题
     """
     
+    # 备用响应规则：(关键词, 响应)，按顺序匹配第一个命中的关键词
+    _FALLBACK_RULES = (
+        ('你好', '你好！我是你的学习助手，有什么我可以帮你的吗？'),
+        ('数学', '数学是一门研究数量、结构、空间以及变化等概念的学科。你想了解数学的哪个方面呢？'),
+        ('语文', '语文是学习语言文字运用的课程，包括听说读写各个方面。你想练习哪一部分呢？'),
+        ('英语', '英语是世界上使用最广泛的语言之一。学习英语可以帮助你与世界各地的人交流。'),
+    )
+    _FALLBACK_DEFAULT = '我是你的教育助手，我可以帮助你解答学习中的问题。请问你想了解什么内容呢？'
+    
+    # 按关键词首字符分组的规则索引，只检查首字符出现在文本中的关键词
+    _FALLBACK_INDEX = LeadCharIndex(
+        (keyword, index) for index, (keyword, _) in enumerate(_FALLBACK_RULES)
+    )
+    
+    AGENT_TYPE = "edu_agent"
+    DEFAULT_TEMPERATURE = 0.7
+    CACHE_NAMESPACE_FIELD = "grade"
+    
+    # 按问题长度分档攒批（每档字符数、档位数），使同一批次的预期输出长度相近，
+    # 避免短回答等待同批中的长回答
+    LENGTH_BIN_SIZE = 64
+    LENGTH_BIN_COUNT = 4
+    
     def __init__(self):
         """初始化教育Agent"""
-        super().__init__("EduAgent")
-        self.set_description("负责处理教育相关问题的Agent")
-        
-        # 获取模型配置（支持A/B测试）
-        self.model_config = model_manager.get_agent_model_config("edu_agent")
-        model_name = self.model_config.get("model_name", "qwen:0.5b")
-        temperature = self.model_config.get("temperature", 0.7)
-        
-        # 初始化Ollama模型
-        self.llm = Ollama(model=model_name, temperature=temperature)
-        
         # 创建教育助手提示模板
         edu_template = """
         你是一个专门为儿童设计的教育助手AI。你的任务是帮助孩子们学习各种学科知识。
@@ -43,54 +53,48 @@ class EduAgent(BaseAgent):
         请提供一个清晰、准确且适合儿童理解的回答:
         """
         
-        self.prompt = PromptTemplate(
-            input_variables=["grade", "question"],
-            template=edu_template
-        )
-        
-        # 创建链条
-        self.chain = LLMChain(llm=self.llm, prompt=self.prompt)
-        self.set_chain(self.chain)
-    def process(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        super().__init__("EduAgent", edu_template, ["grade", "question"])
+        self.set_description("负责处理教育相关问题的Agent")
+    
+    def _chain_inputs(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """
-        处理教育相关请求
+        构造链条输入
         
         Args:
             input_data (Dict[str, Any]): 输入数据
             
         Returns:
-            Dict[str, Any]: 处理结果
+            Dict[str, Any]: 链条输入
         """
-        user_text = input_data.get('text', '')
-        user_grade = input_data.get('grade', '小学')
-        user_id = input_data.get('user_id', 'default_user')
-        
-        # 获取用户特定的模型配置（支持A/B测试）
-        model_config = model_manager.get_agent_model_config("edu_agent", user_id)
-        model_name = model_config.get("model_name")
-        
-        # 如果模型配置发生变化，重新初始化模型
-        if model_name != self.llm.model:
-            self.llm = Ollama(model=model_name, temperature=self.model_config.get("temperature", 0.7))
-            self.chain = LLMChain(llm=self.llm, prompt=self.prompt)
-            self.set_chain(self.chain)
-        
-        # 使用LangChain生成响应
-        try:
-            response_text = self.chain.run({
-                "grade": user_grade,
-                "question": user_text
-            })
-        except Exception as e:
-            # 如果LangChain调用失败，使用备用响应
-            response_text = self._generate_educational_response(user_text)
-        
         return {
-            'agent': self.name,
-            'response': response_text,
-            'status': 'success'
+            "grade": input_data.get('grade', '小学'),
+            "question": input_data.get('text', '')
         }
     
+    def _fallback_response(self, input_data: Dict[str, Any]) -> str:
+        """
+        LLM调用失败时的备用响应
+        
+        Args:
+            input_data (Dict[str, Any]): 输入数据
+            
+        Returns:
+            str: 备用响应文本
+        """
+        return self._generate_educational_response(input_data.get('text', ''))
+    
+    def _batch_group(self, chain_inputs: Dict[str, Any]) -> int:
+        """
+        按问题长度估计回答长度所在的档位，同一档位的请求才合并成批
+        
+        Args:
+            chain_inputs (Dict[str, Any]): 链条输入
+            
+        Returns:
+            int: 长度档位，取值0到LENGTH_BIN_COUNT-1
+        """
+        return min(self.LENGTH_BIN_COUNT - 1, len(chain_inputs['question']) // self.LENGTH_BIN_SIZE)
+    
     def _generate_educational_response(self, user_text: str) -> str:
         """
         生成教育相关响应（备用方法）
@@ -104,13 +108,18 @@ class EduAgent(BaseAgent):
         # 这里应该调用实际的AI模型来生成响应
         # 目前只是一个模拟实现
         
-        if '你好' in user_text or '你好' in user_text:
-            return '你好！我是你的学习助手，有什么我可以帮你的吗？'
-        elif '数学' in user_text:
-            return '数学是一门研究数量、结构、空间以及变化等概念的学科。你想了解数学的哪个方面呢？'
-        elif '语文' in user_text:
-            return '语文是学习语言文字运用的课程，包括听说读写各个方面。你想练习哪一部分呢？'
-        elif '英语' in user_text:
-            return '英语是世界上使用最广泛的语言之一。学习英语可以帮助你与世界各地的人交流。'
-        else:
-            return '我是你的教育助手，我可以帮助你解答学习中的问题。请问你想了解什么内容呢？'
\ No newline at end of file
+        rule = self._FALLBACK_INDEX.first_match(user_text)
+        if rule is not None:
+            return self._FALLBACK_RULES[rule][1]
+        return self._FALLBACK_DEFAULT
+
+
+@functools.lru_cache(maxsize=None)
+def get_edu_agent() -> EduAgent:
+    """
+    获取进程内共享的教育Agent实例，首次调用时创建
+    
+    Returns:
+        EduAgent: 教育Agent实例
+    """
+    return EduAgent()
@@ -5,32 +5,49 @@
 情感陪伴Agent
 """
 
+import functools
 from typing import Dict, Any
-from backend.agents.base_agent import BaseAgent
-from backend.utils.model_manager import model_manager
-from langchain.llms import Ollama
-from langchain.prompts import PromptTemplate
-from langchain.chains import LLMChain
+from backend.agents.llm_agent import LLMAgent
+from backend.utils.keyword_index import LeadCharIndex
 
 
-class EmotionAgent(BaseAgent):
+class EmotionAgent(LLMAgent):
     """
     情感陪伴Agent负责处理与情感相关的问题，提供情感支持
     """
     
+    # 备用响应规则：(情感状态, 关键词, 响应)，情感状态命中或文本包含任一关键词即匹配，
+    # 按顺序返回第一条命中的规则
+    _FALLBACK_RULES = (
+        ('sad', ('难过', '伤心'),
+         '我理解你现在感到难过。每个人都会有这样的时刻，这很正常。你想和我聊聊是什么让你感到难过吗？'),
+        ('happy', ('开心', '高兴'),
+         '很高兴听到你很开心！开心的时候可以和我分享你的快乐，让快乐加倍哦！'),
+        ('angry', ('生气', '愤怒'),
+         '生气是很正常的情绪，但我们要学会管理它。深呼吸几次，告诉我发生了什么吧。'),
+        (None, ('孤独', '孤单'),
+         '我在这里陪伴你，你并不孤单。我们可以一起聊天，一起玩游戏，让孤单的感觉消失。'),
+        (None, ('害怕', '恐惧'),
+         '害怕是人类的本能反应，这说明你有保护自己的意识。告诉我你害怕什么，我们一起想办法克服它。'),
+    )
+    _FALLBACK_DEFAULT = '我在这里陪伴你，你可以和我分享你的任何感受。无论开心还是难过，我都会认真倾听。'
+    
+    # 情感状态到规则序号的映射，用于一次字典查找代替逐条比较情感状态
+    _EMOTION_RULE_INDEX = {
+        emotion: index for index, (emotion, _, _) in enumerate(_FALLBACK_RULES) if emotion
+    }
+    
+    # 按关键词首字符分组的规则索引，只检查首字符出现在文本中的关键词
+    _FALLBACK_INDEX = LeadCharIndex(
+        (keyword, index) for index, (_, keywords, _) in enumerate(_FALLBACK_RULES) for keyword in keywords
+    )
+    
+    AGENT_TYPE = "emotion_agent"
+    DEFAULT_TEMPERATURE = 0.8
+    CACHE_NAMESPACE_FIELD = "emotion"
+    
     def __init__(self):
         """初始化情感陪伴Agent"""
-        super().__init__("EmotionAgent")
-        self.set_description("负责处理情感相关问题的Agent")
-        
-        # 获取模型配置（支持A/B测试）
-        self.model_config = model_manager.get_agent_model_config("emotion_agent")
-        model_name = self.model_config.get("model_name", "qwen:0.5b")
-        temperature = self.model_config.get("temperature", 0.8)
-        
-        # 初始化Ollama模型
-        self.llm = Ollama(model=model_name, temperature=temperature)
-        
         # 创建情感支持提示模板
         emotion_template = """
         你是一个专门为儿童提供情感支持和陪伴的AI助手。你的任务是理解和回应孩子们的情感需求，
@@ -42,55 +59,38 @@ class EmotionAgent(BaseAgent):
         请给出一个温暖、支持性的回应，帮助孩子处理他们的情感:
         """
         
-        self.prompt = PromptTemplate(
-            input_variables=["emotion", "user_text"],
-            template=emotion_template
-        )
-        
-        # 创建链条
-        self.chain = LLMChain(llm=self.llm, prompt=self.prompt)
-        self.set_chain(self.chain)
+        super().__init__("EmotionAgent", emotion_template, ["emotion", "user_text"])
+        self.set_description("负责处理情感相关问题的Agent")
     
-    def process(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _chain_inputs(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """
-        处理情感相关请求
+        构造链条输入
         
         Args:
             input_data (Dict[str, Any]): 输入数据
             
         Returns:
-            Dict[str, Any]: 处理结果
+            Dict[str, Any]: 链条输入
         """
-        user_text = input_data.get('text', '')
-        user_emotion = input_data.get('emotion', 'neutral')
-        user_id = input_data.get('user_id', 'default_user')
-        
-        # 获取用户特定的模型配置（支持A/B测试）
-        model_config = model_manager.get_agent_model_config("emotion_agent", user_id)
-        model_name = model_config.get("model_name")
-        
-        # 如果模型配置发生变化，重新初始化模型
-        if model_name != self.llm.model:
-            self.llm = Ollama(model=model_name, temperature=self.model_config.get("temperature", 0.8))
-            self.chain = LLMChain(llm=self.llm, prompt=self.prompt)
-            self.set_chain(self.chain)
-        
-        # 使用LangChain生成响应
-        try:
-            response_text = self.chain.run({
-                "emotion": user_emotion,
-                "user_text": user_text
-            })
-        except Exception as e:
-            # 如果LangChain调用失败，使用备用响应
-            response_text = self._generate_emotional_response(user_text, user_emotion)
-        
         return {
-            'agent': self.name,
-            'response': response_text,
-            'status': 'success'
+            "emotion": input_data.get('emotion', 'neutral'),
+            "user_text": input_data.get('text', '')
         }
     
+    def _fallback_response(self, input_data: Dict[str, Any]) -> str:
+        """
+        LLM调用失败时的备用响应
+        
+        Args:
+            input_data (Dict[str, Any]): 输入数据
+            
+        Returns:
+            str: 备用响应文本
+        """
+        return self._generate_emotional_response(
+            input_data.get('text', ''), input_data.get('emotion', 'neutral')
+        )
+    
     def _generate_emotional_response(self, user_text: str, user_emotion: str) -> str:
         """
         根据用户情感状态生成响应
@@ -105,15 +105,22 @@ class EmotionAgent(BaseAgent):
         # 这里应该调用实际的情感AI模型来生成响应
         # 目前只是一个模拟实现
         
-        if user_emotion == 'sad' or '难过' in user_text or '伤心' in user_text:
-            return '我理解你现在感到难过。每个人都会有这样的时刻，这很正常。你想和我聊聊是什么让你感到难过吗？'
-        elif user_emotion == 'happy' or '开心' in user_text or '高兴' in user_text:
-            return '很高兴听到你很开心！开心的时候可以和我分享你的快乐，让快乐加倍哦！'
-        elif user_emotion == 'angry' or '生气' in user_text or '愤怒' in user_text:
-            return '生气是很正常的情绪，但我们要学会管理它。深呼吸几次，告诉我发生了什么吧。'
-        elif '孤独' in user_text or '孤单' in user_text:
-            return '我在这里陪伴你，你并不孤单。我们可以一起聊天，一起玩游戏，让孤单的感觉消失。'
-        elif '害怕' in user_text or '恐惧' in user_text:
-            return '害怕是人类的本能反应，这说明你有保护自己的意识。告诉我你害怕什么，我们一起想办法克服它。'
-        else:
-            return '我在这里陪伴你，你可以和我分享你的任何感受。无论开心还是难过，我都会认真倾听。'
\ No newline at end of file
+        # 情感状态命中的规则之前的规则仍可能被关键词命中，只需扫描到该位置为止
+        emotion_index = self._EMOTION_RULE_INDEX.get(user_emotion, len(self._FALLBACK_RULES))
+        rule = self._FALLBACK_INDEX.first_match(user_text, emotion_index)
+        if rule is not None:
+            return self._FALLBACK_RULES[rule][2]
+        if emotion_index < len(self._FALLBACK_RULES):
+            return self._FALLBACK_RULES[emotion_index][2]
+        return self._FALLBACK_DEFAULT
+
+
+@functools.lru_cache(maxsize=None)
+def get_emotion_agent() -> EmotionAgent:
+    """
+    获取进程内共享的情感Agent实例，首次调用时创建
+    
+    Returns:
+        EmotionAgent: 情感Agent实例
+    """
+    return EmotionAgent()
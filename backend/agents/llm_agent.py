@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+基于Ollama模型生成响应的Agent基类
+"""
+
+import asyncio
+from typing import Any, AsyncIterator, Dict, Hashable, List, Optional, Tuple
+from backend.agents.base_agent import BaseAgent
+from backend.utils.model_manager import model_manager
+from backend.utils.async_utils import AsyncMicroBatcher, LoopLocalSemaphore, run_coroutine_sync
+from backend.utils.semantic_cache import SemanticCache, create_ollama_semantic_cache
+from backend.utils.ollama_client import PooledOllama
+from langchain.prompts import PromptTemplate
+from langchain.chains import LLMChain
+
+
+class LLMAgent(BaseAgent):
+    """
+    调用Ollama模型生成响应的Agent基类，提供异步微批处理、流式生成和语义缓存的通用流程，
+    子类提供提示模板、链条输入和备用响应
+    """
+    
+    # Agent类型，用于获取模型配置（支持A/B测试）
+    AGENT_TYPE = ""
+    
+    # 模型配置未指定温度时使用的默认温度
+    DEFAULT_TEMPERATURE = 0.7
+    
+    # 与模型名一起组成语义缓存命名空间的链条输入字段
+    CACHE_NAMESPACE_FIELD = ""
+    
+    # 同时发往Ollama的最大批次数
+    MAX_CONCURRENT_REQUESTS = 8
+    
+    # 微批处理参数：单批最大提示词数和攒批的最长等待时间（秒）
+    BATCH_MAX_SIZE = 32
+    BATCH_MAX_WAIT = 0.01
+    
+    # 同类Agent实例共享的LLM响应语义缓存，由各子类在首次创建实例时初始化
+    _response_cache: Optional[SemanticCache] = None
+    
+    def __init__(self, name: str, template: str, input_variables: List[str]):
+        """
+        初始化Agent
+        
+        Args:
+            name (str): Agent名称
+            template (str): 提示模板
+            input_variables (List[str]): 提示模板的输入变量
+        """
+        super().__init__(name)
+        
+        # 获取模型配置（支持A/B测试）
+        self.model_config = model_manager.get_agent_model_config(self.AGENT_TYPE)
+        model_name = self.model_config.get("model_name", "qwen:0.5b")
+        temperature = self.model_config.get("temperature", self.DEFAULT_TEMPERATURE)
+        
+        # 初始化Ollama模型
+        self.llm = PooledOllama(model=model_name, temperature=temperature)
+        
+        self.prompt = PromptTemplate(
+            input_variables=input_variables,
+            template=template
+        )
+        
+        # 创建链条，并按(模型名, 温度)缓存，A/B测试切换模型时直接复用
+        self._chain_cache: Dict[Tuple[str, float], LLMChain] = {}
+        self.chain = LLMChain(llm=self.llm, prompt=self.prompt)
+        self._chain_cache[(model_name, temperature)] = self.chain
+        self.set_chain(self.chain)
+        
+        # 限制并发的LLM批次数（信号量在所在事件循环中首次使用时创建）
+        self._llm_semaphore = LoopLocalSemaphore(self.MAX_CONCURRENT_REQUESTS)
+        
+        # 将同一模型（及温度）、同一批次分组的并发请求合并为一次批量生成调用
+        self._llm_batcher = AsyncMicroBatcher(
+            self._generate_batch,
+            max_batch_size=self.BATCH_MAX_SIZE,
+            max_wait=self.BATCH_MAX_WAIT,
+            key_fn=lambda item: (item[0].model, item[0].temperature, item[2])
+        )
+        
+        # 语义缓存挂在具体子类上，不同类型的Agent不共享缓存
+        agent_class = type(self)
+        if agent_class.__dict__.get('_response_cache') is None:
+            agent_class._response_cache = create_ollama_semantic_cache(
+                model_manager.agent_config.get('semantic_cache', {})
+            )
+    
+    def _chain_inputs(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        构造链条输入，子类必须实现
+        
+        Args:
+            input_data (Dict[str, Any]): 输入数据
+        
+        Returns:
+            Dict[str, Any]: 链条输入
+        """
+        raise NotImplementedError
+    
+    def _fallback_response(self, input_data: Dict[str, Any]) -> str:
+        """
+        LLM调用失败时的备用响应，子类必须实现
+        
+        Args:
+            input_data (Dict[str, Any]): 输入数据
+        
+        Returns:
+            str: 备用响应文本
+        """
+        raise NotImplementedError
+    
+    def _batch_group(self, chain_inputs: Dict[str, Any]) -> Hashable:
+        """
+        微批处理的附加分组键，只有分组相同的请求会被合并，默认不额外分组
+        
+        Args:
+            chain_inputs (Dict[str, Any]): 链条输入
+        
+        Returns:
+            Hashable: 分组键
+        """
+        return None
+    
+    def process(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        处理请求
+        
+        Args:
+            input_data (Dict[str, Any]): 输入数据
+        
+        Returns:
+            Dict[str, Any]: 处理结果
+        """
+        # 在共享的后台事件循环中执行异步流程，使并发的同步调用也能被合并成批
+        return run_coroutine_sync(self.aprocess(input_data))
+    
+    async def aprocess(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        异步处理请求，LLM调用经微批处理器与其他并发请求合并
+        
+        Args:
+            input_data (Dict[str, Any]): 输入数据
+        
+        Returns:
+            Dict[str, Any]: 处理结果
+        """
+        user_text = input_data.get('text', '')
+        chain, chain_inputs = self._prepare_chain(input_data)
+        cache_namespace = f"{chain.llm.model}|{chain_inputs[self.CACHE_NAMESPACE_FIELD]}"
+        
+        # 语义缓存命中时直接复用已有响应，跳过LLM调用
+        cached_response, embedding = await self._cache_lookup(user_text, cache_namespace)
+        if cached_response is not None:
+            response_text = cached_response
+        else:
+            # 提交到微批处理器生成响应
+            try:
+                prompt_text = chain.prompt.format(**chain_inputs)
+                response_text = await self._llm_batcher.submit(
+                    (chain.llm, prompt_text, self._batch_group(chain_inputs))
+                )
+            except Exception as e:
+                # 如果LangChain调用失败，使用备用响应
+                response_text = self._fallback_response(input_data)
+            else:
+                await self._cache_put(user_text, cache_namespace, response_text, embedding)
+        
+        return {
+            'agent': self.name,
+            'response': response_text,
+            'status': 'success'
+        }
+    
+    async def process_stream(self, input_data: Dict[str, Any]) -> AsyncIterator[str]:
+        """
+        流式处理请求，模型每生成一段文本就立即产出，降低首字延迟
+        
+        Args:
+            input_data (Dict[str, Any]): 输入数据
+        
+        Yields:
+            str: 响应文本片段
+        """
+        user_text = input_data.get('text', '')
+        chain, chain_inputs = self._prepare_chain(input_data)
+        cache_namespace = f"{chain.llm.model}|{chain_inputs[self.CACHE_NAMESPACE_FIELD]}"
+        
+        cached_response, embedding = await self._cache_lookup(user_text, cache_namespace)
+        if cached_response is not None:
+            yield cached_response
+            return
+        
+        chunks = []
+        try:
+            prompt_text = chain.prompt.format(**chain_inputs)
+            async with self._llm_semaphore:
+                async for chunk in chain.llm.astream(prompt_text):
+                    chunks.append(chunk)
+                    yield chunk
+        except Exception as e:
+            # 尚未产出任何内容时使用备用响应，已产出部分内容时直接结束
+            if not chunks:
+                yield self._fallback_response(input_data)
+            return
+        
+        await self._cache_put(user_text, cache_namespace, ''.join(chunks), embedding)
+    
+    async def _cache_lookup(self, user_text: str, namespace: str) -> Tuple[Optional[str], Any]:
+        """
+        查询语义缓存（嵌入计算为同步HTTP调用，放到线程池执行；缓存未启用时直接返回）
+        
+        Args:
+            user_text (str): 用户输入文本
+            namespace (str): 缓存命名空间
+        
+        Returns:
+            Tuple[Optional[str], Any]: (命中的响应, 问题的嵌入向量)
+        """
+        if not self._response_cache.enabled:
+            return None, None
+        return await asyncio.to_thread(self._response_cache.lookup, user_text, namespace)
+    
+    async def _cache_put(self, user_text: str, namespace: str, response_text: str, embedding: Any):
+        """
+        写入语义缓存
+        
+        Args:
+            user_text (str): 用户输入文本
+            namespace (str): 缓存命名空间
+            response_text (str): LLM响应
+            embedding (Any): lookup返回的嵌入向量
+        """
+        if self._response_cache.enabled:
+            await asyncio.to_thread(self._response_cache.put, user_text, namespace, response_text, embedding)
+    
+    async def _generate_batch(self, items: List[Tuple[PooledOllama, str, Hashable]]) -> List[str]:
+        """
+        对同一模型的一批提示词执行一次批量生成
+        
+        Args:
+            items (List[Tuple[PooledOllama, str, Hashable]]): (模型, 提示词, 批次分组)列表
+        
+        Returns:
+            List[str]: 与输入顺序一致的响应文本
+        """
+        llm = items[0][0]
+        async with self._llm_semaphore:
+            result = await llm.agenerate([prompt_text for _, prompt_text, _ in items])
+        return [generations[0].text for generations in result.generations]
+    
+    def _prepare_chain(self, input_data: Dict[str, Any]) -> Tuple[LLMChain, Dict[str, Any]]:
+        """
+        按用户的模型配置准备链条，并构造链条输入
+        
+        Args:
+            input_data (Dict[str, Any]): 输入数据
+        
+        Returns:
+            Tuple[LLMChain, Dict[str, Any]]: (链条, 链条输入)
+        """
+        user_id = input_data.get('user_id', 'default_user')
+        
+        # 获取用户特定的模型配置（支持A/B测试）
+        model_config = self.get_model_config(self.AGENT_TYPE, user_id)
+        model_name = model_config.get("model_name")
+        
+        chain = self._get_chain(model_name, self.model_config.get("temperature", self.DEFAULT_TEMPERATURE))
+        return chain, self._chain_inputs(input_data)
+    
+    def _get_chain(self, model_name: str, temperature: float) -> LLMChain:
+        """
+        获取指定模型和温度对应的链条，不存在时创建并缓存
+        
+        Args:
+            model_name (str): 模型名称
+            temperature (float): 温度
+        
+        Returns:
+            LLMChain: 链条
+        """
+        key = (model_name, temperature)
+        chain = self._chain_cache.get(key)
+        if chain is None:
+            llm = PooledOllama(model=model_name, temperature=temperature)
+            chain = self._chain_cache.setdefault(key, LLMChain(llm=llm, prompt=self.prompt))
+        return chain
@@ -5,13 +5,47 @@
 记忆Agent
 """
 
-from typing import Dict, Any, List
+from collections.abc import Sequence
+from typing import Dict, Any, List, Optional, Tuple, Union
 from backend.agents.base_agent import BaseAgent
-import json
+import atexit
+import itertools
+import mmap
+import orjson
 import os
+import queue
+import threading
+from collections import deque
 from datetime import datetime
-from langchain.memory import ConversationBufferMemory
-from langchain.schema import HumanMessage, AIMessage
+from langchain.schema import HumanMessage, AIMessage, BaseMessage
+
+
+class MessageHistoryView(Sequence):
+    """
+    按列存储的用户消息的只读视图，访问元素时才构造LangChain消息对象
+    """
+    
+    def __init__(self, roles: List[str], contents: List[str]):
+        """
+        初始化消息视图
+        
+        Args:
+            roles (List[str]): 消息角色列，'H'表示用户消息，'A'表示AI回复
+            contents (List[str]): 消息内容列
+        """
+        self._roles = roles
+        self._contents = contents
+    
+    def __len__(self) -> int:
+        return len(self._roles)
+    
+    def __getitem__(self, index: Union[int, slice]) -> Union[BaseMessage, List[BaseMessage]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        content = self._contents[index]
+        if self._roles[index] == 'H':
+            return HumanMessage(content=content)
+        return AIMessage(content=content)
 
 
 class MemoryAgent(BaseAgent):
@@ -19,6 +53,20 @@ class MemoryAgent(BaseAgent):
     记忆Agent负责存储和检索对话历史与用户信息
     """
     
+    # 文件中的记录数超过内存中保留记录数的该倍数时，重写文件以清除已淘汰的记录
+    COMPACTION_RATIO = 10
+    
+    # 每个用户在内存中保留的最大对话数，超出时自动淘汰最早的对话
+    MAX_CONVERSATIONS_PER_USER = 100
+    
+    # 后台写入线程单次合并处理的最大写入任务数
+    WRITE_BATCH_SIZE = 64
+    
+    # 所有实例共享的后台写入队列和线程，文件I/O不占用请求线程
+    _write_queue: "queue.Queue[Tuple[str, str, bytes]]" = queue.Queue()
+    _writer_thread: Optional[threading.Thread] = None
+    _writer_lock = threading.Lock()
+    
     def __init__(self):
         """初始化记忆Agent"""
         super().__init__("MemoryAgent")
@@ -28,13 +76,20 @@ class MemoryAgent(BaseAgent):
         self.conversations = {}
         self.user_profiles = {}
         
-        # 为每个用户维护一个LangChain ConversationBufferMemory
+        # 每个用户的消息按列存储：{'roles': [...], 'contents': [...]}
         self.user_memories = {}
         
-        # 持久化文件路径
-        self.memory_file = "memory_data.json"
+        # 持久化文件路径（JSONL格式，每行一条记录，新对话只追加写入）
+        self.memory_file = "memory_data.jsonl"
+        # 旧版本整体重写的JSON文件，JSONL文件不存在时从中导入
+        self.legacy_memory_file = "memory_data.json"
         
-        # 加载历史数据
+        # 文件中的记录数与内存中保留的对话数，用于判断何时压缩文件
+        self._persisted_records = 0
+        self._live_records = 0
+        
+        # 启动后台写入线程并加载历史数据
+        self._start_writer()
         self._load_memory()
     
     def process(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -100,19 +155,29 @@ class MemoryAgent(BaseAgent):
             user_id (str): 用户ID
             conversation (Dict[str, Any]): 对话内容
         """
-        if user_id not in self.conversations:
-            self.conversations[user_id] = []
-        
         # 添加时间戳
         conversation['timestamp'] = datetime.now().isoformat()
-        self.conversations[user_id].append(conversation)
+        self._append_conversation(user_id, conversation)
         
-        # 限制历史记录数量，避免内存过大
-        if len(self.conversations[user_id]) > 100:
-            self.conversations[user_id] = self.conversations[user_id][-50:]
+        # 追加写入文件
+        self._append_memory(user_id, conversation)
+    
+    def _append_conversation(self, user_id: str, conversation: Dict[str, Any]):
+        """
+        将对话添加到内存中的历史记录
         
-        # 保存到文件
-        self._save_memory()
+        Args:
+            user_id (str): 用户ID
+            conversation (Dict[str, Any]): 对话内容
+        """
+        if user_id not in self.conversations:
+            self.conversations[user_id] = deque(maxlen=self.MAX_CONVERSATIONS_PER_USER)
+        
+        history = self.conversations[user_id]
+        # 队列已满时追加会自动淘汰最早的对话，保留数量不变
+        if len(history) < history.maxlen:
+            self._live_records += 1
+        history.append(conversation)
     
     def _retrieve_conversation_history(self, user_id: str, limit: int = 5) -> List[Dict[str, Any]]:
         """
@@ -127,7 +192,8 @@ class MemoryAgent(BaseAgent):
         """
         if user_id in self.conversations:
             # 返回最近的几条记录
-            return self.conversations[user_id][-limit:]
+            history = self.conversations[user_id]
+            return list(itertools.islice(history, max(0, len(history) - limit), len(history)))
         else:
             return []
     
@@ -140,15 +206,16 @@ class MemoryAgent(BaseAgent):
             human_message (str): 用户消息
             ai_message (str): AI回复
         """
-        # 如果用户还没有内存对象，创建一个
+        # 如果用户还没有消息列，创建一个
         if user_id not in self.user_memories:
-            self.user_memories[user_id] = ConversationBufferMemory()
+            self.user_memories[user_id] = {'roles': [], 'contents': []}
         
-        # 添加消息到内存
-        self.user_memories[user_id].chat_memory.add_message(HumanMessage(content=human_message))
-        self.user_memories[user_id].chat_memory.add_message(AIMessage(content=ai_message))
+        # 只追加角色和内容，不创建消息对象
+        memory = self.user_memories[user_id]
+        memory['roles'].extend(('H', 'A'))
+        memory['contents'].extend((human_message, ai_message))
     
-    def _get_user_memory(self, user_id: str) -> List[Dict[str, str]]:
+    def _get_user_memory(self, user_id: str) -> Sequence:
         """
         获取用户内存内容
         
@@ -156,35 +223,170 @@ class MemoryAgent(BaseAgent):
             user_id (str): 用户ID
             
         Returns:
-            List[Dict[str, str]]: 内存内容
+            Sequence: 按需构造LangChain消息对象的消息序列
         """
         if user_id in self.user_memories:
-            return self.user_memories[user_id].chat_memory.messages
+            memory = self.user_memories[user_id]
+            return MessageHistoryView(memory['roles'], memory['contents'])
         else:
             return []
     
+    def _append_memory(self, user_id: str, conversation: Dict[str, Any]):
+        """
+        将一条对话交给后台线程追加写入记忆文件
+        
+        Args:
+            user_id (str): 用户ID
+            conversation (Dict[str, Any]): 对话内容
+        """
+        try:
+            record = {'user_id': user_id, 'conversation': conversation}
+            self._write_queue.put(('append', self.memory_file, orjson.dumps(record) + b'\n'))
+            self._persisted_records += 1
+        except Exception as e:
+            print(f"保存记忆数据时出错: {e}")
+            return
+        
+        # 文件中已淘汰的记录过多时压缩文件
+        if self._persisted_records > self.COMPACTION_RATIO * max(self._live_records, 1):
+            self._save_memory()
+    
     def _save_memory(self):
-        """将记忆数据保存到文件"""
+        """将内存中的全部记忆数据交给后台线程重写到文件（压缩已淘汰的记录）"""
         try:
-            data = {
-                'conversations': self.conversations,
-                'user_profiles': self.user_profiles
-            }
-            with open(self.memory_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            lines = []
+            for user_id, profile in self.user_profiles.items():
+                lines.append(orjson.dumps({'user_id': user_id, 'profile': profile}))
+            for user_id, conversations in self.conversations.items():
+                for conversation in conversations:
+                    lines.append(orjson.dumps({'user_id': user_id, 'conversation': conversation}))
+            
+            self._write_queue.put(('rewrite', self.memory_file, b''.join(line + b'\n' for line in lines)))
+            self._persisted_records = len(lines)
         except Exception as e:
             print(f"保存记忆数据时出错: {e}")
     
     def _load_memory(self):
         """从文件加载记忆数据"""
-        if os.path.exists(self.memory_file):
+        # 先等待尚未落盘的写入完成，保证读到最新数据
+        self._flush()
+        
+        if not os.path.exists(self.memory_file) and os.path.exists(self.legacy_memory_file):
+            self._import_legacy_memory()
+            return
+        
+        # 空文件无法映射，直接跳过
+        if os.path.exists(self.memory_file) and os.path.getsize(self.memory_file) > 0:
             try:
-                with open(self.memory_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    self.conversations = data.get('conversations', {})
-                    self.user_profiles = data.get('user_profiles', {})
+                # 将文件映射到内存后逐行解析，不经过文件对象的读缓冲
+                with open(self.memory_file, 'rb') as f, \
+                        mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    for line in iter(mm.readline, b''):
+                        line = line.strip()
+                        if not line:
+                            continue
+                        try:
+                            record = orjson.loads(line)
+                        except orjson.JSONDecodeError:
+                            # 跳过写入中断产生的不完整行
+                            continue
+                        
+                        self._persisted_records += 1
+                        if 'profile' in record:
+                            self.user_profiles[record['user_id']] = record['profile']
+                        else:
+                            self._append_conversation(record['user_id'], record['conversation'])
             except Exception as e:
                 print(f"加载记忆数据时出错: {e}")
                 # 初始化为空字典
                 self.conversations = {}
-                self.user_profiles = {}
\ No newline at end of file
+                self.user_profiles = {}
+                self._persisted_records = 0
+                self._live_records = 0
+                return
+            
+            if self._persisted_records > self.COMPACTION_RATIO * max(self._live_records, 1):
+                self._save_memory()
+    
+    def _import_legacy_memory(self):
+        """从旧版本的JSON文件导入记忆数据，并写成一个压缩后的JSONL文件"""
+        try:
+            with open(self.legacy_memory_file, 'rb') as f:
+                data = orjson.loads(f.read())
+            for user_id, conversations in data.get('conversations', {}).items():
+                for conversation in conversations:
+                    self._append_conversation(user_id, conversation)
+            self.user_profiles = data.get('user_profiles', {})
+        except Exception as e:
+            print(f"导入旧版记忆数据时出错: {e}")
+            self.conversations = {}
+            self.user_profiles = {}
+            self._live_records = 0
+            return
+        
+        # 旧文件保留不动，之后的加载都读取JSONL文件
+        self._save_memory()
+        self._flush()
+    
+    @classmethod
+    def _flush(cls):
+        """等待后台写入队列中的全部任务完成"""
+        cls._write_queue.join()
+    
+    @classmethod
+    def _start_writer(cls):
+        """启动后台写入线程（进程内只启动一次）"""
+        with cls._writer_lock:
+            if cls._writer_thread is None:
+                cls._writer_thread = threading.Thread(
+                    target=cls._writer_loop, name="memory-writer", daemon=True
+                )
+                cls._writer_thread.start()
+                # 进程退出前写完剩余数据
+                atexit.register(cls._flush)
+    
+    @classmethod
+    def _writer_loop(cls):
+        """后台写入循环，每次合并处理队列中积压的多个写入任务"""
+        while True:
+            tasks = [cls._write_queue.get()]
+            while len(tasks) < cls.WRITE_BATCH_SIZE:
+                try:
+                    tasks.append(cls._write_queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            try:
+                cls._write_tasks(tasks)
+            finally:
+                for _ in tasks:
+                    cls._write_queue.task_done()
+    
+    @staticmethod
+    def _write_tasks(tasks: List[Tuple[str, str, bytes]]):
+        """
+        按顺序执行一组写入任务，同一文件上连续的追加合并为一次写入
+        
+        Args:
+            tasks (List[Tuple[str, str, bytes]]): (操作类型, 文件路径, 数据)列表
+        """
+        index = 0
+        while index < len(tasks):
+            action, path, data = tasks[index]
+            index += 1
+            try:
+                if action == 'append':
+                    chunks = [data]
+                    while index < len(tasks) and tasks[index][0] == 'append' and tasks[index][1] == path:
+                        chunks.append(tasks[index][2])
+                        index += 1
+                    with open(path, 'ab') as f:
+                        f.write(b''.join(chunks))
+                else:
+                    # 先写临时文件再替换，避免写入中途失败导致数据丢失
+                    temp_file = path + '.tmp'
+                    with open(temp_file, 'wb') as f:
+                        f.write(data)
+                    os.replace(temp_file, path)
+            except Exception as e:
+                print(f"保存记忆数据时出错: {e}")
\ No newline at end of file
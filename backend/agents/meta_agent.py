@@ -6,13 +6,31 @@
 """
 
 import re
-from typing import Dict, Any
+from typing import AsyncIterator, Callable, Dict, Any, List, Optional
 from backend.agents.base_agent import BaseAgent
-from backend.agents.edu_agent import EduAgent
-from backend.agents.emotion_agent import EmotionAgent
+from backend.agents.edu_agent import get_edu_agent
+from backend.agents.emotion_agent import get_emotion_agent
 from langchain_ollama import OllamaLLM  # 假设LangChain的Ollama模型接口
 from backend.agents.langchain_agent import LangChainAgent  # 假设LangChain代理的封装
 
+try:
+    import ahocorasick  # pyahocorasick C扩展，多模式匹配
+except ImportError:
+    ahocorasick = None
+
+
+# 进程内共享的目标Agent工厂，供预热脚本提前创建全部Agent
+AGENT_FACTORIES: Dict[str, Callable[[], BaseAgent]] = {
+    'edu_agent': get_edu_agent,
+    'emotion_agent': get_emotion_agent,
+}
+
+
+def warm_up_agents():
+    """预先创建全部共享的目标Agent，避免首个请求承担初始化开销"""
+    for factory in AGENT_FACTORIES.values():
+        factory()
+
 
 class MetaAgent(BaseAgent):
     """
@@ -24,11 +42,18 @@ class MetaAgent(BaseAgent):
         super().__init__("MetaAgent")
         self.set_description("负责意图识别和路由的核心Agent")
         
-        # 初始化各个目标Agent
-        self.edu_agent = EduAgent()
-        self.emotion_agent = EmotionAgent()
+        # 引用进程内共享的目标Agent，多个MetaAgent实例不会重复创建模型客户端和链条
+        self.edu_agent = get_edu_agent()
+        self.emotion_agent = get_emotion_agent()
         self.langchain_agent = LangChainAgent(model=OllamaLLM(model="llama2"))  # 初始化LangChain代理
         
+        # 意图到处理Agent的路由表，未知意图默认路由到教育Agent
+        self._routes: Dict[str, BaseAgent] = {
+            'edu': self.edu_agent,
+            'emotion': self.emotion_agent,
+            'langchain': self.langchain_agent,
+        }
+        
         # 定义教育相关关键词
         self.edu_keywords = [
             '学习', '知识', '问题', '数学', '语文', '英语', '科学', '历史', '地理',
@@ -42,6 +67,41 @@ class MetaAgent(BaseAgent):
             '兴奋', '沮丧', '焦虑', '朋友', '家人', '父母', '老师', '同学',
             '玩耍', '游戏', '娱乐', '有趣', '快乐', '伤心', '郁闷'
         ]
+        
+        # 定义LangChain代理相关关键词
+        self.langchain_keywords = []
+        
+        # 预先构建意图关键词自动机，一次扫描完成全部类别的匹配；
+        # 未安装pyahocorasick时退回到预编译的正则
+        if ahocorasick is not None:
+            self._intent_automaton = self._build_intent_automaton()
+            self._any_keyword_pattern = None
+            self._category_patterns = {}
+        else:
+            self._intent_automaton = None
+            # 全部关键词合成的单个正则，文本不含任何关键词时无需逐类别计数
+            self._any_keyword_pattern = self._compile_keywords(
+                self.edu_keywords + self.emotion_keywords + self.langchain_keywords
+            )
+            # 每个类别一个前瞻交替式，一次findall在C层面找出该类别全部（含重叠的）关键词
+            self._category_patterns = {
+                'edu': self._compile_keywords(self.edu_keywords, overlapping=True),
+                'emotion': self._compile_keywords(self.emotion_keywords, overlapping=True),
+                'langchain': self._compile_keywords(self.langchain_keywords, overlapping=True),
+            }
+    
+    def route(self, text: str) -> BaseAgent:
+        """
+        识别用户输入的意图并返回负责处理的Agent
+        
+        Args:
+            text (str): 用户输入文本
+            
+        Returns:
+            BaseAgent: 处理该输入的Agent，未知意图返回教育Agent
+        """
+        # 关键词均为中文，无需大小写折叠
+        return self._routes.get(self._identify_intent(text), self.edu_agent)
     
     def process(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -53,21 +113,32 @@ class MetaAgent(BaseAgent):
         Returns:
             Dict[str, Any]: 处理结果
         """
-        user_text = input_data.get('text', '').lower()
+        return self.route(input_data.get('text', '')).process(input_data)
+    
+    async def aprocess(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        异步处理输入数据，识别意图并将请求交给相应Agent的异步接口
         
-        # 识别意图
-        intent = self._identify_intent(user_text)
+        Args:
+            input_data (Dict[str, Any]): 输入数据，包含用户文本等信息
+            
+        Returns:
+            Dict[str, Any]: 处理结果
+        """
+        return await self.route(input_data.get('text', '')).aprocess(input_data)
+    
+    async def process_stream(self, input_data: Dict[str, Any]) -> AsyncIterator[str]:
+        """
+        流式处理输入数据，识别意图并转发相应Agent产出的响应片段
         
-        # 根据意图路由到相应Agent
-        if intent == 'edu':
-            return self.edu_agent.process(input_data)
-        elif intent == 'emotion':
-            return self.emotion_agent.process(input_data)
-        elif intent == 'langchain':
-            return self.langchain_agent.process(input_data)
-        else:
-            # 默认路由到教育Agent
-            return self.edu_agent.process(input_data)
+        Args:
+            input_data (Dict[str, Any]): 输入数据，包含用户文本等信息
+            
+        Yields:
+            str: 响应文本片段
+        """
+        async for chunk in self.route(input_data.get('text', '')).process_stream(input_data):
+            yield chunk
     
     def _identify_intent(self, text: str) -> str:
         """
@@ -79,32 +150,20 @@ class MetaAgent(BaseAgent):
         Returns:
             str: 意图类型 ('edu', 'emotion', 'unknown')
         """
-        edu_score = 0
-        emotion_score = 0
-        
-        # 计算教育相关关键词匹配数
-        for keyword in self.edu_keywords:
-            if keyword in text:
-                edu_score += 1
-                
-        # 计算情感相关关键词匹配数
-        for keyword in self.emotion_keywords:
-            if keyword in text:
-                emotion_score += 1
+        scores = {'edu': 0, 'emotion': 0, 'langchain': 0}
         
-        # 根据匹配分数判断意图
-        # 计算LangChain相关关键词匹配数
-        langchain_score = 0
-        for keyword in self.langchain_keywords:
-            if keyword in text:
-                langchain_score += 1
-        
-        # 根据匹配分数判断意图
-        scores = {
-            'edu': edu_score,
-            'emotion': emotion_score,
-            'langchain': langchain_score
-        }
+        if self._intent_automaton is not None:
+            # 单次扫描文本，按关键词所属类别累计匹配数（同一关键词只计一次）
+            matched = set(payload for _, payload in self._intent_automaton.iter(text))
+            for category, _ in matched:
+                scores[category] += 1
+        else:
+            if self._any_keyword_pattern is None or not self._any_keyword_pattern.search(text):
+                return 'unknown'
+            # 按类别统计命中的不同关键词数，重叠的关键词（如"为什么"与"什么"）各计一次，与自动机结果一致
+            for category, pattern in self._category_patterns.items():
+                if pattern is not None:
+                    scores[category] = len(set(pattern.findall(text)))
         
         # 找出最高分的意图
         max_intent = max(scores, key=scores.get)
@@ -113,4 +172,38 @@ class MetaAgent(BaseAgent):
         if scores[max_intent] > 0:
             return max_intent
         else:
-            return 'unknown'
\ No newline at end of file
+            return 'unknown'
+    
+    def _build_intent_automaton(self):
+        """
+        构建意图关键词的Aho-Corasick自动机
+        
+        Returns:
+            ahocorasick.Automaton: 以(类别, 关键词)为载荷的自动机
+        """
+        automaton = ahocorasick.Automaton()
+        for category, keywords in (('edu', self.edu_keywords),
+                                   ('emotion', self.emotion_keywords),
+                                   ('langchain', self.langchain_keywords)):
+            for keyword in keywords:
+                automaton.add_word(keyword, (category, keyword))
+        automaton.make_automaton()
+        return automaton
+    
+    @staticmethod
+    def _compile_keywords(keywords: List[str], overlapping: bool = False) -> Optional[re.Pattern]:
+        """
+        将关键词列表编译为单个正则交替式
+        
+        Args:
+            keywords (List[str]): 关键词列表
+            overlapping (bool): 是否包裹为捕获分组的零宽前瞻，使findall在每个位置都尝试匹配，
+                找出彼此重叠的关键词
+            
+        Returns:
+            Optional[re.Pattern]: 预编译的正则，关键词为空时为None
+        """
+        if not keywords:
+            return None
+        alternation = '|'.join(re.escape(k) for k in keywords)
+        return re.compile(f'(?=({alternation}))' if overlapping else alternation)
\ No newline at end of file
@@ -6,21 +6,64 @@
 支持qwen:0.5b模型
 """
 
+import os
 import re
-from typing import Dict, Any, Tuple
+import threading
+from typing import Dict, Any, List, Optional, Tuple
 from backend.agents.base_agent import BaseAgent
 from backend.utils.config_loader import config_loader
 from backend.utils.model_manager import model_manager
-from langchain.llms import Ollama
+from backend.utils.lfu_cache import LFUCache
+from backend.utils.async_utils import AsyncMicroBatcher, LoopLocalSemaphore, run_coroutine_sync
+from backend.utils.ollama_client import PooledOllama
 from langchain.prompts import PromptTemplate
 from langchain.chains import LLMChain
 
+try:
+    import ahocorasick  # pyahocorasick C扩展，多模式匹配
+except ImportError:
+    ahocorasick = None
+
+try:
+    import hyperscan  # Intel Hyperscan多模式正则引擎
+except ImportError:
+    hyperscan = None
+
+try:
+    import re2  # Google RE2线性时间正则引擎，不回溯
+except ImportError:
+    re2 = None
+
 
 class SafetyAgent(BaseAgent):
     """
     安全Agent负责审查所有输出内容，确保符合儿童安全规范
     """
     
+    # 允许的最大内容长度（过长的内容可能包含不适宜信息）
+    MAX_CONTENT_LENGTH = 1000
+    
+    # 同时发往Ollama的最大批次数，与Ollama服务端的OLLAMA_NUM_PARALLEL保持一致
+    MAX_CONCURRENT_REQUESTS = int(os.environ.get('OLLAMA_NUM_PARALLEL', 8))
+    
+    # 微批处理参数：单批最大检查数和攒批的最长等待时间（秒）
+    BATCH_MAX_SIZE = 16
+    BATCH_MAX_WAIT = 0.02
+    
+    # 不安全模式（模式名称 -> 正则表达式）；数字显式写出半角和全角两种，
+    # Hyperscan和RE2中的\d只匹配ASCII数字，会漏掉re能识别的全角号码
+    UNSAFE_PATTERNS = {
+        'phone': r'[0-9０-９]{11}',  # 可能的手机号码
+        'id_card': r'[0-9０-９]{18}|[0-9０-９]{17}[XxＸｘ]',  # 可能的身份证号
+        'email': r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}',  # 可能的邮箱
+    }
+    
+    # 将全部模式在类定义时预编译为一个带命名分组的正则，所有实例共享，
+    # 一次搜索完成所有模式的检查；安装了RE2时使用RE2编译，任意输入下均为线性时间
+    _PATTERN_RE = (re2 if re2 is not None else re).compile('|'.join(
+        f'(?P<{name}>{pattern})' for name, pattern in UNSAFE_PATTERNS.items()
+    ))
+    
     def __init__(self):
         """初始化安全Agent"""
         super().__init__("SafetyAgent")
@@ -32,7 +75,7 @@ class SafetyAgent(BaseAgent):
         temperature = self.model_config.get("temperature", 0.0)
         
         # 初始化Ollama模型用于内容安全检查
-        self.llm = Ollama(model=model_name, temperature=temperature)
+        self.llm = PooledOllama(model=model_name, temperature=temperature)
         
         # 创建安全检查提示模板
         safety_template = """
@@ -51,9 +94,20 @@ class SafetyAgent(BaseAgent):
             template=safety_template
         )
         
-        # 创建安全链条
+        # 创建安全链条，按(模型名, 温度)缓存，A/B测试切换模型时复用已创建的链条
         self.safety_chain = LLMChain(llm=self.llm, prompt=self.safety_prompt)
         self.set_chain(self.safety_chain)
+        self._chain_cache: Dict[Tuple[str, float], LLMChain] = {(model_name, temperature): self.safety_chain}
+        
+        # 将并发请求的安全检查合并为一次批量生成调用，并限制并发的批次数
+        # （信号量在所在事件循环中首次使用时创建）
+        self._llm_semaphore = LoopLocalSemaphore(self.MAX_CONCURRENT_REQUESTS)
+        self._llm_batcher = AsyncMicroBatcher(
+            self._generate_batch,
+            max_batch_size=self.BATCH_MAX_SIZE,
+            max_wait=self.BATCH_MAX_WAIT,
+            key_fn=lambda item: (item[0].model, item[0].temperature)
+        )
         
         # 不安全内容关键词列表
         self.unsafe_keywords = [
@@ -73,12 +127,28 @@ class SafetyAgent(BaseAgent):
             '绝望', '无意义', '恨', '报复'
         ]
         
-        # 不安全模式（正则表达式）
-        self.unsafe_patterns = [
-            r'(\d{11})',  # 可能的手机号码
-            r'(\d{18}|\d{17}[Xx])',  # 可能的身份证号
-            r'([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})',  # 可能的邮箱
-        ]
+        # 不安全模式，引用类级别共享的模式表
+        self.unsafe_patterns = self.UNSAFE_PATTERNS
+        
+        # 安装了Hyperscan时将全部模式编译为一个多模式DFA数据库，替代回溯式的re搜索；
+        # 扫描用的scratch空间不能跨线程共享，按线程分配
+        self._pattern_names = list(self.unsafe_patterns)
+        self._pattern_db = self._build_pattern_database() if hyperscan is not None else None
+        self._scan_local = threading.local()
+        
+        # 预先构建关键词自动机，一次扫描文本即可找出任意不安全关键词；
+        # 未安装pyahocorasick时逐个关键词做子串检查
+        self._keyword_automaton = self._build_keyword_automaton() if ahocorasick is not None else None
+        
+        # 关键词首字符集合，文本不含其中任何字符时无需逐个检查关键词
+        self._keyword_leads = frozenset(keyword[0] for keyword in self.unsafe_keywords if keyword)
+        
+        # LLM安全检查结果缓存，键为(模型名, 规范化文本)，重复内容无需再次调用模型
+        cache_config = model_manager.agent_config.get('safety_agent', {}).get('result_cache', {})
+        self._safety_cache = LFUCache(
+            capacity=cache_config.get('capacity', 50000),
+            track_stats=cache_config.get('track_stats', False)
+        )
     
     def process(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -94,15 +164,13 @@ class SafetyAgent(BaseAgent):
         response_text = input_data.get('response', '')
         agent_name = input_data.get('agent', 'Unknown')
         
-        # 获取用户特定的模型配置（支持A/B测试）
-        model_config = model_manager.get_agent_model_config("safety_agent", user_id)
-        model_name = model_config.get("model_name")
-        
-        # 如果模型配置发生变化，重新初始化模型
-        if model_name != self.llm.model:
-            self.llm = Ollama(model=model_name, temperature=self.model_config.get("temperature", 0.0))
-            self.safety_chain = LLMChain(llm=self.llm, prompt=self.safety_prompt)
-            self.set_chain(self.safety_chain)
+        # 获取用户特定的模型配置（支持A/B测试），链条只在本次请求内使用，
+        # 不修改共享的实例属性，并发请求互不影响
+        model_config = self.get_model_config("safety_agent", user_id)
+        chain = self._get_chain(
+            model_config.get("model_name", self.llm.model),
+            model_config.get("temperature", self.model_config.get("temperature", 0.0))
+        )
         
         # 首先进行关键词和模式检查
         keyword_safe, keyword_reason = self._check_keywords_and_patterns(response_text)
@@ -115,12 +183,19 @@ class SafetyAgent(BaseAgent):
                 'original_response': response_text
             }
         
-        # 然后使用LLM进行语义安全检查
-        try:
-            is_safe, reason = self._check_content_safety_with_llm(response_text)
-        except Exception as e:
-            # 如果LLM检查失败，回退到基础检查
-            is_safe, reason = self._check_content_safety(response_text)
+        # 然后使用LLM进行语义安全检查，相同内容直接复用缓存的检查结果
+        cache_key = (chain.llm.model, self._normalize_text(response_text))
+        cached = self._safety_cache.get(cache_key)
+        if cached is not None:
+            is_safe, reason = cached
+        else:
+            try:
+                is_safe, reason = self._check_content_safety_with_llm(response_text, chain.llm)
+            except Exception as e:
+                # 如果LLM检查失败，回退到基础检查（不缓存，下次重新尝试LLM检查）
+                is_safe, reason = self._check_content_safety(response_text)
+            else:
+                self._safety_cache.put(cache_key, (is_safe, reason))
         
         if is_safe:
             return {
@@ -138,6 +213,37 @@ class SafetyAgent(BaseAgent):
                 'original_response': response_text
             }
     
+    def _get_chain(self, model_name: str, temperature: float) -> LLMChain:
+        """
+        获取指定模型和温度对应的安全链条，不存在时创建并缓存
+        
+        Args:
+            model_name (str): 模型名称
+            temperature (float): 温度
+            
+        Returns:
+            LLMChain: 安全链条
+        """
+        key = (model_name, temperature)
+        chain = self._chain_cache.get(key)
+        if chain is None:
+            llm = PooledOllama(model=model_name, temperature=temperature)
+            chain = self._chain_cache.setdefault(key, LLMChain(llm=llm, prompt=self.safety_prompt))
+        return chain
+    
+    @staticmethod
+    def _normalize_text(text: str) -> str:
+        """
+        规范化文本作为缓存键：合并连续空白并转为小写
+        
+        Args:
+            text (str): 原始文本
+            
+        Returns:
+            str: 规范化后的文本
+        """
+        return ' '.join(text.split()).lower()
+    
     def _check_keywords_and_patterns(self, text: str) -> Tuple[bool, str]:
         """
         检查关键词和模式
@@ -148,34 +254,129 @@ class SafetyAgent(BaseAgent):
         Returns:
             Tuple[bool, str]: (是否安全, 原因)
         """
+        # 先检查长度，过长的内容无需再扫描关键词和模式
+        if len(text) > self.MAX_CONTENT_LENGTH:
+            return False, "内容过长"
+        
         # 检查关键词
+        keyword = self._find_unsafe_keyword(text)
+        if keyword is not None:
+            return False, f"包含不安全关键词: {keyword}"
+        
+        # 检查模式
+        pattern_name = self._find_unsafe_pattern(text)
+        if pattern_name is not None:
+            return False, f"包含不安全模式: {pattern_name}"
+        
+        return True, "关键词检查通过"
+    
+    def _find_unsafe_keyword(self, text: str) -> Optional[str]:
+        """
+        查找文本中出现的不安全关键词
+        
+        Args:
+            text (str): 待检查的文本
+            
+        Returns:
+            Optional[str]: 命中的关键词，未命中返回None
+        """
+        if self._keyword_automaton is not None:
+            for _, keyword in self._keyword_automaton.iter(text):
+                return keyword
+            return None
+        
+        # 一次C层面的集合检查排除大多数安全文本
+        if self._keyword_leads.isdisjoint(text):
+            return None
         for keyword in self.unsafe_keywords:
             if keyword in text:
-                return False, f"包含不安全关键词: {keyword}"
+                return keyword
+        return None
+    
+    def _build_keyword_automaton(self):
+        """
+        构建不安全关键词的Aho-Corasick自动机
         
-        # 检查模式
-        for pattern in self.unsafe_patterns:
-            if re.search(pattern, text):
-                return False, f"包含不安全模式: {pattern}"
+        Returns:
+            ahocorasick.Automaton: 以关键词为载荷的自动机
+        """
+        automaton = ahocorasick.Automaton()
+        for keyword in self.unsafe_keywords:
+            automaton.add_word(keyword, keyword)
+        automaton.make_automaton()
+        return automaton
+    
+    def _find_unsafe_pattern(self, text: str) -> Optional[str]:
+        """
+        查找文本命中的不安全模式
         
-        # 检查长度（过长的内容可能包含不适宜信息）
-        if len(text) > 1000:
-            return False, "内容过长"
+        Args:
+            text (str): 待检查的文本
+            
+        Returns:
+            Optional[str]: 命中的模式名称，未命中返回None
+        """
+        if self._pattern_db is not None:
+            scratch = getattr(self._scan_local, 'scratch', None)
+            if scratch is None:
+                scratch = self._scan_local.scratch = hyperscan.Scratch(self._pattern_db)
+            
+            hits = []
+            
+            def on_match(pattern_id, start, end, flags, context):
+                if not hits:
+                    hits.append(pattern_id)
+            
+            self._pattern_db.scan(text.encode('utf-8'), match_event_handler=on_match, scratch=scratch)
+            return self._pattern_names[hits[0]] if hits else None
         
-        return True, "关键词检查通过"
+        match = self._PATTERN_RE.search(text)
+        return match.lastgroup if match else None
     
-    def _check_content_safety_with_llm(self, text: str) -> Tuple[bool, str]:
+    def _build_pattern_database(self):
+        """
+        将不安全模式编译为Hyperscan数据库
+        
+        Returns:
+            hyperscan.Database: 以模式序号为ID的数据库
+        """
+        # 与re/RE2共用UNSAFE_PATTERNS；UTF-8模式下字符类按码点匹配，全角数字类同样生效
+        database = hyperscan.Database()
+        database.compile(
+            expressions=[self.unsafe_patterns[name].encode('utf-8') for name in self._pattern_names],
+            ids=list(range(len(self._pattern_names))),
+            elements=len(self._pattern_names),
+            flags=[hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_SINGLEMATCH] * len(self._pattern_names)
+        )
+        return database
+    
+    def _check_content_safety_with_llm(self, text: str, llm: PooledOllama) -> Tuple[bool, str]:
         """
         使用LLM检查内容安全性
         
         Args:
             text (str): 待检查的文本
+            llm (PooledOllama): 执行检查的模型
+            
+        Returns:
+            Tuple[bool, str]: (是否安全, 原因)
+        """
+        # 在共享的后台事件循环中执行，使并发请求的检查能被合并成批
+        return run_coroutine_sync(self._acheck_content_safety_with_llm(text, llm))
+    
+    async def _acheck_content_safety_with_llm(self, text: str, llm: PooledOllama) -> Tuple[bool, str]:
+        """
+        异步使用LLM检查内容安全性，LLM调用经微批处理器与其他并发检查合并
+        
+        Args:
+            text (str): 待检查的文本
+            llm (PooledOllama): 执行检查的模型
             
         Returns:
             Tuple[bool, str]: (是否安全, 原因)
         """
-        # 使用LLM进行语义安全检查
-        llm_response = self.safety_chain.run({"content": text})
+        prompt_text = self.safety_prompt.format(content=text)
+        llm_response = await self._llm_batcher.submit((llm, prompt_text))
         
         # 解析LLM响应
         if llm_response.startswith("SAFE"):
@@ -187,6 +388,21 @@ class SafetyAgent(BaseAgent):
             # 如果LLM响应格式不正确，认为内容安全
             return True, "LLM检查通过"
     
+    async def _generate_batch(self, items: List[Tuple[PooledOllama, str]]) -> List[str]:
+        """
+        对同一模型的一批安全检查提示词执行一次批量生成
+        
+        Args:
+            items (List[Tuple[PooledOllama, str]]): (模型, 提示词)列表
+            
+        Returns:
+            List[str]: 与输入顺序一致的响应文本
+        """
+        llm = items[0][0]
+        async with self._llm_semaphore:
+            result = await llm.agenerate([prompt_text for _, prompt_text in items])
+        return [generations[0].text for generations in result.generations]
+    
     def _check_content_safety(self, text: str) -> Tuple[bool, str]:
         """
         基础内容安全检查（备用方法）
@@ -197,19 +413,19 @@ class SafetyAgent(BaseAgent):
         Returns:
             Tuple[bool, str]: (是否安全, 原因)
         """
+        # 先检查长度，过长的内容无需再扫描关键词和模式
+        if len(text) > self.MAX_CONTENT_LENGTH:
+            return False, "内容过长"
+        
         # 检查关键词
-        for keyword in self.unsafe_keywords:
-            if keyword in text:
-                return False, f"包含不安全关键词: {keyword}"
+        keyword = self._find_unsafe_keyword(text)
+        if keyword is not None:
+            return False, f"包含不安全关键词: {keyword}"
         
         # 检查模式
-        for pattern in self.unsafe_patterns:
-            if re.search(pattern, text):
-                return False, f"包含不安全模式: {pattern}"
-        
-        # 检查长度（过长的内容可能包含不适宜信息）
-        if len(text) > 1000:
-            return False, "内容过长"
+        pattern_name = self._find_unsafe_pattern(text)
+        if pattern_name is not None:
+            return False, f"包含不安全模式: {pattern_name}"
         
         # 如果没有发现问题，则认为是安全的
         return True, "内容安全"
@@ -7,8 +7,10 @@
 
 import jwt
 import hashlib
+import hmac
 import secrets
-from functools import wraps
+import time
+from functools import lru_cache, wraps
 from flask import request, jsonify
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
@@ -18,6 +20,20 @@ SECRET_KEY = "edu-ai-system-secret-key"
 ADMIN_PASSWORD_HASH = hashlib.sha256("admin123".encode()).hexdigest()  # 示例密码
 
 
+@lru_cache(maxsize=4096)
+def _decode_token(token: str) -> Dict[str, Any]:
+    """
+    校验签名并解码JWT令牌，结果按令牌缓存，同一令牌只需计算一次HMAC
+    
+    Args:
+        token (str): JWT令牌
+        
+    Returns:
+        Dict[str, Any]: 令牌载荷
+    """
+    return jwt.decode(token, SECRET_KEY, algorithms=['HS256'])
+
+
 class AuthManager:
     """
     认证管理类
@@ -56,12 +72,17 @@ class AuthManager:
             Optional[Dict[str, Any]]: 令牌载荷，如果验证失败则返回None
         """
         try:
-            payload = jwt.decode(token, SECRET_KEY, algorithms=['HS256'])
-            return payload
+            payload = _decode_token(token)
         except jwt.ExpiredSignatureError:
             return None
         except jwt.InvalidTokenError:
             return None
+        
+        # 缓存命中时不会再次检查过期时间，需要在这里检查
+        if 'exp' in payload and payload['exp'] <= time.time():
+            return None
+        # 返回副本，避免调用方修改缓存中的载荷
+        return dict(payload)
     
     @staticmethod
     def hash_password(password: str) -> str:
@@ -88,7 +109,8 @@ class AuthManager:
         Returns:
             bool: 密码是否正确
         """
-        return AuthManager.hash_password(password) == hashed_password
+        # 常数时间比较，避免通过比较耗时推测哈希值
+        return hmac.compare_digest(AuthManager.hash_password(password), hashed_password)
 
 
 def require_auth(user_types: list = None):
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+基于orjson的Flask JSON序列化
+"""
+
+from typing import Any
+
+import orjson
+from flask.json.provider import DefaultJSONProvider
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    使用orjson进行JSON编解码的Flask JSON提供者，
+    jsonify和request.get_json无需修改即可使用C实现的序列化
+    """
+    
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        """
+        序列化对象为JSON字符串
+        
+        Args:
+            obj (Any): 待序列化的对象
+            **kwargs: Flask传入的参数，仅识别indent
+        
+        Returns:
+            str: JSON字符串
+        """
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+        # orjson不支持的类型（如Decimal）交给Flask默认的转换函数处理
+        return orjson.dumps(obj, default=self.default, option=option).decode('utf-8')
+    
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        """
+        反序列化JSON字符串
+        
+        Args:
+            s (Any): JSON字符串或字节串
+        
+        Returns:
+            Any: 反序列化后的对象
+        """
+        return orjson.loads(s)
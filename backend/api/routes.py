@@ -5,12 +5,19 @@
 API路由
 """
 
-from flask import Blueprint, request, jsonify
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Optional, Set
+import orjson
+from flask import Blueprint, Response, request, jsonify, stream_with_context
+from pydantic import ValidationError
 from backend.agents.meta_agent import MetaAgent
 from backend.agents.safety_agent import SafetyAgent
 from backend.agents.memory_agent import MemoryAgent
 from backend.database.manager import DatabaseManager
+from backend.database.batch_writer import BatchWriter
 from backend.database.queries import DatabaseQueries
+from backend.api.schemas import ChatRequest
 from backend.logging.logger import EduAILogger
 
 # 创建蓝图
@@ -22,8 +29,18 @@ safety_agent = SafetyAgent()
 memory_agent = MemoryAgent()
 db_manager = DatabaseManager()
 db_queries = DatabaseQueries(db_manager)
+# 对话记录和安全日志经批量写入器合并写入，多个请求共用一次事务提交
+conversation_writer = BatchWriter(lambda rows: db_manager.insert_conversations(rows),
+                                  name="conversation-writer")
+safety_log_writer = BatchWriter(lambda rows: db_manager.insert_safety_logs(rows),
+                                name="safety-log-writer")
 logger = EduAILogger()
 
+# 后台持久化线程池，数据库写入、日志和记忆存储不占用请求的响应时间
+persistence_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='chat-persist')
+_pending_persistence: Set[Future] = set()
+_pending_lock = threading.Lock()
+
 
 @api_bp.route('/health', methods=['GET'])
 def health_check():
@@ -38,12 +55,12 @@ def health_check():
 def chat():
     """聊天接口"""
     try:
-        # 获取请求数据
-        data = request.get_json()
-        user_text = data.get('text', '')
-        user_id = data.get('user_id', 'default_user')
-        user_grade = data.get('grade', '小学')
-        user_emotion = data.get('emotion', 'neutral')
+        # 直接从请求体解析并校验请求数据
+        chat_request = ChatRequest.model_validate_json(request.get_data())
+        user_text = chat_request.text
+        user_id = chat_request.user_id
+        user_grade = chat_request.grade or '小学'
+        user_emotion = chat_request.emotion or 'neutral'
         
         if not user_text:
             return jsonify({
@@ -62,80 +79,134 @@ def chat():
             'emotion': user_emotion
         }
         
-        # 获取Agent响应
+        # 获取Agent响应，响应文本和Agent名称只取一次，后续检查和持久化共用
         agent_response = meta_agent.process(input_data)
+        response_text = agent_response.get('response', '')
+        agent_name = agent_response.get('agent', 'Unknown')
         
         # 安全检查
-        safety_input = {
-            'response': agent_response.get('response', ''),
-            'agent': agent_response.get('agent', 'Unknown')
-        }
-        safety_result = safety_agent.process(safety_input)
+        safety_result = safety_agent.process({'response': response_text, 'agent': agent_name})
+        safety_status = safety_result['status']
         
         # 如果安全检查未通过，生成安全响应
-        if safety_result['status'] == 'rejected':
-            safe_response = safety_agent.generate_safe_response(user_text)
-            final_response = safe_response
-            
+        if safety_status == 'rejected':
+            final_response = safety_agent.generate_safe_response(user_text)
+            violation_reason = safety_result.get('reason', 'Unknown')
+        else:
+            final_response = response_text
+            violation_reason = None
+        
+        # 持久化和日志记录交给后台线程，响应立即返回
+        _submit_persistence(user_id, user_text, response_text, agent_name,
+                            safety_status, violation_reason, final_response)
+        
+        return jsonify({
+            'status': 'success',
+            'response': final_response,
+            'agent': agent_name
+        })
+        
+    except ValidationError as e:
+        logger.warning(f"聊天请求数据无效: {e}")
+        return jsonify({
+            'status': 'error',
+            'message': '请求数据格式错误'
+        }), 400
+    except Exception as e:
+        logger.error(f"处理聊天请求时出错: {e}")
+        return jsonify({
+            'status': 'error',
+            'message': '处理请求时发生错误'
+        }), 500
+
+
+def _submit_persistence(*args):
+    """
+    提交后台持久化任务并跟踪其完成状态
+    
+    Args:
+        *args: 传给_persist_chat的参数
+    """
+    future = persistence_executor.submit(_persist_chat, *args)
+    with _pending_lock:
+        _pending_persistence.add(future)
+    future.add_done_callback(_discard_pending)
+
+
+def _discard_pending(future: Future):
+    """移除已完成的持久化任务"""
+    with _pending_lock:
+        _pending_persistence.discard(future)
+
+
+def flush_persistence():
+    """等待已提交的后台持久化任务全部完成，包括批量写入器中尚未写入的记录"""
+    with _pending_lock:
+        pending = list(_pending_persistence)
+    wait(pending)
+    safety_log_writer.flush()
+    conversation_writer.flush()
+
+
+def _persist_chat(user_id: str, user_text: str, response_text: str, agent_name: str,
+                  safety_status: str, violation_reason: Optional[str], final_response: str):
+    """
+    持久化一次聊天交互：安全违规记录、对话历史、记忆和交互日志
+    
+    Args:
+        user_id (str): 用户ID
+        user_text (str): 用户输入
+        response_text (str): Agent生成的原始响应
+        agent_name (str): 生成响应的Agent名称
+        safety_status (str): 安全检查结果状态
+        violation_reason (Optional[str]): 安全违规原因，未违规时为None
+        final_response (str): 返回给用户的最终响应
+    """
+    try:
+        if safety_status == 'rejected':
             # 记录安全违规
-            safety_log_data = {
+            safety_log_writer.submit({
                 'user_id': user_id,
                 'user_input': user_text,
-                'agent_response': agent_response.get('response', ''),
-                'violation_reason': safety_result.get('reason', 'Unknown'),
-                'agent_name': agent_response.get('agent', 'Unknown')
-            }
-            db_manager.insert_safety_log(safety_log_data)
+                'agent_response': response_text,
+                'violation_reason': violation_reason,
+                'agent_name': agent_name
+            })
             logger.log_safety_violation(
                 user_id=user_id,
                 user_input=user_text,
-                agent_response=agent_response.get('response', ''),
-                violation_reason=safety_result.get('reason', 'Unknown'),
-                agent_name=agent_response.get('agent', 'Unknown')
+                agent_response=response_text,
+                violation_reason=violation_reason,
+                agent_name=agent_name
             )
-        else:
-            final_response = agent_response.get('response', '')
         
         # 存储对话历史
-        conversation_data = {
+        conversation_writer.submit({
             'user_id': user_id,
             'user_input': user_text,
             'agent_response': final_response,
-            'agent_name': agent_response.get('agent', 'Unknown'),
-            'safety_check': safety_result['status']
-        }
-        db_manager.insert_conversation(conversation_data)
+            'agent_name': agent_name,
+            'safety_check': safety_status
+        })
         
         # 添加到记忆Agent
-        memory_data = {
+        memory_agent.process({
             'action': 'add_to_memory',
             'user_id': user_id,
             'human_message': user_text,
             'ai_message': final_response
-        }
-        memory_agent.process(memory_data)
+        })
         
         # 记录交互日志
         logger.log_interaction(
             user_id=user_id,
             user_input=user_text,
             agent_response=final_response,
-            agent_name=agent_response.get('agent', 'Unknown'),
-            safety_check=safety_result['status']
+            agent_name=agent_name,
+            safety_check=safety_status
         )
-        
-        return jsonify({
-            'status': 'success',
-            'response': final_response,
-            'agent': agent_response.get('agent', 'Unknown')
-        })
-        
     except Exception as e:
-        logger.error(f"处理聊天请求时出错: {e}")
-        return jsonify({
-            'status': 'error',
-            'message': '处理请求时发生错误'
-        }), 500
+        logger.error(f"持久化用户 {user_id} 的聊天记录时出错: {e}")
 
 
 @api_bp.route('/user/<user_id>/history', methods=['GET'])
@@ -143,12 +214,22 @@ def get_user_history(user_id):
     """获取用户对话历史"""
     try:
         limit = request.args.get('limit', 10, type=int)
-        history = db_queries.get_user_conversation_history(user_id, limit)
+        history = iter(db_queries.iter_user_conversation_history(user_id, limit))
         
-        return jsonify({
-            'status': 'success',
-            'history': [conv.to_dict() for conv in history]
-        })
+        # 先取出第一条记录，查询出错时仍能返回错误响应
+        first = next(history, None)
+        first_json = orjson.dumps(first.to_dict()) if first is not None else None
+        
+        def generate():
+            """逐条序列化对话记录，数据库返回一条就发送一条"""
+            yield b'{"status":"success","history":['
+            if first_json is not None:
+                yield first_json
+                for conv in history:
+                    yield b',' + orjson.dumps(conv.to_dict())
+            yield b']}'
+        
+        return Response(stream_with_context(generate()), mimetype='application/json')
         
     except Exception as e:
         logger.error(f"获取用户 {user_id} 历史记录时出错: {e}")
@@ -12,8 +12,9 @@ from datetime import datetime
 
 class ChatRequest(BaseModel):
     """聊天请求数据模型"""
-    text: str
+    text: str = ""
     user_id: str = "default_user"
+    grade: Optional[str] = None
     emotion: Optional[str] = None
 
 
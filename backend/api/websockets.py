@@ -7,33 +7,80 @@ WebSocket处理
 
 from flask_socketio import SocketIO, emit, join_room, leave_room
 from flask import request
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+from datetime import datetime
+import atexit
 import json
+import logging
+import logging.handlers
+import os
+import queue
+import time
+from contextlib import closing
+from backend.api.routes import meta_agent, safety_agent
+from backend.utils.async_utils import iterate_async_sync
 
 # 初始化SocketIO
 socketio = None
 
+# WebSocket日志记录器，处理函数只把日志记录放入队列，由后台监听线程写入文件
+ws_logger = logging.getLogger('EduAI.WebSocket')
+ws_logger.setLevel(logging.INFO)
+ws_logger.propagate = False
+_log_listener: Optional[logging.handlers.QueueListener] = None
+
+# 流式响应的合并发送阈值：攒够片段数或距上次发送超过时间（秒）即发送一次
+STREAM_CHUNK_BATCH_SIZE = 8
+STREAM_CHUNK_MAX_DELAY = 0.05
+
 
 def init_socketio(app):
     """初始化SocketIO"""
     global socketio
     socketio = SocketIO(app, cors_allowed_origins="*")
+    _start_log_listener()
     register_events()
     return socketio
 
 
+def _start_log_listener(log_dir: str = "logs"):
+    """
+    启动WebSocket日志的后台写入线程
+    
+    Args:
+        log_dir (str): 日志目录
+    """
+    global _log_listener
+    if _log_listener is not None:
+        return
+    
+    os.makedirs(log_dir, exist_ok=True)
+    file_handler = logging.FileHandler(
+        os.path.join(log_dir, f"ws_{datetime.now().strftime('%Y%m%d')}.log"), encoding='utf-8'
+    )
+    file_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    
+    log_queue = queue.SimpleQueue()
+    ws_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    _log_listener = logging.handlers.QueueListener(log_queue, file_handler)
+    _log_listener.start()
+    
+    # 进程退出前写完队列中剩余的日志
+    atexit.register(_log_listener.stop)
+
+
 def register_events():
     """注册WebSocket事件处理函数"""
     @socketio.on('connect')
     def handle_connect():
         """处理客户端连接"""
-        print(f'客户端连接: {request.sid}')
+        ws_logger.info('客户端连接: %s', request.sid)
         emit('connected', {'data': 'WebSocket连接成功'})
 
     @socketio.on('disconnect')
     def handle_disconnect():
         """处理客户端断开连接"""
-        print(f'客户端断开连接: {request.sid}')
+        ws_logger.info('客户端断开连接: %s', request.sid)
 
     @socketio.on('join')
     def handle_join(data):
@@ -64,20 +111,63 @@ def register_events():
                 emit('error', {'message': '消息内容不能为空'})
                 return
             
-            # 这里应该调用实际的聊天处理逻辑
-            # 模拟处理结果
+            input_data = {
+                'text': user_text,
+                'user_id': user_id,
+                'context': data.get('context', {})
+            }
+            agent = meta_agent.route(user_text)
+            agent_name = agent.get_name()
+            
+            # 模型逐段生成时边生成边发送，多个片段合并为一次发送，避免逐片段发送的开销；
+            # 每次发送前对已生成的全部文本做关键词和模式检查，未通过时停止生成，不再发送
+            chunks = []
+            buffer = []
+            stream_safe = True
+            last_emit = time.monotonic()
+            with closing(iterate_async_sync(agent.process_stream(input_data))) as stream:
+                for chunk in stream:
+                    chunks.append(chunk)
+                    buffer.append(chunk)
+                    if len(buffer) >= STREAM_CHUNK_BATCH_SIZE or time.monotonic() - last_emit > STREAM_CHUNK_MAX_DELAY:
+                        stream_safe = safety_agent._check_keywords_and_patterns(''.join(chunks))[0]
+                        if not stream_safe:
+                            break
+                        emit('chat_chunk', {'delta': ''.join(buffer)})
+                        buffer.clear()
+                        last_emit = time.monotonic()
+            response_text = ''.join(chunks)
+            if buffer and stream_safe:
+                stream_safe = safety_agent._check_keywords_and_patterns(response_text)[0]
+                if stream_safe:
+                    emit('chat_chunk', {'delta': ''.join(buffer)})
+            
+            # 完整响应再经过与/chat相同的安全检查，未通过时以安全响应替换已发送的片段
+            if stream_safe:
+                safety_result = safety_agent.process({
+                    'response': response_text,
+                    'agent': agent_name,
+                    'user_id': user_id
+                })
+                safety_status = safety_result['status']
+            else:
+                safety_status = 'rejected'
+            if safety_status == 'rejected':
+                response_text = safety_agent.generate_safe_response(user_text)
+            
             response = {
-                'response': f'收到消息: {user_text}',
-                'agent': 'WebSocketAgent',
-                'user_id': user_id
+                'response': response_text,
+                'agent': agent_name,
+                'user_id': user_id,
+                'safety_check': safety_status
             }
             
-            # 发送响应给客户端
+            # 发送完整响应，标记流结束（客户端以该响应为准）
             emit('chat_response', response)
             
             # 广播到用户房间
             room_response = response.copy()
-            room_response['timestamp'] = __import__('datetime').datetime.now().isoformat()
+            room_response['timestamp'] = datetime.now().isoformat()
             emit('user_message', room_response, room=user_id)
             
         except Exception as e:
@@ -103,7 +193,7 @@ def register_events():
     @socketio.on('error')
     def handle_error(error):
         """处理错误"""
-        print(f'WebSocket错误: {error}')
+        ws_logger.error('WebSocket错误: %s', error)
 
 
 def send_realtime_update(room: str, event: str, data: Dict[str, Any]):
@@ -7,10 +7,12 @@ Flask主应用
 
 from flask import Flask
 from flask_cors import CORS
+from backend.api.json_provider import OrjsonProvider
 
 def create_app():
     """创建Flask应用"""
     app = Flask(__name__)
+    app.json = OrjsonProvider(app)  # 使用orjson编解码JSON
     CORS(app)  # 允许跨域请求
     
     # 加载配置
@@ -5,10 +5,106 @@
 音频编解码
 """
 
-from typing import Any, Dict
+from typing import Any, Dict, Tuple
 import numpy as np
-import io
-import wave
+import mmap
+import struct
+
+
+# 标准44字节WAV文件头：RIFF块、fmt子块（PCM）和data子块头
+_WAV_HEADER = struct.Struct('<4sI4s4sIHHIIHH4sI')
+
+# 子块头（块ID、块大小）和fmt子块的前16字节
+_CHUNK_HEADER = struct.Struct('<4sI')
+_FMT_CHUNK = struct.Struct('<HHIIHH')
+
+# PCM格式标记：普通PCM和WAVE_FORMAT_EXTENSIBLE
+_PCM_FORMAT_TAGS = (1, 0xFFFE)
+
+# 采样宽度（字节）对应的小端整数类型
+_SAMPLE_DTYPES = {2: np.dtype('<i2'), 4: np.dtype('<i4')}
+
+
+def _pack_wav_header(data_size: int, sample_rate: int, channels: int = 1, sample_width: int = 2) -> bytes:
+    """
+    生成PCM格式的WAV文件头
+    
+    Args:
+        data_size (int): 音频数据字节数
+        sample_rate (int): 采样率
+        channels (int): 声道数
+        sample_width (int): 采样宽度（字节）
+        
+    Returns:
+        bytes: 44字节的WAV文件头
+    """
+    block_align = channels * sample_width
+    return _WAV_HEADER.pack(
+        b'RIFF', 36 + data_size, b'WAVE',
+        b'fmt ', 16, 1, channels, sample_rate, sample_rate * block_align, block_align, sample_width * 8,
+        b'data', data_size
+    )
+
+
+def _parse_wav_header(buffer: Any) -> Tuple[int, int, int, int, int]:
+    """
+    解析WAV文件头，依次遍历子块找到fmt和data子块
+    
+    Args:
+        buffer (Any): WAV数据，支持缓冲区协议的对象
+        
+    Returns:
+        Tuple[int, int, int, int, int]: (声道数, 采样宽度, 采样率, 音频数据偏移, 音频数据字节数)
+    """
+    view = memoryview(buffer)
+    if len(view) < 12 or view[0:4] != b'RIFF' or view[8:12] != b'WAVE':
+        raise ValueError("不是有效的WAV数据")
+    
+    fmt = None
+    offset = 12
+    while offset + _CHUNK_HEADER.size <= len(view):
+        chunk_id, chunk_size = _CHUNK_HEADER.unpack_from(view, offset)
+        body = offset + _CHUNK_HEADER.size
+        if chunk_id == b'fmt ':
+            fmt = _FMT_CHUNK.unpack_from(view, body)
+        elif chunk_id == b'data':
+            if fmt is None:
+                raise ValueError("WAV数据缺少fmt子块")
+            format_tag, channels, sample_rate, _, _, bits_per_sample = fmt
+            if format_tag not in _PCM_FORMAT_TAGS:
+                raise ValueError(f"不支持的WAV编码格式: {format_tag}")
+            # 截断到实际可用的完整帧
+            sample_width = (bits_per_sample + 7) // 8
+            frame_size = channels * sample_width
+            data_size = min(chunk_size, len(view) - body) // frame_size * frame_size
+            return channels, sample_width, sample_rate, body, data_size
+        # 子块按偶数字节对齐
+        offset = body + chunk_size + (chunk_size & 1)
+    raise ValueError("WAV数据缺少data子块")
+
+
+def _samples_from_buffer(buffer: Any, header: Tuple[int, int, int, int, int]) -> np.ndarray:
+    """
+    将WAV音频数据转换为numpy数组，16/32位音频直接引用原缓冲区
+    
+    Args:
+        buffer (Any): WAV数据，支持缓冲区协议的对象
+        header (Tuple): _parse_wav_header返回的文件头信息
+        
+    Returns:
+        np.ndarray: 音频数据
+    """
+    channels, sample_width, _, data_offset, data_size = header
+    if sample_width == 1:
+        # 8位WAV为以128为中心的无符号数：转换后原地去偏置并放大到16位范围，只分配一次
+        audio_data = np.frombuffer(buffer, dtype=np.uint8, count=data_size, offset=data_offset).astype(np.int16)
+        audio_data -= 128
+        audio_data <<= 8
+        return audio_data
+    if sample_width in _SAMPLE_DTYPES:
+        return np.frombuffer(buffer, dtype=_SAMPLE_DTYPES[sample_width],
+                             count=data_size // sample_width, offset=data_offset)
+    raise ValueError(f"不支持的采样宽度: {sample_width}")
 
 
 class AudioCodec:
@@ -33,59 +129,79 @@ class AudioCodec:
         """
         # 确保数据类型为16位整数
         if audio_data.dtype != np.int16:
-            # 归一化到-1到1之间
-            audio_data = audio_data / np.max(np.abs(audio_data))
-            # 转换为16位整数
-            audio_data = (audio_data * 32767).astype(np.int16)
-        
-        # 创建WAV文件
-        buffer = io.BytesIO()
-        with wave.open(buffer, 'wb') as wav_file:
-            wav_file.setnchannels(1)  # 单声道
-            wav_file.setsampwidth(2)  # 16位
-            wav_file.setframerate(sample_rate)
-            wav_file.writeframes(audio_data.tobytes())
+            # 峰值由最大值和最小值得出，无需分配绝对值临时数组
+            peak = max(float(audio_data.max()), -float(audio_data.min())) if audio_data.size else 0.0
+            scale = np.float32(32767.0 / peak) if peak > 0 else np.float32(0.0)
+            
+            # 归一化和缩放合并为一次乘法，在同一个float32缓冲区内取整后转换为16位整数
+            scaled = np.multiply(audio_data, scale, dtype=np.float32)
+            np.rint(scaled, out=scaled)
+            audio_data = scaled.astype(np.int16)
         
-        return buffer.getvalue()
+        # 单声道16位小端PCM：直接拼接预先打包的文件头和数组缓冲区，只拷贝一次音频数据
+        audio_data = np.ascontiguousarray(audio_data, dtype='<i2')
+        header = _pack_wav_header(audio_data.nbytes, sample_rate)
+        return b''.join((header, memoryview(audio_data).cast('B')))
     
     def decode_wav(self, wav_data: bytes) -> Dict[str, Any]:
         """
-        解码WAV格式音频数据
+        解码WAV格式音频数据，16/32位音频直接作为输入缓冲区的视图返回，不复制数据
         
         Args:
-            wav_data (bytes): WAV格式的音频数据
+            wav_data (bytes): WAV格式的音频数据，可以是任何支持缓冲区协议的对象
             
         Returns:
             Dict[str, Any]: 解码结果，包括音频数据和元信息
         """
-        buffer = io.BytesIO(wav_data)
-        with wave.open(buffer, 'rb') as wav_file:
-            # 获取音频参数
-            channels = wav_file.getnchannels()
-            sample_width = wav_file.getsampwidth()
-            sample_rate = wav_file.getframerate()
-            frames = wav_file.getnframes()
-            
-            # 读取音频数据
-            raw_audio_data = wav_file.readframes(frames)
+        header = _parse_wav_header(wav_data)
+        audio_data = _samples_from_buffer(wav_data, header)
+        return self._decode_result(audio_data, header)
+    
+    def decode_wav_mmap(self, path: str) -> Dict[str, Any]:
+        """
+        以内存映射方式解码WAV文件，16/32位音频按需从文件分页读取，不整体加载到内存
+        
+        Args:
+            path (str): WAV文件路径
             
-            # 转换为numpy数组
-            if sample_width == 1:
-                audio_data = np.frombuffer(raw_audio_data, dtype=np.uint8)
-                audio_data = audio_data.astype(np.int16)
-            elif sample_width == 2:
-                audio_data = np.frombuffer(raw_audio_data, dtype=np.int16)
-            elif sample_width == 4:
-                audio_data = np.frombuffer(raw_audio_data, dtype=np.int32)
-            else:
-                raise ValueError(f"不支持的采样宽度: {sample_width}")
+        Returns:
+            Dict[str, Any]: 解码结果，包括音频数据和元信息
+        """
+        with open(path, 'rb') as wav_file:
+            with mmap.mmap(wav_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                header = _parse_wav_header(mapped)
+        
+        channels, sample_width, sample_rate, data_offset, data_size = header
+        frames = data_size // (channels * sample_width)
+        if sample_width == 1:
+            # 8位音频需要去偏置，无法零拷贝
+            audio_data = _samples_from_buffer(np.memmap(path, dtype=np.uint8, mode='r'), header)
+        elif sample_width in _SAMPLE_DTYPES:
+            audio_data = np.memmap(path, dtype=_SAMPLE_DTYPES[sample_width], mode='r',
+                                   offset=data_offset, shape=(frames * channels,))
+        else:
+            raise ValueError(f"不支持的采样宽度: {sample_width}")
+        return self._decode_result(audio_data, header)
+    
+    @staticmethod
+    def _decode_result(audio_data: np.ndarray, header: Tuple[int, int, int, int, int]) -> Dict[str, Any]:
+        """
+        组装解码结果
         
+        Args:
+            audio_data (np.ndarray): 音频数据
+            header (Tuple): WAV文件头信息
+            
+        Returns:
+            Dict[str, Any]: 解码结果
+        """
+        channels, sample_width, sample_rate, _, data_size = header
         return {
             'audio_data': audio_data,
             'sample_rate': sample_rate,
             'channels': channels,
             'sample_width': sample_width,
-            'frames': frames
+            'frames': data_size // (channels * sample_width)
         }
     
     def convert_format(self, audio_data: np.ndarray, from_format: str, to_format: str) -> bytes:
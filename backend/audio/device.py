@@ -0,0 +1,23 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+音频模型推理设备选择
+"""
+
+try:
+    import torch
+except ImportError:  # 未安装PyTorch时在CPU上推理
+    torch = None
+
+
+def get_inference_device() -> str:
+    """
+    选择音频模型的推理设备
+    
+    Returns:
+        str: 有可用GPU时为'cuda'，否则为'cpu'
+    """
+    if torch is not None and torch.cuda.is_available():
+        return 'cuda'
+    return 'cpu'
@@ -6,8 +6,51 @@
 """
 
 import numpy as np
+from math import gcd
 from typing import Any
 
+try:
+    import soxr  # libsoxr高质量重采样
+except ImportError:
+    soxr = None
+
+try:
+    from scipy.signal import resample_poly  # 多相FIR重采样
+except ImportError:
+    resample_poly = None
+
+try:
+    from numba import njit  # JIT编译数值循环
+except ImportError:
+    njit = None
+
+
+def _trim_bounds(audio_data: np.ndarray, threshold: float):
+    """
+    从两端向内扫描，找出首个和最后一个超过阈值的采样点
+    
+    Args:
+        audio_data (np.ndarray): 一维音频数据
+        threshold (float): 静音阈值
+        
+    Returns:
+        Tuple[int, int]: (起始下标, 结束下标)，全部为静音时起始下标大于结束下标
+    """
+    # 用区间比较代替abs，避免整数最小值取绝对值时溢出
+    lower = -threshold
+    start = 0
+    end = len(audio_data) - 1
+    while start <= end and lower <= audio_data[start] <= threshold:
+        start += 1
+    while end >= start and lower <= audio_data[end] <= threshold:
+        end -= 1
+    return start, end
+
+
+# 安装了Numba时编译为机器码，单次扫描且不分配临时数组
+if njit is not None:
+    _trim_bounds = njit(cache=True, fastmath=True)(_trim_bounds)
+
 
 class AudioProcessor:
     """
@@ -28,15 +71,17 @@ class AudioProcessor:
         Returns:
             np.ndarray: 归一化后的音频数据
         """
-        # 确保数据类型为浮点型
-        audio_data = audio_data.astype(np.float32)
+        # 转换为连续的float32数组，这是唯一一次拷贝，输出直接复用该缓冲区，不修改调用方的数据
+        audio_data = np.array(audio_data, dtype=np.float32, order='C')
+        if audio_data.size == 0:
+            return audio_data
         
-        # 计算最大值
-        max_val = np.max(np.abs(audio_data))
+        # 峰值由最大值和最小值得出，无需分配绝对值临时数组
+        max_val = max(float(audio_data.max()), -float(audio_data.min()))
         
-        # 避免除零错误
+        # 避免除零错误；用乘以倒数代替除法，原地缩放
         if max_val > 0:
-            audio_data = audio_data / max_val
+            np.multiply(audio_data, np.float32(1.0 / max_val), out=audio_data)
             
         return audio_data
     
@@ -51,20 +96,24 @@ class AudioProcessor:
         Returns:
             np.ndarray: 移除静音后的音频数据
         """
-        # 计算音频的绝对值
-        abs_audio = np.abs(audio_data)
+        if njit is not None:
+            start_idx, end_idx = _trim_bounds(audio_data, threshold)
+            if start_idx > end_idx:
+                return np.array([])
+            # 返回原数组的视图，不复制数据
+            return audio_data[start_idx:end_idx+1]
         
-        # 找到非静音部分
-        non_silent_indices = np.where(abs_audio > threshold)[0]
+        # 非静音掩码；argmax取首个True的位置，无需生成int64下标数组
+        mask = np.abs(audio_data) > threshold
         
-        if len(non_silent_indices) > 0:
-            # 提取非静音部分
-            start_idx = non_silent_indices[0]
-            end_idx = non_silent_indices[-1]
-            return audio_data[start_idx:end_idx+1]
-        else:
+        if not mask.any():
             # 如果全部是静音，返回空数组
             return np.array([])
+        
+        # 提取非静音部分
+        start_idx = int(mask.argmax())
+        end_idx = len(mask) - int(mask[::-1].argmax())
+        return audio_data[start_idx:end_idx]
     
     def resample(self, audio_data: np.ndarray, original_rate: int, target_rate: int) -> np.ndarray:
         """
@@ -81,14 +130,18 @@ class AudioProcessor:
         if original_rate == target_rate:
             return audio_data
         
-        # 计算重采样比例
-        ratio = target_rate / original_rate
+        # 保持连续的float32数据，避免重采样内部再做类型转换和拷贝
+        audio_data = np.ascontiguousarray(audio_data, dtype=np.float32)
         
-        # 计算新长度
-        new_length = int(len(audio_data) * ratio)
+        # 优先使用带限重采样，避免线性插值引入的混叠
+        if soxr is not None:
+            return soxr.resample(audio_data, original_rate, target_rate, quality='HQ')
         
-        # 简单的重采样实现（实际应用中应使用专业库如scipy）
-        indices = np.linspace(0, len(audio_data) - 1, new_length)
-        resampled = np.interp(indices, np.arange(len(audio_data)), audio_data)
+        if resample_poly is not None:
+            divisor = gcd(original_rate, target_rate)
+            return resample_poly(audio_data, target_rate // divisor, original_rate // divisor).astype(np.float32, copy=False)
         
-        return resampled
\ No newline at end of file
+        # 未安装重采样库时退回线性插值
+        new_length = int(len(audio_data) * target_rate / original_rate)
+        indices = np.linspace(0, len(audio_data) - 1, new_length, dtype=np.float32)
+        return np.interp(indices, np.arange(len(audio_data), dtype=np.float32), audio_data).astype(np.float32)
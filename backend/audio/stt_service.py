@@ -6,7 +6,10 @@
 支持多种模型包括Fish Speech v1.2
 """
 
-from typing import Any, Dict
+import asyncio
+from typing import Any, Dict, List
+from backend.audio.device import get_inference_device
+from backend.utils.async_utils import AsyncMicroBatcher
 from backend.utils.config_loader import config_loader
 from backend.utils.model_manager import model_manager
 import numpy as np
@@ -17,6 +20,10 @@ class STTService:
     语音转文本服务类
     """
     
+    # 微批处理参数：单批最大音频数和攒批的最长等待时间（秒）
+    BATCH_MAX_SIZE = 8
+    BATCH_MAX_WAIT = 0.01
+    
     def __init__(self):
         """初始化STT服务"""
         # 加载配置
@@ -24,6 +31,16 @@ class STTService:
         self.model_config = model_manager.get_audio_model_config("stt")
         self.model_type = self.model_config.get('model', 'fish-speech-v1.2')
         
+        # 有GPU时在GPU上推理
+        self.device = get_inference_device()
+        
+        # 将并发的异步转录请求合并成批，在线程池中执行一次批量推理
+        self._batcher = AsyncMicroBatcher(
+            self._transcribe_batch_async,
+            max_batch_size=self.BATCH_MAX_SIZE,
+            max_wait=self.BATCH_MAX_WAIT
+        )
+        
         # 初始化模型
         self._initialize_model()
     
@@ -45,7 +62,7 @@ class STTService:
         # 示例代码：
         # from fish_speech import FishSpeechModel
         # model_path = self.model_config.get('model_path')
-        # self.model = FishSpeechModel.load_model(model_path)
+        # self.model = FishSpeechModel.load_model(model_path).to(self.device)
         pass
     
     def _init_whisper_model(self):
@@ -53,7 +70,7 @@ class STTService:
         # 这里应该加载Whisper模型
         # 示例代码：
         # import whisper
-        # self.model = whisper.load_model("base")
+        # self.model = whisper.load_model("base", device=self.device)
         pass
     
     def transcribe(self, audio_data: Any) -> Dict[str, Any]:
@@ -74,6 +91,55 @@ class STTService:
             # 默认实现
             return self._default_transcribe(audio_data)
     
+    async def transcribe_async(self, audio_data: Any) -> Dict[str, Any]:
+        """
+        异步将音频数据转换为文本，并发请求合并为一批推理，不阻塞事件循环
+        
+        Args:
+            audio_data (Any): 音频数据
+            
+        Returns:
+            Dict[str, Any]: 转录结果
+        """
+        return await self._batcher.submit(audio_data)
+    
+    async def _transcribe_batch_async(self, batch: List[Any]) -> List[Dict[str, Any]]:
+        """
+        在线程池中执行一批转录
+        
+        Args:
+            batch (List[Any]): 音频数据列表
+            
+        Returns:
+            List[Dict[str, Any]]: 与输入顺序一致的转录结果
+        """
+        return await asyncio.to_thread(self.transcribe_batch, batch)
+    
+    def transcribe_batch(self, batch: List[Any]) -> List[Dict[str, Any]]:
+        """
+        批量将音频数据转换为文本，音频补齐到相同长度组成一个批次
+        
+        Args:
+            batch (List[Any]): 音频数据列表
+            
+        Returns:
+            List[Dict[str, Any]]: 与输入顺序一致的转录结果
+        """
+        audios = [np.asarray(audio_data, dtype=np.float32).ravel() for audio_data in batch]
+        lengths = [len(audio) for audio in audios]
+        
+        # 补零对齐到批次内的最大长度，得到一块连续的(批大小, 最大长度)缓冲区
+        padded = np.zeros((len(audios), max(lengths, default=0)), dtype=np.float32)
+        for row, audio in zip(padded, audios):
+            row[:len(audio)] = audio
+        
+        # 这里应该对整个批次执行一次模型推理
+        # 示例代码：
+        # return self.model.transcribe_batch(padded, lengths)
+        
+        # 目前逐条调用模拟实现
+        return [self.transcribe(padded[i, :length]) for i, length in enumerate(lengths)]
+    
     def _transcribe_with_fish_speech(self, audio_data: Any) -> Dict[str, Any]:
         """
         使用Fish Speech v1.2进行转录
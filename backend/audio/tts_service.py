@@ -6,8 +6,12 @@
 支持多种模型包括Whisper
 """
 
-from typing import Any, Dict
+import asyncio
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
 import numpy as np
+from backend.audio.device import get_inference_device
+from backend.utils.async_utils import AsyncMicroBatcher
 from backend.utils.config_loader import config_loader
 from backend.utils.model_manager import model_manager
 
@@ -17,6 +21,13 @@ class TTSService:
     文本转语音服务类
     """
     
+    # 合成结果缓存的最大条目数，问候语、提示语等重复文本无需重复合成
+    SYNTHESIS_CACHE_SIZE = 256
+    
+    # 微批处理参数：单批最大文本数和攒批的最长等待时间（秒）
+    BATCH_MAX_SIZE = 8
+    BATCH_MAX_WAIT = 0.01
+    
     def __init__(self):
         """初始化TTS服务"""
         # 加载配置
@@ -24,6 +35,22 @@ class TTSService:
         self.model_config = model_manager.get_audio_model_config("tts")
         self.model_type = self.model_config.get('model', 'whisper')
         
+        # 有GPU时在GPU上推理
+        self.device = get_inference_device()
+        
+        # 模拟合成使用的随机数生成器，直接生成float32，无需先生成float64再转换
+        self._rng = np.random.default_rng()
+        
+        # 按(文本, 语音参数, 模型)缓存合成结果
+        self._cached_synthesize = lru_cache(maxsize=self.SYNTHESIS_CACHE_SIZE)(self._synthesize_uncached)
+        
+        # 将并发的异步合成请求合并成批，在线程池中执行一次批量推理
+        self._batcher = AsyncMicroBatcher(
+            self._synthesize_batch_async,
+            max_batch_size=self.BATCH_MAX_SIZE,
+            max_wait=self.BATCH_MAX_WAIT
+        )
+        
         # 初始化模型
         self._initialize_model()
     
@@ -45,7 +72,7 @@ class TTSService:
         # 示例代码：
         # from whisper_tts import WhisperTTSModel
         # model_path = self.model_config.get('model_path')
-        # self.model = WhisperTTSModel.load_model(model_path)
+        # self.model = WhisperTTSModel.load_model(model_path).to(self.device)
         pass
     
     def _init_fish_speech_model(self):
@@ -54,7 +81,7 @@ class TTSService:
         # 示例代码：
         # from fish_speech import FishSpeechTTSModel
         # model_path = self.model_config.get('model_path')
-        # self.model = FishSpeechTTSModel.load_model(model_path)
+        # self.model = FishSpeechTTSModel.load_model(model_path).to(self.device)
         pass
     
     def synthesize(self, text: str, voice_params: Dict[str, Any] = None) -> Dict[str, Any]:
@@ -66,15 +93,106 @@ class TTSService:
             voice_params (Dict[str, Any], optional): 语音参数，如音调、语速等
             
         Returns:
-            Dict[str, Any]: 合成结果，包括音频数据和采样率等信息
+            Dict[str, Any]: 合成结果，包括音频数据和采样率等信息；音频数据为只读数组，可能与其他调用共享
         """
-        if self.model_type == 'whisper':
-            return self._synthesize_with_whisper(text, voice_params)
-        elif self.model_type == 'fish-speech-v1.2':
-            return self._synthesize_with_fish_speech(text, voice_params)
+        params_key = self._voice_params_key(voice_params)
+        if params_key is None and voice_params:
+            # 语音参数不可哈希时不使用缓存
+            return self._synthesize_uncached(text, None, self.model_type, voice_params)
+        
+        # 返回缓存结果的浅拷贝，调用方修改结果字典不影响缓存
+        return dict(self._cached_synthesize(text, params_key, self.model_type))
+    
+    async def synthesize_async(self, text: str, voice_params: Dict[str, Any] = None) -> Dict[str, Any]:
+        """
+        异步将文本转换为音频，并发请求合并为一批推理，不阻塞事件循环
+        
+        Args:
+            text (str): 要转换的文本
+            voice_params (Dict[str, Any], optional): 语音参数
+            
+        Returns:
+            Dict[str, Any]: 合成结果
+        """
+        return await self._batcher.submit((text, voice_params))
+    
+    async def _synthesize_batch_async(self, batch: List[Tuple[str, Optional[Dict[str, Any]]]]) -> List[Dict[str, Any]]:
+        """
+        在线程池中执行一批合成
+        
+        Args:
+            batch (List[Tuple[str, Optional[Dict[str, Any]]]]): (文本, 语音参数)列表
+            
+        Returns:
+            List[Dict[str, Any]]: 与输入顺序一致的合成结果
+        """
+        return await asyncio.to_thread(self.synthesize_batch, batch)
+    
+    def synthesize_batch(self, batch: List[Tuple[str, Optional[Dict[str, Any]]]]) -> List[Dict[str, Any]]:
+        """
+        批量将文本转换为音频
+        
+        Args:
+            batch (List[Tuple[str, Optional[Dict[str, Any]]]]): (文本, 语音参数)列表
+            
+        Returns:
+            List[Dict[str, Any]]: 与输入顺序一致的合成结果
+        """
+        # 这里应该对整个批次执行一次模型推理
+        # 示例代码：
+        # return self.model.synthesize_batch(texts, voice_params_list)
+        
+        # 目前逐条调用（命中缓存的文本无需重复合成）
+        return [self.synthesize(text, voice_params) for text, voice_params in batch]
+    
+    @staticmethod
+    def _voice_params_key(voice_params: Optional[Dict[str, Any]]) -> Optional[Tuple[Tuple[str, Any], ...]]:
+        """
+        将语音参数转换为可哈希的缓存键
+        
+        Args:
+            voice_params (Dict[str, Any], optional): 语音参数
+            
+        Returns:
+            Optional[Tuple]: 按参数名排序的(参数名, 值)元组，参数为空或不可哈希时返回None
+        """
+        if not voice_params:
+            return None
+        params_key = tuple(sorted(voice_params.items()))
+        try:
+            hash(params_key)
+        except TypeError:
+            return None
+        return params_key
+    
+    def _synthesize_uncached(self, text: str, params_key: Optional[Tuple[Tuple[str, Any], ...]],
+                             model_type: str, voice_params: Dict[str, Any] = None) -> Dict[str, Any]:
+        """
+        按模型类型执行语音合成
+        
+        Args:
+            text (str): 要转换的文本
+            params_key (Optional[Tuple]): 语音参数缓存键
+            model_type (str): 模型类型
+            voice_params (Dict[str, Any], optional): 语音参数，未提供时由缓存键还原
+            
+        Returns:
+            Dict[str, Any]: 合成结果，音频数据设为只读
+        """
+        if voice_params is None and params_key is not None:
+            voice_params = dict(params_key)
+        
+        if model_type == 'whisper':
+            result = self._synthesize_with_whisper(text, voice_params)
+        elif model_type == 'fish-speech-v1.2':
+            result = self._synthesize_with_fish_speech(text, voice_params)
         else:
             # 默认实现
-            return self._default_synthesize(text, voice_params)
+            result = self._default_synthesize(text, voice_params)
+        
+        # 缓存的音频数据被多次返回，禁止调用方原地修改
+        result['audio_data'].flags.writeable = False
+        return result
     
     def _synthesize_with_whisper(self, text: str, voice_params: Dict[str, Any] = None) -> Dict[str, Any]:
         """
@@ -97,7 +215,7 @@ class TTSService:
         num_samples = int(duration * sample_rate)
         
         # 生成模拟音频数据
-        audio_data = np.random.randn(num_samples).astype(np.float32)
+        audio_data = self._generate_mock_audio(num_samples)
         
         synthesis_result = {
             'audio_data': audio_data,
@@ -129,7 +247,7 @@ class TTSService:
         num_samples = int(duration * sample_rate)
         
         # 生成模拟音频数据
-        audio_data = np.random.randn(num_samples).astype(np.float32)
+        audio_data = self._generate_mock_audio(num_samples)
         
         synthesis_result = {
             'audio_data': audio_data,
@@ -157,7 +275,7 @@ class TTSService:
         num_samples = int(duration * sample_rate)
         
         # 生成模拟音频数据
-        audio_data = np.random.randn(num_samples).astype(np.float32)
+        audio_data = self._generate_mock_audio(num_samples)
         
         synthesis_result = {
             'audio_data': audio_data,
@@ -168,6 +286,23 @@ class TTSService:
         
         return synthesis_result
     
+    def _generate_mock_audio(self, num_samples: int) -> np.ndarray:
+        """
+        生成模拟音频数据
+        
+        合成结果会被缓存并返回给多个调用方，因此每次分配新的缓冲区而不复用，
+        由调用方持有
+        
+        Args:
+            num_samples (int): 采样点数
+            
+        Returns:
+            np.ndarray: float32音频数据
+        """
+        audio_data = np.empty(num_samples, dtype=np.float32)
+        self._rng.standard_normal(dtype=np.float32, out=audio_data)
+        return audio_data
+    
     def synthesize_with_emotion(self, text: str, emotion: str = 'neutral') -> Dict[str, Any]:
         """
         将文本转换为带有情感的音频
@@ -6,11 +6,125 @@
 支持SpeakEncoder模型
 """
 
-from typing import Any, Dict, List
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
 import hashlib
+from backend.database.manager import DatabaseManager
 from backend.utils.config_loader import config_loader
+from backend.utils.lfu_cache import LFUCache
 from backend.utils.model_manager import model_manager
 import numpy as np
+from scipy.fft import dct
+
+try:
+    import blake3
+except ImportError:  # 未安装blake3时使用标准库的BLAKE2
+    blake3 = None
+
+
+# 声纹特征参数：帧长、帧移、梅尔滤波器数量和MFCC系数数量
+FRAME_LENGTH = 512
+HOP_LENGTH = 256
+N_MELS = 64
+N_MFCC = 40
+
+# 估计背景MFCC均值所用白噪声的时长（秒）
+BACKGROUND_NOISE_SECONDS = 10
+
+# 简化哈希声纹的向量维度
+HASH_VOICEPRINT_DIM = 192
+
+
+def _sample_digest(voice_sample: Any) -> bytes:
+    """
+    计算声音样本原始字节的哈希，用作声纹缓存键和简化声纹
+    
+    Args:
+        voice_sample (Any): 声音样本，音频数组或字节串
+        
+    Returns:
+        bytes: 32字节哈希值
+    """
+    if isinstance(voice_sample, (bytes, bytearray, memoryview)):
+        data = voice_sample
+    else:
+        # 直接对数组缓冲区计算哈希，避免str()生成被截断的数组表示
+        data = memoryview(np.ascontiguousarray(voice_sample)).cast('B')
+    
+    if blake3 is not None:
+        return blake3.blake3(data).digest()
+    return hashlib.blake2b(data, digest_size=32).digest()
+
+
+@lru_cache(maxsize=8)
+def _mel_filterbank(sample_rate: int, n_fft: int = FRAME_LENGTH, n_mels: int = N_MELS) -> np.ndarray:
+    """
+    构建梅尔滤波器组，按采样率缓存
+    
+    Args:
+        sample_rate (int): 采样率
+        n_fft (int): FFT点数
+        n_mels (int): 梅尔滤波器数量
+        
+    Returns:
+        np.ndarray: 形状为(有效滤波器数, n_fft // 2 + 1)的float32滤波器矩阵
+    """
+    def hz_to_mel(hz):
+        return 2595.0 * np.log10(1.0 + hz / 700.0)
+    
+    def mel_to_hz(mel):
+        return 700.0 * (10.0 ** (mel / 2595.0) - 1.0)
+    
+    mel_points = np.linspace(hz_to_mel(0.0), hz_to_mel(sample_rate / 2.0), n_mels + 2)
+    bins = np.floor((n_fft + 1) * mel_to_hz(mel_points) / sample_rate).astype(int)
+    
+    filterbank = np.zeros((n_mels, n_fft // 2 + 1), dtype=np.float32)
+    for m in range(1, n_mels + 1):
+        left, center, right = bins[m - 1], bins[m], bins[m + 1]
+        if center > left:
+            filterbank[m - 1, left:center] = (np.arange(left, center) - left) / (center - left)
+        if right > center:
+            filterbank[m - 1, center:right] = (right - np.arange(center, right)) / (right - center)
+    
+    # 低频处宽度不足一个FFT频点的滤波器恒为零，其对数能量与音量无关，会破坏MFCC的音量不变性
+    return filterbank[filterbank.any(axis=1)]
+
+
+def _frame_mfcc(audio: np.ndarray, sample_rate: int) -> np.ndarray:
+    """
+    计算各帧的MFCC，丢弃反映音量的第0个系数
+    
+    Args:
+        audio (np.ndarray): float32音频数据，至少FRAME_LENGTH个采样点
+        sample_rate (int): 采样率
+        
+    Returns:
+        np.ndarray: 形状为(帧数, N_MFCC - 1)的MFCC
+    """
+    # 分帧加窗（帧为原数组的视图，不复制数据）
+    frames = np.lib.stride_tricks.sliding_window_view(audio, FRAME_LENGTH)[::HOP_LENGTH]
+    spectrum = np.abs(np.fft.rfft(frames * np.hanning(FRAME_LENGTH).astype(np.float32), axis=1)) ** 2
+    
+    # 梅尔能量取对数后做DCT得到MFCC
+    mel_energy = spectrum.astype(np.float32) @ _mel_filterbank(sample_rate).T
+    return dct(np.log(mel_energy + 1e-10), type=2, axis=1, norm='ortho')[:, 1:N_MFCC]
+
+
+@lru_cache(maxsize=8)
+def _background_mfcc_mean(sample_rate: int) -> np.ndarray:
+    """
+    计算白噪声的MFCC均值作为背景参考，按采样率缓存
+    
+    滤波器带宽和窗函数使任何声音的MFCC均值都带有相同的偏置，不减去时不同声音的余弦相似度普遍很高
+    
+    Args:
+        sample_rate (int): 采样率
+        
+    Returns:
+        np.ndarray: 形状为(N_MFCC - 1,)的float32背景均值
+    """
+    noise = np.random.default_rng(0).standard_normal(sample_rate * BACKGROUND_NOISE_SECONDS, dtype=np.float32)
+    return _frame_mfcc(noise, sample_rate).mean(axis=0).astype(np.float32)
 
 
 class VoiceVerification:
@@ -18,18 +132,44 @@ class VoiceVerification:
     声纹验证类，用于验证用户身份
     """
     
-    def __init__(self):
-        """初始化声纹验证服务"""
+    # 声纹特征缓存的最大条目数，同一段声音重复验证时无需重新提取
+    VOICEPRINT_CACHE_SIZE = 1024
+    
+    def __init__(self, db_manager: Optional[DatabaseManager] = None):
+        """
+        初始化声纹验证服务
+        
+        Args:
+            db_manager (DatabaseManager, optional): 数据库管理器，提供时注册的声纹持久化到数据库，
+                重启或多个进程之间无需重新注册
+        """
         # 加载配置
         self.config = config_loader.load_config("configs/audio.yaml")
         self.model_config = model_manager.get_audio_model_config("verification")
         self.model_type = self.model_config.get('model', 'speakencoder')
         
-        # 存储用户声纹特征（实际应用中应该存储更复杂的特征向量）
+        # 提取声纹特征时使用的采样率
+        self.sample_rate = self.config.get('audio_processing', {}).get('sample_rate', 22050)
+        
+        # 存储用户声纹特征（L2归一化的float32向量）
         self.user_voiceprints = {}
         
+        # 批量验证用的注册声纹矩阵（每行一个用户），注册新用户后延迟重建
+        self._enroll_matrix: Optional[np.ndarray] = None
+        self._enroll_ids: List[str] = []
+        self._enroll_rows: Dict[str, int] = {}
+        
+        # 按(模型, 样本类型, 样本哈希)缓存提取的声纹特征
+        self._voiceprint_cache = LFUCache(capacity=self.VOICEPRINT_CACHE_SIZE)
+        
         # 初始化模型
         self._initialize_model()
+        
+        # 加载已持久化的声纹
+        self.db_manager = db_manager
+        if self.db_manager is not None:
+            for row in self.db_manager.iter_voiceprints(self.model_type):
+                self.user_voiceprints[row['user_id']] = self._voiceprint_from_row(row)
     
     def _initialize_model(self):
         """初始化声纹验证模型"""
@@ -73,15 +213,14 @@ class VoiceVerification:
         """
         try:
             # 提取声纹特征
-            if self.model_type == 'speakencoder':
-                voiceprint = self._extract_voiceprint_with_speakencoder(voice_sample)
-            elif self.model_type == 'google-voice-id':
-                voiceprint = self._extract_voiceprint_with_google(voice_sample)
-            else:
-                # 默认实现
-                voiceprint = self._extract_voiceprint(voice_sample)
-                
+            voiceprint = self._extract_voiceprint_for_model(voice_sample)
+            
             self.user_voiceprints[user_id] = voiceprint
+            self._enroll_matrix = None
+            
+            if self.db_manager is not None:
+                vec = np.ascontiguousarray(voiceprint, dtype=np.float32)
+                return self.db_manager.save_voiceprint(user_id, self.model_type, len(vec), vec.tobytes())
             return True
         except Exception as e:
             print(f"注册用户声纹时出错: {e}")
@@ -98,7 +237,7 @@ class VoiceVerification:
         Returns:
             Dict[str, Any]: 验证结果
         """
-        if user_id not in self.user_voiceprints:
+        if user_id not in self.user_voiceprints and not self._load_voiceprint(user_id):
             return {
                 'verified': False,
                 'message': '用户未注册'
@@ -106,18 +245,15 @@ class VoiceVerification:
         
         try:
             # 提取待验证声音的声纹特征
+            voiceprint = self._extract_voiceprint_for_model(voice_sample)
+            registered_voiceprint = self.user_voiceprints[user_id]
+            
             if self.model_type == 'speakencoder':
-                voiceprint = self._extract_voiceprint_with_speakencoder(voice_sample)
-                registered_voiceprint = self.user_voiceprints[user_id]
                 similarity = self._calculate_similarity_with_speakencoder(voiceprint, registered_voiceprint)
             elif self.model_type == 'google-voice-id':
-                voiceprint = self._extract_voiceprint_with_google(voice_sample)
-                registered_voiceprint = self.user_voiceprints[user_id]
                 similarity = self._calculate_similarity_with_google(voiceprint, registered_voiceprint)
             else:
                 # 默认实现
-                voiceprint = self._extract_voiceprint(voice_sample)
-                registered_voiceprint = self.user_voiceprints[user_id]
                 similarity = self._calculate_similarity(voiceprint, registered_voiceprint)
             
             # 设定阈值
@@ -136,6 +272,192 @@ class VoiceVerification:
                 'message': f'验证过程中出错: {e}'
             }
     
+    def verify_batch(self, voice_sample: Any, candidate_ids: Optional[List[str]] = None,
+                     top_k: int = 5) -> Dict[str, Any]:
+        """
+        将一段声音与多个已注册用户比对（说话人辨认），一次矩阵向量乘法得到全部相似度
+        
+        Args:
+            voice_sample (Any): 待验证的声音样本
+            candidate_ids (List[str], optional): 候选用户ID，默认为全部已注册用户
+            top_k (int): 返回相似度最高的用户数
+            
+        Returns:
+            Dict[str, Any]: 验证结果，matches按相似度降序排列
+        """
+        threshold = self.config.get('voice_verification', {}).get('similarity_threshold', 0.8)
+        
+        try:
+            matrix, ids = self._candidate_matrix(candidate_ids)
+            
+            if not ids:
+                return {
+                    'verified': False,
+                    'matches': [],
+                    'threshold': threshold,
+                    'message': '用户未注册'
+                }
+            
+            # 声纹特征均已L2归一化，矩阵向量乘积即各用户的余弦相似度
+            query = self._extract_voiceprint_for_model(voice_sample)
+            scores = np.maximum(matrix @ query, 0.0)
+            
+            # 只对前k个结果排序
+            k = min(top_k, len(ids))
+            top = np.argpartition(scores, -k)[-k:]
+            top = top[np.argsort(scores[top])[::-1]]
+            
+            matches = [
+                {
+                    'user_id': ids[row],
+                    'similarity': float(scores[row]),
+                    'verified': bool(scores[row] >= threshold)
+                }
+                for row in top
+            ]
+            verified = matches[0]['verified']
+            
+            return {
+                'verified': verified,
+                'user_id': matches[0]['user_id'] if verified else None,
+                'matches': matches,
+                'threshold': threshold,
+                'message': '验证通过' if verified else '验证失败'
+            }
+        except Exception as e:
+            return {
+                'verified': False,
+                'matches': [],
+                'message': f'验证过程中出错: {e}'
+            }
+    
+    def score_matrix(self, queries: np.ndarray,
+                     candidate_ids: Optional[List[str]] = None) -> Tuple[np.ndarray, List[str]]:
+        """
+        批量计算多个查询声纹与多个注册用户的相似度，一次矩阵乘法得到全部结果
+        
+        Args:
+            queries (np.ndarray): 形状为(查询数, 特征维度)的查询声纹
+            candidate_ids (List[str], optional): 候选用户ID，默认为全部已注册用户
+            
+        Returns:
+            Tuple[np.ndarray, List[str]]: 形状为(查询数, 用户数)的余弦相似度矩阵和各列对应的用户ID
+        """
+        queries = np.array(queries, dtype=np.float32, ndmin=2)
+        norms = np.linalg.norm(queries, axis=1, keepdims=True)
+        queries /= np.maximum(norms, np.float32(1e-9))
+        
+        matrix, ids = self._candidate_matrix(candidate_ids)
+        if not ids:
+            return np.empty((len(queries), 0), dtype=np.float32), ids
+        return queries @ matrix.T, ids
+    
+    def _candidate_matrix(self, candidate_ids: Optional[List[str]] = None) -> Tuple[np.ndarray, List[str]]:
+        """
+        获取候选用户的注册声纹矩阵，跳过未注册的用户
+        
+        Args:
+            candidate_ids (List[str], optional): 候选用户ID，默认为全部已注册用户
+            
+        Returns:
+            Tuple[np.ndarray, List[str]]: 声纹矩阵和每行对应的用户ID
+        """
+        matrix, ids = self._get_enroll_matrix()
+        if candidate_ids is not None:
+            rows = [self._enroll_rows[user_id] for user_id in candidate_ids if user_id in self._enroll_rows]
+            matrix, ids = matrix[rows], [ids[row] for row in rows]
+        return matrix, ids
+    
+    def _load_voiceprint(self, user_id: str) -> bool:
+        """
+        从数据库加载其它进程注册的用户声纹
+        
+        Args:
+            user_id (str): 用户ID
+            
+        Returns:
+            bool: 是否找到该用户的声纹
+        """
+        if self.db_manager is None:
+            return False
+        
+        row = self.db_manager.get_voiceprint(user_id, self.model_type)
+        if not row:
+            return False
+        
+        self.user_voiceprints[user_id] = self._voiceprint_from_row(row)
+        self._enroll_matrix = None
+        return True
+    
+    @staticmethod
+    def _voiceprint_from_row(row: Dict[str, Any]) -> np.ndarray:
+        """
+        将数据库中的声纹记录转换为声纹特征
+        
+        Args:
+            row (Dict[str, Any]): 声纹记录
+            
+        Returns:
+            np.ndarray: 只读的float32声纹特征（直接引用数据库返回的字节）
+        """
+        return np.frombuffer(row['vec'], dtype=np.float32, count=row['dim'])
+    
+    def _get_enroll_matrix(self) -> Tuple[np.ndarray, List[str]]:
+        """
+        获取注册声纹矩阵，注册用户变化后重建
+        
+        Returns:
+            Tuple[np.ndarray, List[str]]: 形状为(用户数, 特征维度)的连续float32矩阵和对应的用户ID
+        """
+        if self._enroll_matrix is None:
+            self._enroll_ids = list(self.user_voiceprints)
+            self._enroll_rows = {user_id: row for row, user_id in enumerate(self._enroll_ids)}
+            if self._enroll_ids:
+                self._enroll_matrix = np.ascontiguousarray(
+                    np.stack([self.user_voiceprints[user_id] for user_id in self._enroll_ids]),
+                    dtype=np.float32
+                )
+            else:
+                self._enroll_matrix = np.empty((0, 0), dtype=np.float32)
+        return self._enroll_matrix, self._enroll_ids
+    
+    def _extract_voiceprint_for_model(self, voice_sample: Any) -> np.ndarray:
+        """
+        使用当前配置的模型提取声纹特征
+        
+        Args:
+            voice_sample (Any): 声音样本，数值音频数组或16位PCM字节串
+            
+        Returns:
+            np.ndarray: 声纹特征（只读，可能被多次返回）
+            
+        Raises:
+            ValueError: 样本不是字节串或数值数组（如字符串），或不足以提取声纹
+        """
+        if isinstance(voice_sample, (bytes, bytearray, memoryview)):
+            sample_type = 'bytes'
+        else:
+            voice_sample = np.asarray(voice_sample)
+            if voice_sample.dtype.kind not in 'biuf':
+                raise ValueError(f"不支持的声音样本类型: {voice_sample.dtype}")
+            sample_type = voice_sample.dtype.str
+        key = (self.model_type, sample_type, _sample_digest(voice_sample))
+        voiceprint = self._voiceprint_cache.get(key)
+        if voiceprint is not None:
+            return voiceprint
+        
+        if self.model_type == 'speakencoder':
+            voiceprint = self._extract_voiceprint_with_speakencoder(voice_sample)
+        elif self.model_type == 'google-voice-id':
+            voiceprint = self._extract_voiceprint_with_google(voice_sample)
+        else:
+            # 默认实现
+            voiceprint = self._extract_voiceprint(voice_sample)
+        
+        voiceprint.flags.writeable = False
+        self._voiceprint_cache.put(key, voiceprint)
+        return voiceprint
+    
     def _extract_voiceprint_with_speakencoder(self, voice_sample: Any) -> Any:
         """
         使用SpeakEncoder提取声纹特征
@@ -151,10 +473,10 @@ class VoiceVerification:
         # features = self.model.extract_features(voice_sample)
         # return features
         
-        # 目前使用简化实现
-        return hashlib.md5(str(voice_sample).encode('utf-8')).hexdigest()
+        # 目前使用MFCC声纹特征
+        return self._extract_voiceprint(voice_sample)
     
-    def _extract_voiceprint_with_google(self, voice_sample: Any) -> Any:
+    def _extract_voiceprint_with_google(self, voice_sample: Any) -> np.ndarray:
         """
         使用Google Voice ID提取声纹特征
         
@@ -162,30 +484,70 @@ class VoiceVerification:
             voice_sample (Any): 声音样本
             
         Returns:
-            Any: 声纹特征
+            np.ndarray: 形状为(HASH_VOICEPRINT_DIM,)的float32声纹特征
         """
         # 这里应该使用Google Voice ID模型提取特征
         # 示例代码：
         # features = self.model.extract_features(voice_sample)
         # return features
         
-        # 目前使用简化实现
-        return hashlib.sha256(str(voice_sample).encode('utf-8')).hexdigest()
+        # 目前使用简化实现：由原始字节的哈希生成
+        digest = _sample_digest(voice_sample)
+        
+        # 将哈希字节扩展为定长向量并中心化、L2归一化，与其它声纹特征一样用点积比较
+        repeats = -(-HASH_VOICEPRINT_DIM // len(digest))
+        voiceprint = np.frombuffer(digest * repeats, dtype=np.uint8)[:HASH_VOICEPRINT_DIM].astype(np.float32)
+        voiceprint -= np.float32(127.5)
+        voiceprint /= np.linalg.norm(voiceprint) + np.float32(1e-9)
+        return voiceprint
     
-    def _extract_voiceprint(self, voice_sample: Any) -> str:
+    def _extract_voiceprint(self, voice_sample: Any) -> np.ndarray:
         """
-        从声音样本中提取声纹特征（默认实现）
+        从声音样本中提取声纹特征（默认实现）：各帧MFCC的均值减去背景均值，L2归一化
         
         Args:
-            voice_sample (Any): 声音样本
+            voice_sample (Any): 声音样本，音频数组或16位PCM字节串
+            
+        Returns:
+            np.ndarray: 形状为(N_MFCC - 1,)的float32声纹特征
+            
+        Raises:
+            ValueError: 样本不足一帧，短于一帧的样本频谱都近似冲激，无法区分说话人
+        """
+        audio = self._to_float_audio(voice_sample)
+        if len(audio) < FRAME_LENGTH:
+            raise ValueError(f"声音样本过短，至少需要{FRAME_LENGTH}个采样点")
+        
+        mfcc = _frame_mfcc(audio, self.sample_rate)
+        
+        # 只保留相对背景的偏离，两段无关的声音相似度接近0
+        voiceprint = np.ascontiguousarray(mfcc.mean(axis=0) - _background_mfcc_mean(self.sample_rate),
+                                          dtype=np.float32)
+        norm = np.linalg.norm(voiceprint)
+        if norm > 0:
+            voiceprint /= norm
+        return voiceprint
+    
+    @staticmethod
+    def _to_float_audio(voice_sample: Any) -> np.ndarray:
+        """
+        将声音样本转换为-1到1之间的float32数组
+        
+        Args:
+            voice_sample (Any): 声音样本，数值音频数组或16位PCM字节串
             
         Returns:
-            str: 声纹特征（简化为哈希值）
+            np.ndarray: float32音频数据
         """
-        # 实际应用中应该使用专业的声纹识别算法
-        # 这里简化为对样本数据的哈希处理
-        sample_str = str(voice_sample).encode('utf-8')
-        return hashlib.md5(sample_str).hexdigest()
+        if isinstance(voice_sample, (bytes, bytearray, memoryview)):
+            # 奇数长度时末尾不足一个采样点的字节被丢弃
+            data = memoryview(voice_sample).cast('B')
+            return np.frombuffer(data, dtype=np.int16, count=len(data) // 2).astype(np.float32) / 32768.0
+        
+        audio = np.asarray(voice_sample)
+        if np.issubdtype(audio.dtype, np.integer):
+            return audio.astype(np.float32) / np.float32(np.iinfo(audio.dtype).max + 1)
+        return audio.astype(np.float32, copy=False).ravel()
     
     def _calculate_similarity_with_speakencoder(self, voiceprint1: Any, voiceprint2: Any) -> float:
         """
@@ -225,21 +587,18 @@ class VoiceVerification:
         # 目前使用简化实现
         return self._calculate_similarity(voiceprint1, voiceprint2)
     
-    def _calculate_similarity(self, voiceprint1: str, voiceprint2: str) -> float:
+    def _calculate_similarity(self, voiceprint1: np.ndarray, voiceprint2: np.ndarray) -> float:
         """
         计算两个声纹特征的相似度（默认实现）
         
         Args:
-            voiceprint1 (str): 声纹特征1
-            voiceprint2 (str): 声纹特征2
+            voiceprint1 (np.ndarray): 声纹特征1
+            voiceprint2 (np.ndarray): 声纹特征2
             
         Returns:
             float: 相似度 (0-1)
         """
-        # 实际应用中应该使用更复杂的相似度计算方法
-        # 这里简化为比较相同字符的比例
-        if len(voiceprint1) != len(voiceprint2):
+        # 声纹特征均已L2归一化，点积即余弦相似度
+        if voiceprint1.shape != voiceprint2.shape:
             return 0.0
-        
-        matches = sum(c1 == c2 for c1, c2 in zip(voiceprint1, voiceprint2))
-        return matches / len(voiceprint1)
\ No newline at end of file
+        return max(0.0, float(np.dot(voiceprint1, voiceprint2)))
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+数据库批量写入器
+"""
+
+import atexit
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List
+
+
+class BatchWriter:
+    """
+    数据库批量写入器类，调用方提交单条记录后立即返回，
+    后台线程将短时间内积压的记录合并到一个事务中写入，多条记录只提交（fsync）一次
+    """
+    
+    def __init__(self, write_batch: Callable[[List[Dict[str, Any]]], Any],
+                 max_batch_size: int = 256, max_wait: float = 0.02,
+                 max_queue_size: int = 10000, name: str = "db-batch-writer"):
+        """
+        初始化批量写入器
+        
+        Args:
+            write_batch (Callable): 批量写入函数，接收记录列表
+            max_batch_size (int): 单批最大记录数
+            max_wait (float): 攒批的最长等待时间（秒）
+            max_queue_size (int): 队列容量，队列满时提交会阻塞
+            name (str): 后台线程名称
+        """
+        self.write_batch = write_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=max_queue_size)
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+        
+        # 进程退出前写完剩余记录
+        atexit.register(self.flush)
+    
+    def submit(self, record: Dict[str, Any]):
+        """
+        提交一条待写入的记录
+        
+        Args:
+            record (Dict[str, Any]): 记录数据
+        """
+        self._queue.put(record)
+    
+    def flush(self):
+        """等待已提交的记录全部写入"""
+        self._queue.join()
+    
+    def _run(self):
+        """后台写入循环"""
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            
+            try:
+                self.write_batch(batch)
+            except Exception as e:
+                print(f"批量写入数据库时出错: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
@@ -7,15 +7,157 @@
 
 import sqlite3
 import os
-from typing import Dict, Any, List
+import threading
+from itertools import starmap
+from typing import Dict, Any, Callable, Iterator, List, Optional
 from contextlib import contextmanager
 
 
+# 增量维护的统计汇总表：(汇总表, 源表, 分组表达式)；
+# 分组表达式中的{row}在触发器中替换为new或old
+_SUMMARY_TABLES = (
+    ('conversation_daily_counts', 'conversations', "DATE({row}.timestamp)"),
+    ('conversation_agent_counts', 'conversations', "IFNULL({row}.agent_name, '')"),
+    ('safety_reason_counts', 'safety_logs', "IFNULL({row}.violation_reason, '')"),
+    ('safety_agent_counts', 'safety_logs', "IFNULL({row}.agent_name, '')"),
+)
+
+
+def _summary_table_sql(summary_table: str, source_table: str, key_expr: str) -> List[str]:
+    """
+    生成汇总表及保持其同步的触发器
+    
+    Args:
+        summary_table (str): 汇总表名
+        source_table (str): 源表名
+        key_expr (str): 分组表达式
+        
+    Returns:
+        List[str]: 建表和建触发器语句
+    """
+    increment = f'''
+            INSERT INTO {summary_table}(key, count) VALUES ({key_expr.format(row='new')}, 1)
+            ON CONFLICT(key) DO UPDATE SET count = count + 1;'''
+    decrement = f'''
+            UPDATE {summary_table} SET count = count - 1 WHERE key = {key_expr.format(row='old')};'''
+    return [
+        f"CREATE TABLE IF NOT EXISTS {summary_table} (key TEXT PRIMARY KEY, count INTEGER NOT NULL)",
+        f"CREATE TRIGGER IF NOT EXISTS {summary_table}_ai AFTER INSERT ON {source_table} BEGIN{increment}\n        END",
+        f"CREATE TRIGGER IF NOT EXISTS {summary_table}_ad AFTER DELETE ON {source_table} BEGIN{decrement}\n        END",
+        f"CREATE TRIGGER IF NOT EXISTS {summary_table}_au AFTER UPDATE ON {source_table} BEGIN{decrement}{increment}\n        END",
+    ]
+
+
 class DatabaseManager:
     """
     数据库管理器类，负责数据库连接和基本操作
     """
     
+    # 按数据模型字段顺序排列的列，查询结果可直接按位置构造模型对象
+    CONVERSATION_COLUMNS = 'id, user_id, user_input, agent_response, agent_name, safety_check, timestamp'
+    SAFETY_LOG_COLUMNS = 'id, user_id, user_input, agent_response, violation_reason, agent_name, timestamp'
+    
+    _INSERT_CONVERSATION_SQL = '''
+        INSERT INTO conversations 
+        (user_id, user_input, agent_response, agent_name, safety_check) 
+        VALUES (?, ?, ?, ?, ?)
+    '''
+    
+    _CONVERSATION_HISTORY_SQL = f'''
+        SELECT {CONVERSATION_COLUMNS} FROM conversations 
+        WHERE user_id = ? 
+        ORDER BY timestamp DESC 
+        LIMIT ?
+    '''
+    
+    _FTS_SEARCH_SQL = '''
+        SELECT c.id, c.user_id, c.user_input, c.agent_response, c.agent_name, c.safety_check, c.timestamp 
+        FROM conversations_fts f 
+        JOIN conversations c ON c.id = f.rowid 
+        WHERE conversations_fts MATCH ? 
+        ORDER BY c.timestamp DESC 
+        LIMIT ?
+    '''
+    
+    _LIKE_SEARCH_SQL = f'''
+        SELECT {CONVERSATION_COLUMNS} FROM conversations 
+        WHERE user_input LIKE '%' || ?1 || '%' OR agent_response LIKE '%' || ?1 || '%' 
+        ORDER BY timestamp DESC 
+        LIMIT ?2
+    '''
+    
+    _SAFETY_VIOLATIONS_SQL = f'''
+        SELECT {SAFETY_LOG_COLUMNS} FROM safety_logs 
+        ORDER BY timestamp DESC 
+        LIMIT ?
+    '''
+    
+    _INSERT_SAFETY_LOG_SQL = '''
+        INSERT INTO safety_logs 
+        (user_id, user_input, agent_response, violation_reason, agent_name) 
+        VALUES (?, ?, ?, ?, ?)
+    '''
+    
+    _INDEX_SQL = (
+        # 按用户查询对话历史（WHERE user_id = ? ORDER BY timestamp DESC LIMIT ?）
+        "CREATE INDEX IF NOT EXISTS idx_conversations_user_ts ON conversations(user_id, timestamp)",
+        "CREATE INDEX IF NOT EXISTS idx_conversations_ts ON conversations(timestamp)",
+        "CREATE INDEX IF NOT EXISTS idx_conversations_agent ON conversations(agent_name)",
+        "CREATE INDEX IF NOT EXISTS idx_safety_logs_ts ON safety_logs(timestamp)",
+        "CREATE INDEX IF NOT EXISTS idx_safety_logs_reason ON safety_logs(violation_reason)",
+        "CREATE INDEX IF NOT EXISTS idx_users_grade ON users(grade)",
+    )
+    
+    # 逐行迭代查询结果时每批从SQLite取出的行数
+    ITER_FETCH_SIZE = 1000
+    
+    # 每个连接缓存的预编译语句数量
+    STATEMENT_CACHE_SIZE = 256
+    
+    # 每个连接的设置：WAL模式下NORMAL同步只在检查点时fsync，临时表放在内存中，
+    # 页缓存64MB，最多内存映射256MB数据库文件
+    _CONNECTION_PRAGMAS = (
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA cache_size=-65536",
+        "PRAGMA mmap_size=268435456",
+        "PRAGMA foreign_keys=ON",
+    )
+    
+    # 对话全文索引：外部内容表引用conversations，触发器保持同步；
+    # trigram分词支持中文等无空格文本的任意子串检索
+    _FTS_SQL = (
+        '''
+        CREATE VIRTUAL TABLE IF NOT EXISTS conversations_fts USING fts5(
+            user_input, agent_response,
+            content='conversations', content_rowid='id', tokenize='trigram'
+        )
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS conversations_fts_ai AFTER INSERT ON conversations BEGIN
+            INSERT INTO conversations_fts(rowid, user_input, agent_response)
+            VALUES (new.id, new.user_input, new.agent_response);
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS conversations_fts_ad AFTER DELETE ON conversations BEGIN
+            INSERT INTO conversations_fts(conversations_fts, rowid, user_input, agent_response)
+            VALUES ('delete', old.id, old.user_input, old.agent_response);
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS conversations_fts_au AFTER UPDATE ON conversations BEGIN
+            INSERT INTO conversations_fts(conversations_fts, rowid, user_input, agent_response)
+            VALUES ('delete', old.id, old.user_input, old.agent_response);
+            INSERT INTO conversations_fts(rowid, user_input, agent_response)
+            VALUES (new.id, new.user_input, new.agent_response);
+        END
+        ''',
+    )
+    
+    # trigram全文索引可检索的最短关键词长度
+    FTS_MIN_KEYWORD_LENGTH = 3
+    
     def __init__(self, db_path: str = "edu_ai.db"):
         """
         初始化数据库管理器
@@ -24,6 +166,13 @@ class DatabaseManager:
             db_path (str): 数据库文件路径
         """
         self.db_path = db_path
+        # 每个线程复用一个长连接，避免每次操作都重新打开数据库
+        self._local = threading.local()
+        
+        # WAL模式写入数据库文件后持久生效，读写互不阻塞，只需设置一次
+        with self.get_connection() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+        
         self._initialize_database()
     
     def _initialize_database(self):
@@ -70,6 +219,17 @@ class DatabaseManager:
                 )
             ''')
             
+            # 创建声纹表，声纹特征以float32原始字节存储
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS voiceprints (
+                    user_id TEXT PRIMARY KEY,
+                    model TEXT,
+                    dim INTEGER,
+                    vec BLOB,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            
             # 创建系统日志表
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS system_logs (
@@ -80,47 +240,188 @@ class DatabaseManager:
                 )
             ''')
             
+            # 为查询中的过滤、排序和分组列创建索引，避免全表扫描
+            for index_sql in self._INDEX_SQL:
+                cursor.execute(index_sql)
+            
+            # 创建对话全文索引，SQLite未编译FTS5或不支持trigram分词时退回LIKE检索
+            self.fts_enabled = self._initialize_fts(cursor)
+            
+            # 创建统计汇总表，统计查询只需读取汇总结果而不必聚合全表
+            self._initialize_summary_tables(cursor)
+            
             conn.commit()
     
+    def _initialize_summary_tables(self, cursor: sqlite3.Cursor):
+        """
+        创建统计汇总表和触发器，首次创建时由已有数据回填
+        
+        Args:
+            cursor (sqlite3.Cursor): 数据库游标
+        """
+        for summary_table, source_table, key_expr in _SUMMARY_TABLES:
+            exists = cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (summary_table,)
+            ).fetchone() is not None
+            for summary_sql in _summary_table_sql(summary_table, source_table, key_expr):
+                cursor.execute(summary_sql)
+            
+            if not exists:
+                key = key_expr.format(row=source_table)
+                cursor.execute(f'''
+                    INSERT INTO {summary_table}(key, count) 
+                    SELECT {key}, COUNT(*) FROM {source_table} GROUP BY {key}
+                ''')
+    
+    def get_summary_counts(self, summary_table: str, min_key: Optional[str] = None) -> Dict[Optional[str], int]:
+        """
+        读取统计汇总表，按数量降序排列
+        
+        Args:
+            summary_table (str): 汇总表名，见_SUMMARY_TABLES
+            min_key (str, optional): 只返回键不小于该值的分组（如日期下限）
+            
+        Returns:
+            Dict[Optional[str], int]: 分组 -> 数量，源数据中为NULL的分组键为None
+        """
+        if summary_table not in {table for table, _, _ in _SUMMARY_TABLES}:
+            raise ValueError(f"未知的统计汇总表: {summary_table}")
+        
+        query = f"SELECT NULLIF(key, '') as key, count FROM {summary_table} WHERE count > 0"
+        params: tuple = ()
+        if min_key is not None:
+            query += " AND key >= ?"
+            params = (min_key,)
+        query += " ORDER BY count DESC"
+        return {row['key']: row['count'] for row in self.execute_query(query, params)}
+    
+    def _initialize_fts(self, cursor: sqlite3.Cursor) -> bool:
+        """
+        创建对话全文索引，首次创建时为已有对话建立索引
+        
+        Args:
+            cursor (sqlite3.Cursor): 数据库游标
+            
+        Returns:
+            bool: 全文索引是否可用
+        """
+        exists = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'conversations_fts'"
+        ).fetchone() is not None
+        try:
+            for fts_sql in self._FTS_SQL:
+                cursor.execute(fts_sql)
+        except sqlite3.OperationalError as e:
+            print(f"创建对话全文索引失败，使用LIKE检索: {e}")
+            return False
+        
+        if not exists:
+            cursor.execute("INSERT INTO conversations_fts(conversations_fts) VALUES ('rebuild')")
+        return True
+    
+    def _thread_connection(self) -> sqlite3.Connection:
+        """
+        获取当前线程的数据库连接，首次调用时创建
+        
+        Returns:
+            sqlite3.Connection: 数据库连接
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # 连接内按SQL文本缓存预编译语句，长连接下重复查询无需重新解析和规划
+            conn = sqlite3.connect(self.db_path, cached_statements=self.STATEMENT_CACHE_SIZE)
+            conn.row_factory = sqlite3.Row
+            for pragma in self._CONNECTION_PRAGMAS:
+                conn.execute(pragma)
+            self._local.conn = conn
+        return conn
+    
     @contextmanager
     def get_connection(self):
         """
-        获取数据库连接的上下文管理器
+        获取数据库连接的上下文管理器，正常退出时提交事务（如有），出错时回滚
         
         Yields:
-            sqlite3.Connection: 数据库连接
+            sqlite3.Connection: 当前线程复用的数据库连接
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = self._thread_connection()
         try:
             yield conn
         except Exception as e:
             conn.rollback()
             raise e
         else:
-            conn.commit()
-        finally:
-            conn.close()
+            # 只读操作没有开启事务，无需提交
+            if conn.in_transaction:
+                conn.commit()
     
-    def execute_query(self, query: str, params: tuple = ()) -> List[Dict[str, Any]]:
+    def execute_query(self, query: str, params: tuple = (),
+                      row_type: Optional[Callable[..., Any]] = None) -> List[Any]:
         """
         执行查询语句
         
         Args:
             query (str): SQL查询语句
             params (tuple): 查询参数
+            row_type (Callable, optional): 行类型，按列的位置构造（如数据模型类）；默认返回字典
             
         Returns:
-            List[Dict[str, Any]]: 查询结果
+            List[Any]: 查询结果
         """
         with self.get_connection() as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
+            cursor = self._cursor(conn, row_type)
             cursor.execute(query, params)
             rows = cursor.fetchall()
             
+            if row_type is not None:
+                return list(starmap(row_type, rows))
             # 将Row对象转换为字典
             return [dict(row) for row in rows]
     
+    def iter_query(self, query: str, params: tuple = (),
+                   row_type: Optional[Callable[..., Any]] = None) -> Iterator[Any]:
+        """
+        执行查询语句并逐行产出结果，连接在迭代结束或生成器关闭时释放
+        
+        Args:
+            query (str): SQL查询语句
+            params (tuple): 查询参数
+            row_type (Callable, optional): 行类型，按列的位置构造（如数据模型类）；默认产出字典
+            
+        Yields:
+            Any: 每一行查询结果
+        """
+        with self.get_connection() as conn:
+            cursor = self._cursor(conn, row_type)
+            cursor.execute(query, params)
+            # 分批从SQLite取出结果，整批构造行对象
+            while True:
+                rows = cursor.fetchmany(self.ITER_FETCH_SIZE)
+                if not rows:
+                    break
+                if row_type is not None:
+                    yield from starmap(row_type, rows)
+                else:
+                    yield from map(dict, rows)
+    
+    @staticmethod
+    def _cursor(conn: sqlite3.Connection, row_type: Optional[Callable[..., Any]]) -> sqlite3.Cursor:
+        """
+        创建游标，指定行类型时返回普通元组，由调用方直接按位置构造行对象，
+        跳过sqlite3.Row和字典的中间转换
+        
+        Args:
+            conn (sqlite3.Connection): 数据库连接
+            row_type (Callable, optional): 行类型
+            
+        Returns:
+            sqlite3.Cursor: 游标
+        """
+        cursor = conn.cursor()
+        if row_type is not None:
+            cursor.row_factory = None
+        return cursor
+    
     def execute_update(self, query: str, params: tuple = ()) -> int:
         """
         执行更新语句（INSERT, UPDATE, DELETE）
@@ -190,44 +491,101 @@ class DatabaseManager:
         Returns:
             bool: 插入是否成功
         """
-        query = '''
-            INSERT INTO conversations 
-            (user_id, user_input, agent_response, agent_name, safety_check) 
-            VALUES (?, ?, ?, ?, ?)
-        '''
-        params = (
+        try:
+            self.execute_update(self._INSERT_CONVERSATION_SQL, self._conversation_params(conversation_data))
+            return True
+        except Exception as e:
+            print(f"插入对话记录时出错: {e}")
+            return False
+    
+    def insert_conversations(self, conversations: List[Dict[str, Any]]) -> bool:
+        """
+        在一个事务中批量插入对话记录
+        
+        Args:
+            conversations (List[Dict[str, Any]]): 对话数据列表
+            
+        Returns:
+            bool: 插入是否成功
+        """
+        try:
+            with self.get_connection() as conn:
+                # 参数以迭代器传入，逐行绑定，无需先构造完整的参数列表
+                conn.executemany(self._INSERT_CONVERSATION_SQL, map(self._conversation_params, conversations))
+            return True
+        except Exception as e:
+            print(f"批量插入对话记录时出错: {e}")
+            return False
+    
+    @staticmethod
+    def _conversation_params(conversation_data: Dict[str, Any]) -> tuple:
+        """
+        构造对话记录的插入参数
+        
+        Args:
+            conversation_data (Dict[str, Any]): 对话数据
+            
+        Returns:
+            tuple: 插入参数
+        """
+        return (
             conversation_data.get('user_id'),
             conversation_data.get('user_input'),
             conversation_data.get('agent_response'),
             conversation_data.get('agent_name'),
             conversation_data.get('safety_check')
         )
-        
-        try:
-            self.execute_update(query, params)
-            return True
-        except Exception as e:
-            print(f"插入对话记录时出错: {e}")
-            return False
     
-    def get_conversation_history(self, user_id: str, limit: int = 10) -> List[Dict[str, Any]]:
+    def get_conversation_history(self, user_id: str, limit: int = 10,
+                                 row_type: Optional[Callable[..., Any]] = None) -> List[Any]:
         """
         获取用户对话历史
         
         Args:
             user_id (str): 用户ID
             limit (int): 返回记录数量限制
+            row_type (Callable, optional): 行类型，列顺序为CONVERSATION_COLUMNS；默认返回字典
             
         Returns:
-            List[Dict[str, Any]]: 对话历史记录
+            List[Any]: 对话历史记录
         """
-        query = '''
-            SELECT * FROM conversations 
-            WHERE user_id = ? 
-            ORDER BY timestamp DESC 
-            LIMIT ?
-        '''
-        return self.execute_query(query, (user_id, limit))
+        return self.execute_query(self._CONVERSATION_HISTORY_SQL, (user_id, limit), row_type)
+    
+    def iter_conversation_history(self, user_id: str, limit: int = 10,
+                                  row_type: Optional[Callable[..., Any]] = None) -> Iterator[Any]:
+        """
+        逐条获取用户对话历史
+        
+        Args:
+            user_id (str): 用户ID
+            limit (int): 返回记录数量限制
+            row_type (Callable, optional): 行类型，列顺序为CONVERSATION_COLUMNS；默认产出字典
+            
+        Yields:
+            Any: 对话历史记录
+        """
+        yield from self.iter_query(self._CONVERSATION_HISTORY_SQL, (user_id, limit), row_type)
+    
+    def search_conversations(self, keyword: str, limit: int = 50,
+                             row_type: Optional[Callable[..., Any]] = None) -> List[Any]:
+        """
+        搜索用户输入或Agent回复中包含关键词的对话记录，按时间倒序排列
+        
+        Args:
+            keyword (str): 搜索关键词
+            limit (int): 返回记录数量限制
+            row_type (Callable, optional): 行类型，列顺序为CONVERSATION_COLUMNS；默认返回字典
+            
+        Returns:
+            List[Any]: 匹配的对话记录
+        """
+        if self.fts_enabled and len(keyword) >= self.FTS_MIN_KEYWORD_LENGTH:
+            # 关键词作为短语匹配，经全文索引定位，无需扫描全表
+            phrase = '"' + keyword.replace('"', '""') + '"'
+            return self.execute_query(self._FTS_SEARCH_SQL, (phrase, limit), row_type)
+        
+        # 关键词过短时trigram索引无法使用，退回LIKE扫描
+        return self.execute_query(self._LIKE_SEARCH_SQL, (keyword, limit), row_type)
     
     def insert_safety_log(self, safety_data: Dict[str, Any]) -> bool:
         """
@@ -239,42 +597,115 @@ class DatabaseManager:
         Returns:
             bool: 插入是否成功
         """
-        query = '''
-            INSERT INTO safety_logs 
-            (user_id, user_input, agent_response, violation_reason, agent_name) 
-            VALUES (?, ?, ?, ?, ?)
-        '''
-        params = (
+        try:
+            self.execute_update(self._INSERT_SAFETY_LOG_SQL, self._safety_log_params(safety_data))
+            return True
+        except Exception as e:
+            print(f"插入安全日志时出错: {e}")
+            return False
+    
+    def insert_safety_logs(self, safety_logs: List[Dict[str, Any]]) -> bool:
+        """
+        在一个事务中批量插入安全日志
+        
+        Args:
+            safety_logs (List[Dict[str, Any]]): 安全日志数据列表
+            
+        Returns:
+            bool: 插入是否成功
+        """
+        try:
+            with self.get_connection() as conn:
+                # 参数以迭代器传入，逐行绑定，无需先构造完整的参数列表
+                conn.executemany(self._INSERT_SAFETY_LOG_SQL, map(self._safety_log_params, safety_logs))
+            return True
+        except Exception as e:
+            print(f"批量插入安全日志时出错: {e}")
+            return False
+    
+    @staticmethod
+    def _safety_log_params(safety_data: Dict[str, Any]) -> tuple:
+        """
+        构造安全日志的插入参数
+        
+        Args:
+            safety_data (Dict[str, Any]): 安全日志数据
+            
+        Returns:
+            tuple: 插入参数
+        """
+        return (
             safety_data.get('user_id'),
             safety_data.get('user_input'),
             safety_data.get('agent_response'),
             safety_data.get('violation_reason'),
             safety_data.get('agent_name')
         )
+    
+    def get_safety_violations(self, limit: int = 50,
+                              row_type: Optional[Callable[..., Any]] = None) -> List[Any]:
+        """
+        获取安全违规记录
+        
+        Args:
+            limit (int): 返回记录数量限制
+            row_type (Callable, optional): 行类型，列顺序为SAFETY_LOG_COLUMNS；默认返回字典
+            
+        Returns:
+            List[Any]: 安全违规记录
+        """
+        return self.execute_query(self._SAFETY_VIOLATIONS_SQL, (limit,), row_type)
+    
+    def save_voiceprint(self, user_id: str, model: str, dim: int, vec: bytes) -> bool:
+        """
+        保存用户声纹，已存在时覆盖
         
+        Args:
+            user_id (str): 用户ID
+            model (str): 提取声纹的模型
+            dim (int): 声纹维度
+            vec (bytes): float32声纹特征的原始字节
+            
+        Returns:
+            bool: 保存是否成功
+        """
+        query = '''
+            INSERT OR REPLACE INTO voiceprints (user_id, model, dim, vec, updated_at) 
+            VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+        '''
         try:
-            self.execute_update(query, params)
+            self.execute_update(query, (user_id, model, dim, sqlite3.Binary(vec)))
             return True
         except Exception as e:
-            print(f"插入安全日志时出错: {e}")
+            print(f"保存用户声纹时出错: {e}")
             return False
     
-    def get_safety_violations(self, limit: int = 50) -> List[Dict[str, Any]]:
+    def get_voiceprint(self, user_id: str, model: str) -> Dict[str, Any]:
         """
-        获取安全违规记录
+        获取用户声纹
         
         Args:
-            limit (int): 返回记录数量限制
+            user_id (str): 用户ID
+            model (str): 提取声纹的模型
             
         Returns:
-            List[Dict[str, Any]]: 安全违规记录
+            Dict[str, Any]: 声纹记录，未找到时为空字典
         """
-        query = '''
-            SELECT * FROM safety_logs 
-            ORDER BY timestamp DESC 
-            LIMIT ?
-        '''
-        return self.execute_query(query, (limit,))
+        query = "SELECT user_id, dim, vec FROM voiceprints WHERE user_id = ? AND model = ?"
+        result = self.execute_query(query, (user_id, model))
+        return result[0] if result else {}
+    
+    def iter_voiceprints(self, model: str) -> Iterator[Dict[str, Any]]:
+        """
+        逐条获取指定模型的全部声纹
+        
+        Args:
+            model (str): 提取声纹的模型
+            
+        Yields:
+            Dict[str, Any]: 声纹记录
+        """
+        return self.iter_query("SELECT user_id, dim, vec FROM voiceprints WHERE model = ?", (model,))
     
     def get_database_stats(self) -> Dict[str, Any]:
         """
@@ -283,18 +714,17 @@ class DatabaseManager:
         Returns:
             Dict[str, Any]: 数据库统计信息
         """
-        stats = {}
-        
-        # 用户总数
-        result = self.execute_query("SELECT COUNT(*) as count FROM users")
-        stats['total_users'] = result[0]['count'] if result else 0
-        
-        # 对话记录总数
-        result = self.execute_query("SELECT COUNT(*) as count FROM conversations")
-        stats['total_conversations'] = result[0]['count'] if result else 0
-        
-        # 安全违规总数
-        result = self.execute_query("SELECT COUNT(*) as count FROM safety_logs")
-        stats['total_safety_violations'] = result[0]['count'] if result else 0
+        # 三个计数合并为一次查询
+        result = self.execute_query('''
+            SELECT 
+                (SELECT COUNT(*) FROM users) as total_users, 
+                (SELECT COUNT(*) FROM conversations) as total_conversations, 
+                (SELECT COUNT(*) FROM safety_logs) as total_safety_violations
+        ''')
+        stats = result[0] if result else {
+            'total_users': 0,
+            'total_conversations': 0,
+            'total_safety_violations': 0
+        }
         
         return stats
\ No newline at end of file
@@ -5,11 +5,38 @@
 数据模型
 """
 
-from dataclasses import dataclass
-from typing import Optional, Dict, Any
+from dataclasses import dataclass, fields
+from typing import Optional, Dict, Any, Type, TypeVar
 from datetime import datetime
 
 
+_T = TypeVar('_T')
+
+
+def _with_slots(cls: Type[_T]) -> Type[_T]:
+    """
+    为数据类添加__slots__，实例不再携带__dict__，查询返回大量记录时节省内存
+    
+    Python 3.9没有dataclass(slots=True)，按相同方式用字段名重建类；
+    字段默认值已保存在生成的__init__中，移除同名类属性不影响默认值
+    
+    Args:
+        cls (Type): 数据类
+        
+    Returns:
+        Type: 带__slots__的数据类
+    """
+    field_names = tuple(field.name for field in fields(cls))
+    cls_dict = dict(cls.__dict__)
+    cls_dict['__slots__'] = field_names
+    for name in field_names:
+        cls_dict.pop(name, None)
+    cls_dict.pop('__dict__', None)
+    cls_dict.pop('__weakref__', None)
+    return type(cls)(cls.__name__, cls.__bases__, cls_dict)
+
+
+@_with_slots
 @dataclass
 class User:
     """用户数据模型"""
@@ -18,8 +45,8 @@ class User:
     name: Optional[str] = None
     age: Optional[int] = None
     grade: Optional[str] = None
-    created_at: Optional[datetime] = None
-    updated_at: Optional[datetime] = None
+    created_at: Optional[str] = None
+    updated_at: Optional[str] = None
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'User':
@@ -34,6 +61,16 @@ class User:
             updated_at=data.get('updated_at')
         )
     
+    @property
+    def created_at_dt(self) -> Optional[datetime]:
+        """创建时间，解析为datetime"""
+        return datetime.fromisoformat(self.created_at) if self.created_at else None
+    
+    @property
+    def updated_at_dt(self) -> Optional[datetime]:
+        """更新时间，解析为datetime"""
+        return datetime.fromisoformat(self.updated_at) if self.updated_at else None
+    
     def to_dict(self) -> Dict[str, Any]:
         """将User实例转换为字典"""
         return {
@@ -42,11 +79,12 @@ class User:
             'name': self.name,
             'age': self.age,
             'grade': self.grade,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+            'created_at': self.created_at,
+            'updated_at': self.updated_at
         }
 
 
+@_with_slots
 @dataclass
 class Conversation:
     """对话记录数据模型"""
@@ -56,7 +94,7 @@ class Conversation:
     agent_response: str = ""
     agent_name: str = ""
     safety_check: Optional[str] = None
-    timestamp: Optional[datetime] = None
+    timestamp: Optional[str] = None
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Conversation':
@@ -71,6 +109,11 @@ class Conversation:
             timestamp=data.get('timestamp')
         )
     
+    @property
+    def timestamp_dt(self) -> Optional[datetime]:
+        """记录时间，解析为datetime"""
+        return datetime.fromisoformat(self.timestamp) if self.timestamp else None
+    
     def to_dict(self) -> Dict[str, Any]:
         """将Conversation实例转换为字典"""
         return {
@@ -80,10 +123,11 @@ class Conversation:
             'agent_response': self.agent_response,
             'agent_name': self.agent_name,
             'safety_check': self.safety_check,
-            'timestamp': self.timestamp.isoformat() if self.timestamp else None
+            'timestamp': self.timestamp
         }
 
 
+@_with_slots
 @dataclass
 class SafetyLog:
     """安全日志数据模型"""
@@ -93,7 +137,7 @@ class SafetyLog:
     agent_response: str = ""
     violation_reason: str = ""
     agent_name: str = ""
-    timestamp: Optional[datetime] = None
+    timestamp: Optional[str] = None
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'SafetyLog':
@@ -108,6 +152,11 @@ class SafetyLog:
             timestamp=data.get('timestamp')
         )
     
+    @property
+    def timestamp_dt(self) -> Optional[datetime]:
+        """记录时间，解析为datetime"""
+        return datetime.fromisoformat(self.timestamp) if self.timestamp else None
+    
     def to_dict(self) -> Dict[str, Any]:
         """将SafetyLog实例转换为字典"""
         return {
@@ -117,17 +166,18 @@ class SafetyLog:
             'agent_response': self.agent_response,
             'violation_reason': self.violation_reason,
             'agent_name': self.agent_name,
-            'timestamp': self.timestamp.isoformat() if self.timestamp else None
+            'timestamp': self.timestamp
         }
 
 
+@_with_slots
 @dataclass
 class SystemLog:
     """系统日志数据模型"""
     id: Optional[int] = None
     log_level: str = ""
     message: str = ""
-    timestamp: Optional[datetime] = None
+    timestamp: Optional[str] = None
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'SystemLog':
@@ -139,11 +189,16 @@ class SystemLog:
             timestamp=data.get('timestamp')
         )
     
+    @property
+    def timestamp_dt(self) -> Optional[datetime]:
+        """记录时间，解析为datetime"""
+        return datetime.fromisoformat(self.timestamp) if self.timestamp else None
+    
     def to_dict(self) -> Dict[str, Any]:
         """将SystemLog实例转换为字典"""
         return {
             'id': self.id,
             'log_level': self.log_level,
             'message': self.message,
-            'timestamp': self.timestamp.isoformat() if self.timestamp else None
+            'timestamp': self.timestamp
         }
\ No newline at end of file
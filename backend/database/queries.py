@@ -5,7 +5,9 @@
 数据库查询
 """
 
-from typing import List, Dict, Any, Optional
+import time
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 from backend.database.manager import DatabaseManager
 from backend.database.models import User, Conversation, SafetyLog
 
@@ -15,6 +17,12 @@ class DatabaseQueries:
     数据库查询类，封装常用的数据库查询操作
     """
     
+    # 系统统计信息的缓存时间（秒），仪表盘频繁轮询时无需每次都扫描各表
+    STATS_CACHE_TTL = 5.0
+    
+    # 活跃用户统计窗口（SQLite日期修饰符）
+    ACTIVE_USER_WINDOW = '-30 days'
+    
     def __init__(self, db_manager: DatabaseManager):
         """
         初始化数据库查询类
@@ -23,6 +31,8 @@ class DatabaseQueries:
             db_manager (DatabaseManager): 数据库管理器实例
         """
         self.db = db_manager
+        # (过期时间, 系统统计信息)
+        self._stats_cache: Optional[Tuple[float, Dict[str, Any]]] = None
     
     def get_user_by_id(self, user_id: str) -> Optional[User]:
         """
@@ -50,8 +60,20 @@ class DatabaseQueries:
         Returns:
             List[Conversation]: 对话历史记录列表
         """
-        conversation_data_list = self.db.get_conversation_history(user_id, limit)
-        return [Conversation.from_dict(data) for data in conversation_data_list]
+        return self.db.get_conversation_history(user_id, limit, row_type=Conversation)
+    
+    def iter_user_conversation_history(self, user_id: str, limit: int = 10) -> Iterator[Conversation]:
+        """
+        逐条获取用户对话历史，记录在数据库返回时即产出，无需整体加载到内存
+        
+        Args:
+            user_id (str): 用户ID
+            limit (int): 返回记录数量限制
+            
+        Yields:
+            Conversation: 对话历史记录
+        """
+        yield from self.db.iter_conversation_history(user_id, limit, row_type=Conversation)
     
     def get_recent_safety_violations(self, limit: int = 50) -> List[SafetyLog]:
         """
@@ -63,8 +85,7 @@ class DatabaseQueries:
         Returns:
             List[SafetyLog]: 安全违规记录列表
         """
-        safety_data_list = self.db.get_safety_violations(limit)
-        return [SafetyLog.from_dict(data) for data in safety_data_list]
+        return self.db.get_safety_violations(limit, row_type=SafetyLog)
     
     def get_user_statistics(self) -> Dict[str, Any]:
         """
@@ -73,16 +94,14 @@ class DatabaseQueries:
         Returns:
             Dict[str, Any]: 用户统计信息
         """
-        # 获取用户总数
-        result = self.db.execute_query("SELECT COUNT(*) as total FROM users")
-        total_users = result[0]['total'] if result else 0
-        
-        # 获取活跃用户数（最近30天有对话的用户）
+        # 获取用户总数和活跃用户数（最近30天有对话的用户），合并为一次查询
         result = self.db.execute_query('''
-            SELECT COUNT(DISTINCT user_id) as active_users 
-            FROM conversations 
-            WHERE timestamp > datetime('now', '-30 days')
-        ''')
+            SELECT 
+                (SELECT COUNT(*) FROM users) as total, 
+                (SELECT COUNT(DISTINCT user_id) FROM conversations 
+                 WHERE timestamp > datetime('now', ?)) as active_users
+        ''', (self.ACTIVE_USER_WINDOW,))
+        total_users = result[0]['total'] if result else 0
         active_users = result[0]['active_users'] if result else 0
         
         # 获取各年级用户分布
@@ -109,28 +128,16 @@ class DatabaseQueries:
         Returns:
             Dict[str, Any]: 对话统计信息
         """
-        # 获取总对话数
-        result = self.db.execute_query("SELECT COUNT(*) as total FROM conversations")
-        total_conversations = result[0]['total'] if result else 0
+        # 获取各Agent处理的对话数（读取增量维护的汇总表）
+        agent_distribution = self.db.get_summary_counts('conversation_agent_counts')
         
-        # 获取各Agent处理的对话数
-        result = self.db.execute_query('''
-            SELECT agent_name, COUNT(*) as count 
-            FROM conversations 
-            GROUP BY agent_name 
-            ORDER BY count DESC
-        ''')
-        agent_distribution = {row['agent_name']: row['count'] for row in result}
+        # 总对话数即各Agent对话数之和，无需再扫描一次表
+        total_conversations = sum(agent_distribution.values())
         
-        # 获取最近7天每日对话数
-        result = self.db.execute_query('''
-            SELECT DATE(timestamp) as date, COUNT(*) as count 
-            FROM conversations 
-            WHERE timestamp > datetime('now', '-7 days') 
-            GROUP BY DATE(timestamp) 
-            ORDER BY date
-        ''')
-        daily_conversations = {row['date']: row['count'] for row in result}
+        # 获取最近7天每日对话数（汇总表按UTC日期计数，与CURRENT_TIMESTAMP一致）
+        start_date = (datetime.now(timezone.utc).date() - timedelta(days=7)).isoformat()
+        daily_counts = self.db.get_summary_counts('conversation_daily_counts', min_key=start_date)
+        daily_conversations = dict(sorted(daily_counts.items()))
         
         return {
             'total_conversations': total_conversations,
@@ -145,27 +152,14 @@ class DatabaseQueries:
         Returns:
             Dict[str, Any]: 安全统计信息
         """
-        # 获取总安全检查数和违规数
-        result = self.db.execute_query("SELECT COUNT(*) as total FROM safety_logs")
-        total_violations = result[0]['total'] if result else 0
+        # 获取违规类型分布（读取增量维护的汇总表）
+        violation_distribution = self.db.get_summary_counts('safety_reason_counts')
         
-        # 获取违规类型分布
-        result = self.db.execute_query('''
-            SELECT violation_reason, COUNT(*) as count 
-            FROM safety_logs 
-            GROUP BY violation_reason 
-            ORDER BY count DESC
-        ''')
-        violation_distribution = {row['violation_reason']: row['count'] for row in result}
+        # 总违规数即各类型违规数之和
+        total_violations = sum(violation_distribution.values())
         
         # 获取各Agent的安全违规数
-        result = self.db.execute_query('''
-            SELECT agent_name, COUNT(*) as count 
-            FROM safety_logs 
-            GROUP BY agent_name 
-            ORDER BY count DESC
-        ''')
-        agent_violations = {row['agent_name']: row['count'] for row in result}
+        agent_violations = self.db.get_summary_counts('safety_agent_counts')
         
         return {
             'total_violations': total_violations,
@@ -178,18 +172,26 @@ class DatabaseQueries:
         获取系统统计信息
         
         Returns:
-            Dict[str, Any]: 系统统计信息
+            Dict[str, Any]: 系统统计信息（缓存STATS_CACHE_TTL秒）
         """
+        now = time.monotonic()
+        cached = self._stats_cache
+        if cached is not None and cached[0] > now:
+            return cached[1]
+        
         user_stats = self.get_user_statistics()
         conversation_stats = self.get_conversation_statistics()
         safety_stats = self.get_safety_statistics()
         
-        return {
+        stats = {
             'users': user_stats,
             'conversations': conversation_stats,
             'safety': safety_stats,
-            'timestamp': self.db.execute_query("SELECT CURRENT_TIMESTAMP as now")[0]['now']
+            # 与SQLite的CURRENT_TIMESTAMP格式一致（UTC），无需再查询一次数据库
+            'timestamp': datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
         }
+        self._stats_cache = (now + self.STATS_CACHE_TTL, stats)
+        return stats
     
     def search_conversations(self, keyword: str, limit: int = 50) -> List[Conversation]:
         """
@@ -202,16 +204,7 @@ class DatabaseQueries:
         Returns:
             List[Conversation]: 匹配的对话记录列表
         """
-        query = '''
-            SELECT * FROM conversations 
-            WHERE user_input LIKE ? OR agent_response LIKE ? 
-            ORDER BY timestamp DESC 
-            LIMIT ?
-        '''
-        params = (f'%{keyword}%', f'%{keyword}%', limit)
-        
-        conversation_data_list = self.db.execute_query(query, params)
-        return [Conversation.from_dict(data) for data in conversation_data_list]
+        return self.db.search_conversations(keyword, limit, row_type=Conversation)
     
     def get_conversations_by_date_range(self, start_date: str, end_date: str) -> List[Conversation]:
         """
@@ -224,12 +217,11 @@ class DatabaseQueries:
         Returns:
             List[Conversation]: 对话记录列表
         """
-        query = '''
-            SELECT * FROM conversations 
+        query = f'''
+            SELECT {DatabaseManager.CONVERSATION_COLUMNS} FROM conversations 
             WHERE DATE(timestamp) BETWEEN ? AND ? 
             ORDER BY timestamp DESC
         '''
         params = (start_date, end_date)
         
-        conversation_data_list = self.db.execute_query(query, params)
-        return [Conversation.from_dict(data) for data in conversation_data_list]
\ No newline at end of file
+        return self.db.execute_query(query, params, row_type=Conversation)
\ No newline at end of file
@@ -6,11 +6,27 @@
 """
 
 import re
-from typing import Dict, List, Any
+from bisect import bisect_left, bisect_right
+from operator import itemgetter
+from typing import Any, Dict, Iterator, List
 from collections import defaultdict, Counter
 from datetime import datetime, timedelta
 
 
+# 日志格式: 2023-01-01 12:00:00,123 - EduAI - INFO - message（毫秒部分可选）
+# 行首锚定；来源和级别的分组不含首尾空格，无需再strip
+_LOG_RE = re.compile(r'^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})(?:,\d{3})? - ([^ -][^-]*?) - ([^ -][^-]*?) - \s*(.+)$')
+
+# 时间戳长度：不带毫秒为19，带',mmm'毫秒为23
+_TIMESTAMP_LENGTHS = (19, 23)
+
+# 读取日志文件的缓冲区大小（字节）
+LOG_READ_BUFFER_SIZE = 1 << 20
+
+# 视为错误的日志级别
+_ERROR_LEVELS = frozenset({'ERROR', 'CRITICAL'})
+
+
 class LogAnalyzer:
     """
     日志分析类，用于分析系统日志并生成报告
@@ -20,6 +36,14 @@ class LogAnalyzer:
         """初始化日志分析器"""
         self.log_file_path = log_file_path
         self.logs = []
+        # 与self.logs一一对应的有序时间戳，用于二分查找时间范围
+        self._timestamps = []
+        # 错误日志和用户交互日志的预筛选列表，查询时只遍历匹配的日志
+        self._error_logs = []
+        self._interaction_logs = []
+        # 日志版本号，每次加载日志后递增，用于使聚合结果缓存失效
+        self._version = 0
+        self._cache = {}
     
     def load_logs(self, log_file_path: str = None):
         """
@@ -34,17 +58,73 @@ class LogAnalyzer:
         if not self.log_file_path:
             raise ValueError("未指定日志文件路径")
         
-        self.logs = []
+        logs = []
+        append = logs.append
         try:
-            with open(self.log_file_path, 'r', encoding='utf-8') as f:
-                for line in f:
-                    parsed_log = self._parse_log_line(line.strip())
-                    if parsed_log:
-                        self.logs.append(parsed_log)
+            for parsed_log in self.iter_logs():
+                append(parsed_log)
         except FileNotFoundError:
             print(f"日志文件未找到: {self.log_file_path}")
         except Exception as e:
             print(f"读取日志文件时出错: {e}")
+        # 解析完成后一次性替换
+        self.logs = logs
+        self._build_indexes()
+        self._version += 1
+        self._cache.clear()
+    
+    def _build_indexes(self):
+        """按时间戳排序日志（通常已有序），建立时间戳索引和预筛选列表"""
+        timestamps = [log['timestamp'] for log in self.logs]
+        if any(later < earlier for earlier, later in zip(timestamps, timestamps[1:])):
+            self.logs.sort(key=itemgetter('timestamp'))
+            timestamps = [log['timestamp'] for log in self.logs]
+        self._timestamps = timestamps
+        self._error_logs = [log for log in self.logs if log['level'] in _ERROR_LEVELS]
+        self._interaction_logs = [log for log in self.logs if '用户交互' in log['message']]
+    
+    def _ensure_indexes(self):
+        """self.logs被直接替换过时重建索引"""
+        if len(self._timestamps) != len(self.logs):
+            self._build_indexes()
+    
+    def _time_window(self, start_time: datetime = None, end_time: datetime = None) -> List[Dict[str, Any]]:
+        """
+        二分查找时间范围内的日志
+        
+        Args:
+            start_time (datetime, optional): 开始时间（含）
+            end_time (datetime, optional): 结束时间（含）
+            
+        Returns:
+            List[Dict[str, Any]]: 时间范围内的日志
+        """
+        self._ensure_indexes()
+        
+        lo = bisect_left(self._timestamps, start_time) if start_time else 0
+        hi = bisect_right(self._timestamps, end_time) if end_time else len(self.logs)
+        return self.logs[lo:hi]
+    
+    def iter_logs(self, log_file_path: str = None) -> Iterator[Dict[str, Any]]:
+        """
+        逐行解析日志文件，不把整个文件的解析结果保存在内存中
+        
+        Args:
+            log_file_path (str, optional): 日志文件路径，默认使用初始化时指定的路径
+            
+        Yields:
+            Dict[str, Any]: 解析后的日志数据
+        """
+        log_file_path = log_file_path or self.log_file_path
+        if not log_file_path:
+            raise ValueError("未指定日志文件路径")
+        
+        parse = self._parse_log_line
+        with open(log_file_path, 'r', encoding='utf-8', buffering=LOG_READ_BUFFER_SIZE) as f:
+            for line in f:
+                parsed_log = parse(line.strip())
+                if parsed_log is not None:
+                    yield parsed_log
     
     def _parse_log_line(self, line: str) -> Dict[str, Any]:
         """
@@ -56,22 +136,40 @@ class LogAnalyzer:
         Returns:
             Dict[str, Any]: 解析后的日志数据
         """
-        # 日志格式: 2023-01-01 12:00:00 - EduAI - INFO - message
-        pattern = r'(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}) - ([^-]+) - ([^-]+) - (.+)'
-        match = re.match(pattern, line)
+        # 快速路径：日志字段以' - '严格分隔，直接split，时间戳先做长度和分隔符检查
+        parts = line.split(' - ', 3)
+        if len(parts) == 4:
+            timestamp_str, logger_name, level, message = parts
+            if (len(timestamp_str) in _TIMESTAMP_LENGTHS and timestamp_str[4] == '-'
+                    and timestamp_str[10] == ' ' and level.isalpha()
+                    and logger_name[:1] not in ('', ' ') and logger_name[-1] != ' '):
+                try:
+                    timestamp = datetime.fromisoformat(timestamp_str[:19])
+                except ValueError:
+                    timestamp = None
+                if timestamp is not None:
+                    return {
+                        'timestamp': timestamp,
+                        'logger_name': logger_name,
+                        'level': level,
+                        'message': message
+                    }
+        
+        # 格式不规整的行（如多余空格）退回正则解析
+        match = _LOG_RE.match(line)
         
         if match:
             timestamp_str, logger_name, level, message = match.groups()
             try:
-                timestamp = datetime.strptime(timestamp_str, '%Y-%m-%d %H:%M:%S')
+                timestamp = datetime.fromisoformat(timestamp_str)
             except ValueError:
                 timestamp = datetime.now()
             
             return {
                 'timestamp': timestamp,
-                'logger_name': logger_name.strip(),
-                'level': level.strip(),
-                'message': message.strip()
+                'logger_name': logger_name,
+                'level': level,
+                'message': message
             }
         
         return None
@@ -90,37 +188,38 @@ class LogAnalyzer:
         if not self.logs:
             return {}
         
-        # 筛选时间范围内的日志
-        filtered_logs = self.logs
-        if start_time:
-            filtered_logs = [log for log in filtered_logs if log['timestamp'] >= start_time]
-        if end_time:
-            filtered_logs = [log for log in filtered_logs if log['timestamp'] <= end_time]
+        # 单次遍历完成各项统计，不生成中间列表
+        level_counts = Counter()
+        logger_counts = Counter()
+        total = error_count = interaction_count = 0
+        first = last = None
+        for log in self._time_window(start_time, end_time):
+            timestamp = log['timestamp']
+            total += 1
+            level = log['level']
+            level_counts[level] += 1
+            logger_counts[log['logger_name']] += 1
+            if level in _ERROR_LEVELS:
+                error_count += 1
+            if '用户交互' in log['message']:
+                interaction_count += 1
+            # 窗口内日志按时间有序
+            if first is None:
+                first = timestamp
+            last = timestamp
         
-        if not filtered_logs:
+        if not total:
             return {}
         
-        # 统计日志级别分布
-        level_counts = Counter(log['level'] for log in filtered_logs)
-        
-        # 统计日志来源分布
-        logger_counts = Counter(log['logger_name'] for log in filtered_logs)
-        
-        # 分析错误日志
-        error_logs = [log for log in filtered_logs if log['level'] in ['ERROR', 'CRITICAL']]
-        
-        # 分析用户交互日志
-        interaction_logs = [log for log in filtered_logs if '用户交互' in log['message']]
-        
         return {
-            'total_logs': len(filtered_logs),
+            'total_logs': total,
             'level_distribution': dict(level_counts),
             'logger_distribution': dict(logger_counts),
-            'error_count': len(error_logs),
-            'interaction_count': len(interaction_logs),
+            'error_count': error_count,
+            'interaction_count': interaction_count,
             'time_range': {
-                'start': min(log['timestamp'] for log in filtered_logs).isoformat(),
-                'end': max(log['timestamp'] for log in filtered_logs).isoformat()
+                'start': first.isoformat(),
+                'end': last.isoformat()
             }
         }
     
@@ -129,11 +228,18 @@ class LogAnalyzer:
         获取用户交互统计信息
         
         Returns:
-            Dict[str, Any]: 用户交互统计
+            Dict[str, Any]: 用户交互统计（日志未变化时返回缓存结果）
         """
-        interaction_logs = [log for log in self.logs if '用户交互' in log['message']]
+        cache_key = ('interaction_stats', self._version, len(self.logs))
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        self._ensure_indexes()
+        interaction_logs = self._interaction_logs
         
         if not interaction_logs:
+            self._cache[cache_key] = {}
             return {}
         
         # 解析交互日志
@@ -159,7 +265,7 @@ class LogAnalyzer:
         # 最活跃时段
         busiest_hour = max(hourly_interactions.items(), key=lambda x: x[1]) if hourly_interactions else (None, 0)
         
-        return {
+        stats = {
             'total_interactions': len(interactions),
             'hourly_interactions': dict(hourly_interactions),
             'busiest_hour': {
@@ -167,34 +273,45 @@ class LogAnalyzer:
                 'count': busiest_hour[1]
             }
         }
+        self._cache[cache_key] = stats
+        return stats
     
     def get_error_summary(self) -> List[Dict[str, Any]]:
         """
         获取错误摘要
         
         Returns:
-            List[Dict[str, Any]]: 错误摘要列表
+            List[Dict[str, Any]]: 错误摘要列表（日志未变化时返回缓存结果）
         """
-        error_logs = [log for log in self.logs if log['level'] in ['ERROR', 'CRITICAL']]
+        cache_key = ('error_summary', self._version, len(self.logs))
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        self._ensure_indexes()
+        error_logs = self._error_logs
         
-        # 统计相同错误信息
-        error_messages = Counter(log['message'] for log in error_logs)
+        # 单次遍历统计相同错误信息的次数和最新时间
+        error_messages = Counter()
+        latest_times = {}
+        for log in error_logs:
+            message = log['message']
+            error_messages[message] += 1
+            timestamp = log['timestamp']
+            if timestamp > latest_times.get(message, datetime.min):
+                latest_times[message] = timestamp
         
         # 构造错误摘要
-        error_summary = []
-        for message, count in error_messages.most_common(10):
-            # 找到该错误信息的最新时间
-            latest_time = max(
-                log['timestamp'] for log in error_logs 
-                if log['message'] == message
-            )
-            
-            error_summary.append({
+        error_summary = [
+            {
                 'message': message,
                 'count': count,
-                'latest_occurrence': latest_time.isoformat()
-            })
+                'latest_occurrence': latest_times[message].isoformat()
+            }
+            for message, count in error_messages.most_common(10)
+        ]
         
+        self._cache[cache_key] = error_summary
         return error_summary
     
     def generate_daily_report(self, date: datetime = None) -> Dict[str, Any]:
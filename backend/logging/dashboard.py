@@ -5,8 +5,9 @@
 仪表板集成
 """
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
 import json
+import time
 from datetime import datetime, timedelta
 
 
@@ -15,6 +16,9 @@ class DashboardIntegration:
     仪表板集成类，用于向仪表板提供数据
     """
     
+    # 仪表板数据缓存时间（秒），仪表板轮询频繁，短时间内复用同一份数据
+    DASHBOARD_CACHE_TTL = 5.0
+    
     def __init__(self, log_analyzer=None, system_monitor=None):
         """
         初始化仪表板集成
@@ -25,6 +29,7 @@ class DashboardIntegration:
         """
         self.log_analyzer = log_analyzer
         self.system_monitor = system_monitor
+        self._dashboard_cache: Optional[Tuple[float, Dict[str, Any]]] = None
     
     def get_realtime_metrics(self) -> Dict[str, Any]:
         """
@@ -145,9 +150,14 @@ class DashboardIntegration:
         获取所有仪表板数据
         
         Returns:
-            Dict[str, Any]: 所有仪表板数据
+            Dict[str, Any]: 所有仪表板数据（缓存DASHBOARD_CACHE_TTL秒）
         """
-        return {
+        now = time.monotonic()
+        cached = self._dashboard_cache
+        if cached is not None and cached[0] > now:
+            return cached[1]
+        
+        data = {
             'timestamp': datetime.now().isoformat(),
             'realtime_metrics': self.get_realtime_metrics(),
             'user_statistics': self.get_user_statistics(),
@@ -156,6 +166,8 @@ class DashboardIntegration:
             'agent_performance': self.get_agent_performance(),
             'safety_report': self.get_safety_report()
         }
+        self._dashboard_cache = (now + self.DASHBOARD_CACHE_TTL, data)
+        return data
     
     def export_dashboard_data(self, file_path: str):
         """
@@ -7,9 +7,67 @@
 
 import time
 import threading
-from typing import Dict, Any, Callable
-from collections import defaultdict, deque
-from datetime import datetime, timedelta
+from typing import Dict, Any, Callable, Optional
+from datetime import datetime
+
+import numpy as np
+
+
+class MetricSeries:
+    """
+    单个指标的环形缓冲区，时间戳和指标值分别保存在连续的numpy数组中（SoA），
+    每个数据点同时写入i和i+capacity两个位置，最近capacity个点总是连续的切片，读取无需拷贝
+    """
+    
+    __slots__ = ('capacity', '_timestamps', '_values', '_head', 'count', 'tags')
+    
+    def __init__(self, capacity: int = 1000):
+        """
+        初始化环形缓冲区
+        
+        Args:
+            capacity (int): 保留的数据点数
+        """
+        self.capacity = capacity
+        self._timestamps = np.empty(2 * capacity, dtype=np.float64)
+        self._values = np.empty(2 * capacity, dtype=np.float64)
+        self._head = 0
+        self.count = 0
+        # 最近一个数据点的标签
+        self.tags: Dict[str, str] = {}
+    
+    def append(self, timestamp: float, value: float, tags: Dict[str, str]):
+        """
+        追加数据点，缓冲区满时覆盖最早的数据点
+        
+        Args:
+            timestamp (float): 单调时钟时间戳
+            value (float): 指标值
+            tags (Dict[str, str]): 标签
+        """
+        head = self._head
+        self._timestamps[head] = self._timestamps[head + self.capacity] = timestamp
+        self._values[head] = self._values[head + self.capacity] = value
+        self._head = (head + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+        self.tags = tags
+    
+    def window(self, since: float) -> np.ndarray:
+        """
+        获取指定时间之后的指标值
+        
+        Args:
+            since (float): 单调时钟时间戳（含）
+        
+        Returns:
+            np.ndarray: 按时间顺序排列的指标值视图
+        """
+        end = self._head + self.capacity
+        start = end - self.count
+        # 时间戳单调递增，二分查找窗口起点
+        start += int(np.searchsorted(self._timestamps[start:end], since, side='left'))
+        return self._values[start:end]
 
 
 class SystemMonitor:
@@ -17,33 +75,36 @@ class SystemMonitor:
     系统实时监控类
     """
     
+    # 每个指标保留的数据点数
+    METRIC_CAPACITY = 1000
+    
+    # 指数加权移动平均的平滑系数
+    EWMA_ALPHA = 0.1
+    
+    # 告警阈值：指标名称 -> (平均值阈值, 告警信息)
+    ALERT_THRESHOLDS = {
+        'response_time': (5.0, '平均响应时间过长'),
+        'error_rate': (0.05, '错误率过高'),
+    }
+    
     def __init__(self):
         """初始化系统监控器"""
-        self.metrics = defaultdict(lambda: deque(maxlen=1000))  # 限制存储1000个数据点
+        self.metrics: Dict[str, MetricSeries] = {}
+        self._metrics_lock = threading.Lock()
+        # 各指标的指数加权移动平均，告警检查为O(1)
+        self._ewma: Dict[str, float] = {}
+        # 当前处于告警状态的指标，仅在越过阈值时触发一次告警
+        self._alerting = set()
         self.is_monitoring = False
-        self.monitoring_thread = None
         self.alert_callbacks = []
         
     def start_monitoring(self):
-        """开始监控"""
-        if not self.is_monitoring:
-            self.is_monitoring = True
-            self.monitoring_thread = threading.Thread(target=self._monitor_loop)
-            self.monitoring_thread.daemon = True
-            self.monitoring_thread.start()
+        """开始监控（告警在记录指标时检查，无需后台轮询线程）"""
+        self.is_monitoring = True
     
     def stop_monitoring(self):
         """停止监控"""
         self.is_monitoring = False
-        if self.monitoring_thread:
-            self.monitoring_thread.join()
-    
-    def _monitor_loop(self):
-        """监控循环"""
-        while self.is_monitoring:
-            # 检查各项指标是否超过阈值
-            self._check_alerts()
-            time.sleep(1)  # 每秒检查一次
     
     def record_metric(self, metric_name: str, value: float, tags: Dict[str, str] = None):
         """
@@ -54,13 +115,19 @@ class SystemMonitor:
             value (float): 指标值
             tags (Dict[str, str], optional): 标签
         """
-        timestamp = datetime.now()
-        data_point = {
-            'timestamp': timestamp,
-            'value': value,
-            'tags': tags or {}
-        }
-        self.metrics[metric_name].append(data_point)
+        with self._metrics_lock:
+            series = self.metrics.get(metric_name)
+            if series is None:
+                series = self.metrics[metric_name] = MetricSeries(self.METRIC_CAPACITY)
+            series.append(time.monotonic(), value, tags or {})
+            
+            previous = self._ewma.get(metric_name, value)
+            average = self._ewma[metric_name] = self.EWMA_ALPHA * value + (1 - self.EWMA_ALPHA) * previous
+            alert_info = self._check_alert(metric_name, average)
+        
+        # 告警回调在锁外执行
+        if alert_info is not None:
+            self._trigger_alert('performance', alert_info)
     
     def get_metric_stats(self, metric_name: str, time_window_minutes: int = 5) -> Dict[str, Any]:
         """
@@ -73,29 +140,26 @@ class SystemMonitor:
         Returns:
             Dict[str, Any]: 统计信息
         """
-        if metric_name not in self.metrics:
+        series = self.metrics.get(metric_name)
+        if series is None:
             return {}
         
         # 计算时间窗口的开始时间
-        window_start = datetime.now() - timedelta(minutes=time_window_minutes)
+        window_start = time.monotonic() - time_window_minutes * 60
         
-        # 筛选时间窗口内的数据
-        recent_data = [
-            point for point in self.metrics[metric_name] 
-            if point['timestamp'] >= window_start
-        ]
+        # 拷贝窗口内的数据，避免统计期间被写入覆盖
+        with self._metrics_lock:
+            values = series.window(window_start).copy()
         
-        if not recent_data:
+        if not len(values):
             return {}
         
-        values = [point['value'] for point in recent_data]
-        
         return {
             'count': len(values),
-            'min': min(values),
-            'max': max(values),
-            'avg': sum(values) / len(values),
-            'latest': values[-1]
+            'min': float(values.min()),
+            'max': float(values.max()),
+            'avg': float(values.mean()),
+            'latest': float(values[-1])
         }
     
     def add_alert_callback(self, callback: Callable[[str, Dict[str, Any]], None]):
@@ -107,29 +171,34 @@ class SystemMonitor:
         """
         self.alert_callbacks.append(callback)
     
-    def _check_alerts(self):
-        """检查并触发告警"""
-        # 检查响应时间是否过长
-        response_time_stats = self.get_metric_stats('response_time')
-        if response_time_stats and response_time_stats.get('avg', 0) > 5.0:
-            alert_info = {
-                'metric': 'response_time',
-                'value': response_time_stats['avg'],
-                'threshold': 5.0,
-                'message': '平均响应时间过长'
-            }
-            self._trigger_alert('performance', alert_info)
+    def _check_alert(self, metric_name: str, average: float) -> Optional[Dict[str, Any]]:
+        """
+        检查指标平均值是否越过阈值
         
-        # 检查错误率是否过高
-        error_rate_stats = self.get_metric_stats('error_rate')
-        if error_rate_stats and error_rate_stats.get('avg', 0) > 0.05:
-            alert_info = {
-                'metric': 'error_rate',
-                'value': error_rate_stats['avg'],
-                'threshold': 0.05,
-                'message': '错误率过高'
-            }
-            self._trigger_alert('performance', alert_info)
+        Args:
+            metric_name (str): 指标名称
+            average (float): 指标的指数加权移动平均
+            
+        Returns:
+            Optional[Dict[str, Any]]: 平均值从阈值以下越过阈值时返回告警信息，否则为None
+        """
+        if not self.is_monitoring or metric_name not in self.ALERT_THRESHOLDS:
+            return None
+        
+        threshold, message = self.ALERT_THRESHOLDS[metric_name]
+        if average <= threshold:
+            self._alerting.discard(metric_name)
+            return None
+        if metric_name in self._alerting:
+            return None
+        
+        self._alerting.add(metric_name)
+        return {
+            'metric': metric_name,
+            'value': average,
+            'threshold': threshold,
+            'message': message
+        }
     
     def _trigger_alert(self, alert_type: str, alert_info: Dict[str, Any]):
         """
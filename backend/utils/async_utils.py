@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+异步工具
+"""
+
+import asyncio
+import threading
+import weakref
+from typing import Any, AsyncIterator, Awaitable, Callable, Coroutine, Dict, Hashable, Iterator, List, Optional, Set, Tuple
+
+
+# 后台事件循环，供同步调用方（如Flask工作线程）共享
+_background_loop: Optional[asyncio.AbstractEventLoop] = None
+_background_thread: Optional[threading.Thread] = None
+_background_lock = threading.Lock()
+
+
+def get_background_loop() -> asyncio.AbstractEventLoop:
+    """
+    获取后台事件循环，首次调用时在守护线程中启动
+    
+    Returns:
+        asyncio.AbstractEventLoop: 后台事件循环
+    """
+    global _background_loop, _background_thread
+    with _background_lock:
+        if _background_loop is None:
+            _background_loop = asyncio.new_event_loop()
+            _background_thread = threading.Thread(
+                target=_background_loop.run_forever, name="edu-ai-event-loop", daemon=True
+            )
+            _background_thread.start()
+    return _background_loop
+
+
+def run_coroutine_sync(coro: Coroutine[Any, Any, Any], timeout: Optional[float] = None) -> Any:
+    """
+    在后台事件循环中执行协程并同步等待结果
+    
+    多个线程提交的协程共享同一个事件循环，因此可以被微批处理器合并。
+    
+    Args:
+        coro (Coroutine): 协程
+        timeout (float, optional): 等待超时时间（秒）
+    
+    Returns:
+        Any: 协程的返回值
+    """
+    loop = get_background_loop()
+    if threading.current_thread() is _background_thread:
+        coro.close()
+        raise RuntimeError("不能在后台事件循环线程中同步等待协程")
+    return asyncio.run_coroutine_threadsafe(coro, loop).result(timeout)
+
+
+def iterate_async_sync(agen: AsyncIterator[Any]) -> Iterator[Any]:
+    """
+    在后台事件循环中逐项驱动异步生成器，供同步调用方边生成边消费
+    
+    Args:
+        agen (AsyncIterator): 异步生成器
+    
+    Yields:
+        Any: 异步生成器产出的每一项
+    """
+    try:
+        while True:
+            try:
+                yield run_coroutine_sync(agen.__anext__())
+            except StopAsyncIteration:
+                return
+    finally:
+        # 调用方提前停止迭代时关闭生成器，释放其持有的信号量等资源
+        aclose = getattr(agen, 'aclose', None)
+        if aclose is not None:
+            run_coroutine_sync(aclose())
+
+
+class AsyncMicroBatcher:
+    """
+    异步微批处理器，将短时间窗口内到达的请求合并为一批交给处理函数
+    
+    请求按分组键分别攒批：某一组攒够max_batch_size个请求或等待超过max_wait秒即提交，
+    处理函数按输入顺序返回每个请求的结果。
+    """
+    
+    def __init__(self, handler: Callable[[List[Any]], Awaitable[List[Any]]],
+                 max_batch_size: int = 32, max_wait: float = 0.01,
+                 key_fn: Optional[Callable[[Any], Hashable]] = None):
+        """
+        初始化微批处理器
+        
+        Args:
+            handler (Callable): 批处理函数，接收请求列表，返回等长的结果列表
+            max_batch_size (int): 单批最大请求数
+            max_wait (float): 攒批的最长等待时间（秒）
+            key_fn (Callable, optional): 分组键函数，只有键相同的请求会被合并
+        """
+        self.handler = handler
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.key_fn = key_fn
+        
+        # 分组键包含事件循环，不同事件循环的请求不会被合并
+        self._pending: Dict[Tuple[asyncio.AbstractEventLoop, Hashable], List[Tuple[Any, asyncio.Future]]] = {}
+        self._timers: Dict[Tuple[asyncio.AbstractEventLoop, Hashable], asyncio.TimerHandle] = {}
+        # 持有执行中批次任务的引用，避免被垃圾回收
+        self._tasks: Set[asyncio.Task] = set()
+    
+    async def submit(self, item: Any) -> Any:
+        """
+        提交单个请求并等待其结果
+        
+        Args:
+            item (Any): 请求
+        
+        Returns:
+            Any: 该请求的处理结果
+        """
+        loop = asyncio.get_running_loop()
+        key = (loop, self.key_fn(item) if self.key_fn else None)
+        future = loop.create_future()
+        
+        batch = self._pending.setdefault(key, [])
+        batch.append((item, future))
+        if len(batch) >= self.max_batch_size:
+            self._flush(key)
+        elif key not in self._timers:
+            self._timers[key] = loop.call_later(self.max_wait, self._flush, key)
+        
+        return await future
+    
+    def _flush(self, key: Tuple[asyncio.AbstractEventLoop, Hashable]):
+        """
+        提交指定分组当前攒下的请求
+        
+        Args:
+            key (Tuple): 分组键
+        """
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        
+        batch = self._pending.pop(key, None)
+        if batch:
+            task = key[0].create_task(self._run_batch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+    
+    async def _run_batch(self, batch: List[Tuple[Any, asyncio.Future]]):
+        """
+        执行一批请求并分发结果
+        
+        Args:
+            batch (List[Tuple[Any, asyncio.Future]]): (请求, 结果future)列表
+        """
+        try:
+            results = await self.handler([item for item, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+
+class LoopLocalSemaphore:
+    """
+    按事件循环分别创建的异步信号量
+    
+    Python 3.10之前asyncio.Semaphore在创建时绑定当前线程的事件循环，
+    在其它线程的事件循环（如后台事件循环）中发生争用时会抛出"attached to a different loop"，
+    因此在首次使用时于运行中的事件循环内创建，每个事件循环各自限流。
+    """
+    
+    def __init__(self, value: int):
+        """
+        初始化信号量
+        
+        Args:
+            value (int): 每个事件循环内允许的最大并发数
+        """
+        self.value = value
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = \
+            weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+    
+    def get(self) -> asyncio.Semaphore:
+        """
+        获取当前运行中事件循环的信号量，首次调用时创建
+        
+        Returns:
+            asyncio.Semaphore: 当前事件循环的信号量
+        """
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            with self._lock:
+                semaphore = self._semaphores.get(loop)
+                if semaphore is None:
+                    semaphore = self._semaphores[loop] = asyncio.Semaphore(self.value)
+        return semaphore
+    
+    async def __aenter__(self) -> asyncio.Semaphore:
+        """获取当前事件循环的信号量"""
+        semaphore = self.get()
+        await semaphore.acquire()
+        return semaphore
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        """释放当前事件循环的信号量"""
+        self.get().release()
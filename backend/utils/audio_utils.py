@@ -5,8 +5,9 @@
 音频工具
 """
 
+import math
 import numpy as np
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 import base64
 
 
@@ -29,9 +30,9 @@ class AudioUtils:
         if len(audio_data) == 0:
             return 0.0
         
-        # 计算均方根
-        rms = np.sqrt(np.mean(audio_data.astype(np.float32) ** 2))
-        return float(rms)
+        # 计算均方根：np.dot一次完成平方和求和（BLAS sdot），不生成平方后的临时数组
+        samples = np.ravel(audio_data).astype(np.float32, copy=False)
+        return math.sqrt(float(np.dot(samples, samples)) / samples.size)
     
     @staticmethod
     def detect_silence(audio_data: np.ndarray, threshold: float = 0.01, 
@@ -67,19 +68,25 @@ class AudioUtils:
         if len(audio_data) == 0:
             return audio_data
         
-        max_val = np.max(np.abs(audio_data))
+        # 峰值取max和-min中的较大者，不生成np.abs的临时数组
+        max_val = max(float(audio_data.max()), -float(audio_data.min()))
         if max_val > 0:
+            if np.issubdtype(audio_data.dtype, np.floating):
+                # 乘以倒数，只分配一次输出数组并保持原数据类型
+                return np.multiply(audio_data, audio_data.dtype.type(1.0 / max_val))
             return audio_data / max_val
         return audio_data
     
     @staticmethod
-    def convert_to_mono(audio_data: np.ndarray, channels: int = 1) -> np.ndarray:
+    def convert_to_mono(audio_data: np.ndarray, channels: int = 1,
+                        out: Optional[np.ndarray] = None) -> np.ndarray:
         """
         转换为单声道音频
         
         Args:
             audio_data (np.ndarray): 音频数据
             channels (int): 原始声道数
+            out (np.ndarray, optional): 复用的输出缓冲区，长度为帧数，流式处理时可避免每次分配
             
         Returns:
             np.ndarray: 单声道音频数据
@@ -89,13 +96,23 @@ class AudioUtils:
         
         # 如果是多声道，转换为单声道
         if len(audio_data.shape) > 1 and audio_data.shape[1] == channels:
-            return np.mean(audio_data, axis=1)
+            frames = audio_data
         elif len(audio_data) % channels == 0:
             # 重构成多声道然后取平均
-            reshaped = audio_data.reshape(-1, channels)
-            return np.mean(reshaped, axis=1)
+            frames = audio_data.reshape(-1, channels)
         else:
             return audio_data
+        
+        if channels == 2 and frames.dtype == np.int16:
+            # 16位立体声：在int32中相加后右移一位，全程整数运算
+            mixed = np.add(frames[:, 0], frames[:, 1], dtype=np.int32)
+            mixed >>= 1
+            if out is None:
+                return mixed.astype(np.int16)
+            np.copyto(out, mixed, casting='unsafe')
+            return out
+        
+        return np.mean(frames, axis=1, out=out)
     
     @staticmethod
     def apply_gain(audio_data: np.ndarray, gain: float) -> np.ndarray:
@@ -122,10 +139,9 @@ class AudioUtils:
         Returns:
             str: base64编码的音频数据
         """
-        # 转换为bytes
-        audio_bytes = audio_data.tobytes()
-        # 编码为base64
-        return base64.b64encode(audio_bytes).decode('utf-8')
+        # 连续数组直接以内存视图编码，省去tobytes的拷贝
+        audio_view = memoryview(np.ascontiguousarray(audio_data)).cast('B')
+        return base64.b64encode(audio_view).decode('ascii')
     
     @staticmethod
     def base64_to_audio(base64_data: str, dtype: np.dtype = np.float32) -> np.ndarray:
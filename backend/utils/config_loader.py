@@ -5,11 +5,53 @@
 配置加载工具
 """
 
+import copy
 import yaml
 import json
 import os
+import threading
 import dotenv
-from typing import Dict, Any, Optional, Union
+from typing import IO, Any, Callable, Dict, Optional, Tuple, Union
+
+
+try:
+    import orjson
+except ImportError:  # 未安装orjson时使用标准库json解析
+    orjson = None
+
+# 优先使用libyaml的C实现解析YAML
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+# 优先使用orjson解析JSON，直接处理字节串，无需先解码为str
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+# 已解析的配置缓存：绝对路径 -> ((文件修改时间, 文件大小), 配置数据)，文件修改后自动重新加载
+_config_cache: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
+_config_cache_lock = threading.Lock()
+
+
+def _load_cached(file_path: str, parse: Callable[[IO[bytes]], Any]) -> Dict[str, Any]:
+    """
+    读取并解析配置文件，同一文件未修改时复用已解析的结果
+    
+    Args:
+        file_path (str): 配置文件路径
+        parse (Callable): 解析函数，接收以二进制模式打开的文件对象（UTF-8编码）
+    
+    Returns:
+        Dict[str, Any]: 配置数据（副本，调用方可自由修改）
+    """
+    path = os.path.abspath(file_path)
+    stat = os.stat(path)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    with _config_cache_lock:
+        cached = _config_cache.get(path)
+    if cached is None or cached[0] != stamp:
+        with open(path, 'rb') as f:
+            cached = (stamp, parse(f))
+        with _config_cache_lock:
+            _config_cache[path] = cached
+    return copy.deepcopy(cached[1])
 
 
 class ConfigLoader:
@@ -20,17 +62,16 @@ class ConfigLoader:
     @staticmethod
     def load_yaml_config(file_path: str) -> Dict[str, Any]:
         """
-        加载YAML格式配置文件
+        加载YAML格式配置文件，同一文件未修改时复用已解析的结果
         
         Args:
             file_path (str): 配置文件路径
             
         Returns:
-            Dict[str, Any]: 配置数据
+            Dict[str, Any]: 配置数据（副本，调用方可自由修改）
         """
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return yaml.safe_load(f) or {}
+            return _load_cached(file_path, lambda f: yaml.load(f, Loader=_YAML_LOADER) or {})
         except FileNotFoundError:
             print(f"配置文件未找到: {file_path}")
             return {}
@@ -44,17 +85,16 @@ class ConfigLoader:
     @staticmethod
     def load_json_config(file_path: str) -> Dict[str, Any]:
         """
-        加载JSON格式配置文件
+        加载JSON格式配置文件，同一文件未修改时复用已解析的结果
         
         Args:
             file_path (str): 配置文件路径
             
         Returns:
-            Dict[str, Any]: 配置数据
+            Dict[str, Any]: 配置数据（副本，调用方可自由修改）
         """
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return _load_cached(file_path, lambda f: _json_loads(f.read()))
         except FileNotFoundError:
             print(f"配置文件未找到: {file_path}")
             return {}
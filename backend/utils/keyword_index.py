@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+关键词首字符索引
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+class LeadCharIndex:
+    """
+    按关键词首字符分组的规则索引
+    
+    匹配时只检查首字符出现在文本中的关键词组，文本中不含某组首字符时整组跳过，
+    从而避免对每个关键词都做一次子串扫描。
+    """
+    
+    def __init__(self, keyword_rules: Iterable[Tuple[str, int]]):
+        """
+        初始化索引
+        
+        Args:
+            keyword_rules (Iterable[Tuple[str, int]]): (关键词, 规则序号)序列
+        """
+        self._index: Dict[str, List[Tuple[str, int]]] = {}
+        for keyword, rule in keyword_rules:
+            if keyword:
+                self._index.setdefault(keyword[0], []).append((keyword, rule))
+    
+    def first_match(self, text: str, limit: Optional[int] = None) -> Optional[int]:
+        """
+        查找文本命中的序号最小的规则
+        
+        Args:
+            text (str): 待匹配文本
+            limit (int, optional): 只考虑序号小于该值的规则
+        
+        Returns:
+            Optional[int]: 命中的规则序号，未命中返回None
+        """
+        best = limit
+        for lead in self._index.keys() & set(text):
+            for keyword, rule in self._index[lead]:
+                if (best is None or rule < best) and keyword in text:
+                    best = rule
+        return best if best != limit else None
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+LFU缓存
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class LFUCache:
+    """
+    最不经常使用（LFU）淘汰的线程安全缓存
+    
+    每个访问频次维护一个按插入顺序排列的键集合，读写和淘汰均为O(1)；
+    容量已满时淘汰访问频次最低的条目，频次相同时淘汰最早进入该频次的条目。
+    """
+    
+    def __init__(self, capacity: int = 50000, track_stats: bool = False):
+        """
+        初始化缓存
+        
+        Args:
+            capacity (int): 最大条目数
+            track_stats (bool): 是否统计命中与未命中次数
+        """
+        self.capacity = capacity
+        self.track_stats = track_stats
+        self.hits = 0
+        self.misses = 0
+        
+        self._lock = threading.Lock()
+        # 键 -> (值, 访问频次)
+        self._entries: Dict[Hashable, Tuple[Any, int]] = {}
+        # 访问频次 -> 该频次下的键（按进入顺序）
+        self._buckets: Dict[int, "OrderedDict[Hashable, None]"] = {}
+        self._min_frequency = 0
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        读取缓存
+        
+        Args:
+            key (Hashable): 键
+        
+        Returns:
+            Optional[Any]: 缓存的值，未命中返回None
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                if self.track_stats:
+                    self.misses += 1
+                return None
+            
+            if self.track_stats:
+                self.hits += 1
+            value, frequency = entry
+            self._promote(key, frequency)
+            self._entries[key] = (value, frequency + 1)
+            return value
+    
+    def put(self, key: Hashable, value: Any):
+        """
+        写入缓存
+        
+        Args:
+            key (Hashable): 键
+            value (Any): 值
+        """
+        if self.capacity <= 0:
+            return
+        
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                frequency = entry[1]
+                self._promote(key, frequency)
+                self._entries[key] = (value, frequency + 1)
+                return
+            
+            if len(self._entries) >= self.capacity:
+                # 淘汰访问频次最低的条目中最早的一个
+                bucket = self._buckets[self._min_frequency]
+                evicted, _ = bucket.popitem(last=False)
+                if not bucket:
+                    del self._buckets[self._min_frequency]
+                del self._entries[evicted]
+            
+            self._entries[key] = (value, 1)
+            self._buckets.setdefault(1, OrderedDict())[key] = None
+            self._min_frequency = 1
+    
+    def clear(self):
+        """清空缓存"""
+        with self._lock:
+            self._entries.clear()
+            self._buckets.clear()
+            self._min_frequency = 0
+            self.hits = 0
+            self.misses = 0
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def _promote(self, key: Hashable, frequency: int):
+        """
+        将键从当前频次移到下一频次（调用方需持有锁）
+        
+        Args:
+            key (Hashable): 键
+            frequency (int): 当前访问频次
+        """
+        bucket = self._buckets[frequency]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[frequency]
+            if self._min_frequency == frequency:
+                self._min_frequency = frequency + 1
+        self._buckets.setdefault(frequency + 1, OrderedDict())[key] = None
@@ -65,7 +65,7 @@ class ModelManager:
         """
         # 生成版本号
         version_content = f"{model_name}_{model_path}_{datetime.now().isoformat()}"
-        version = hashlib.md5(version_content.encode()).hexdigest()[:8]
+        version = hashlib.blake2s(version_content.encode(), digest_size=4).hexdigest()
         
         # 创建模型版本
         model_version = ModelVersion(
@@ -221,20 +221,38 @@ class ModelManager:
         test_config = self.ab_tests[test_name]
         if not test_config['active']:
             return None
+        
+        return self._assign_variant(test_name, user_id, test_config['variants'])
+    
+    def _assign_variant(self, test_name: str, user_id: str, variants: List[Dict[str, Any]]) -> Optional[str]:
+        """
+        按用户ID和测试名称的哈希值确定性地分配变体
+        
+        Args:
+            test_name: 测试名称
+            user_id: 用户ID
+            variants: 模型变体列表
             
-        # 使用用户ID哈希值进行流量分配
-        user_hash = int(hashlib.md5(user_id.encode()).hexdigest(), 16)
-        traffic_position = user_hash % 100
+        Returns:
+            str: 模型变体名称
+        """
+        if not variants:
+            return None
+        
+        # 哈希值映射到[0, 总流量)区间，同一用户在同一测试中总是落在同一位置
+        digest = hashlib.blake2s(f"{user_id}:{test_name}".encode(), digest_size=8).digest()
+        total_percentage = sum(variant.get('traffic_percentage', 0) for variant in variants)
+        traffic_position = int.from_bytes(digest, 'big') / 2 ** 64 * total_percentage
         
         # 根据流量分配确定变体
         cumulative_percentage = 0
-        for variant in test_config['variants']:
+        for variant in variants:
             cumulative_percentage += variant.get('traffic_percentage', 0)
-            if traffic_position <= cumulative_percentage:
+            if traffic_position < cumulative_percentage:
                 return variant.get('name')
                 
         # 默认返回第一个变体
-        return test_config['variants'][0].get('name') if test_config['variants'] else None
+        return variants[0].get('name')
     
     def stop_ab_test(self, test_name: str) -> bool:
         """
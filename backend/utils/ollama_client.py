@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+复用HTTP连接的Ollama模型客户端
+"""
+
+import asyncio
+import atexit
+import os
+import threading
+from contextlib import closing
+from typing import Any, AsyncIterator, Dict, Iterator, List, Mapping, Optional
+
+import orjson
+import requests
+from requests.adapters import HTTPAdapter
+from langchain.callbacks.manager import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain.llms.base import LLM
+from langchain.schema.output import GenerationChunk
+
+
+# 连接池大小，与Ollama服务端的并行数匹配并留出余量
+HTTP_POOL_SIZE = max(32, int(os.environ.get('OLLAMA_NUM_PARALLEL', 8)) * 4)
+
+# 进程内共享的HTTP会话
+_http_session: Optional[requests.Session] = None
+_http_session_lock = threading.Lock()
+
+
+def get_http_session() -> requests.Session:
+    """
+    获取进程内共享的HTTP会话，首次调用时创建
+    
+    Returns:
+        requests.Session: 带连接池的HTTP会话
+    """
+    global _http_session
+    with _http_session_lock:
+        if _http_session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=HTTP_POOL_SIZE)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            _http_session = session
+    return _http_session
+
+
+@atexit.register
+def close_http_session():
+    """关闭进程内共享的HTTP会话，释放连接池中的连接（进程退出时自动调用）"""
+    global _http_session
+    with _http_session_lock:
+        if _http_session is not None:
+            _http_session.close()
+            _http_session = None
+
+
+class PooledOllama(LLM):
+    """
+    经进程内共享的HTTP会话调用Ollama生成接口的LangChain模型，
+    同步和异步调用复用同一个连接池，避免每次调用都重新建立TCP连接
+    """
+    
+    # Ollama服务地址
+    base_url: str = "http://localhost:11434"
+    
+    # 模型名称
+    model: str = "llama2"
+    
+    # 采样温度，未设置时使用模型默认值
+    temperature: Optional[float] = None
+    
+    # 默认停止词
+    stop: Optional[List[str]] = None
+    
+    # 请求超时时间（秒）
+    timeout: Optional[int] = None
+    
+    # 附加的请求头（如Authorization）
+    headers: Optional[dict] = None
+    
+    @property
+    def _llm_type(self) -> str:
+        """模型类型"""
+        return "ollama"
+    
+    @property
+    def _identifying_params(self) -> Mapping[str, Any]:
+        """标识模型的参数"""
+        return {"model": self.model, "temperature": self.temperature}
+    
+    def _request_payload(self, prompt: str, stop: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        构造生成接口的请求体
+        
+        Args:
+            prompt (str): 提示词
+            stop (List[str], optional): 停止词
+        
+        Returns:
+            Dict[str, Any]: 请求体
+        """
+        if self.stop is not None and stop is not None:
+            raise ValueError("`stop` found in both the input and default params.")
+        
+        options: Dict[str, Any] = {"stop": stop or self.stop or []}
+        if self.temperature is not None:
+            options["temperature"] = self.temperature
+        return {"model": self.model, "prompt": prompt, "options": options}
+    
+    def _stream(self, prompt: str, stop: Optional[List[str]] = None,
+                run_manager: Optional[CallbackManagerForLLMRun] = None,
+                **kwargs: Any) -> Iterator[GenerationChunk]:
+        """
+        经共享的HTTP会话发送流式生成请求
+        
+        Args:
+            prompt (str): 提示词
+            stop (List[str], optional): 停止词
+            run_manager (CallbackManagerForLLMRun, optional): 回调管理器
+        
+        Yields:
+            GenerationChunk: 生成的文本片段
+        """
+        response = get_http_session().post(
+            url=f"{self.base_url}/api/generate",
+            headers={"Content-Type": "application/json", **(self.headers or {})},
+            json=self._request_payload(prompt, stop),
+            stream=True,
+            timeout=self.timeout,
+        )
+        with closing(response):
+            if response.status_code != 200:
+                raise ValueError(
+                    f"Ollama call failed with status code {response.status_code}."
+                    f" Details: {response.text}"
+                )
+            
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                data = orjson.loads(line)
+                chunk = GenerationChunk(text=data.get("response", ""))
+                if run_manager is not None:
+                    run_manager.on_llm_new_token(chunk.text)
+                yield chunk
+                if data.get("done"):
+                    break
+    
+    def _call(self, prompt: str, stop: Optional[List[str]] = None,
+              run_manager: Optional[CallbackManagerForLLMRun] = None, **kwargs: Any) -> str:
+        """
+        生成完整响应
+        
+        Args:
+            prompt (str): 提示词
+            stop (List[str], optional): 停止词
+            run_manager (CallbackManagerForLLMRun, optional): 回调管理器
+        
+        Returns:
+            str: 响应文本
+        """
+        return ''.join(chunk.text for chunk in self._stream(prompt, stop, run_manager, **kwargs))
+    
+    async def _acall(self, prompt: str, stop: Optional[List[str]] = None,
+                     run_manager: Optional[AsyncCallbackManagerForLLMRun] = None, **kwargs: Any) -> str:
+        """
+        异步生成完整响应，阻塞的HTTP请求在线程池中执行
+        
+        Args:
+            prompt (str): 提示词
+            stop (List[str], optional): 停止词
+            run_manager (AsyncCallbackManagerForLLMRun, optional): 回调管理器
+        
+        Returns:
+            str: 响应文本
+        """
+        return await asyncio.to_thread(self._call, prompt, stop, None, **kwargs)
+    
+    async def _astream(self, prompt: str, stop: Optional[List[str]] = None,
+                       run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+                       **kwargs: Any) -> AsyncIterator[GenerationChunk]:
+        """
+        异步流式生成，在线程池中逐个读取响应片段
+        
+        Args:
+            prompt (str): 提示词
+            stop (List[str], optional): 停止词
+            run_manager (AsyncCallbackManagerForLLMRun, optional): 回调管理器
+        
+        Yields:
+            GenerationChunk: 生成的文本片段
+        """
+        chunks = self._stream(prompt, stop, None, **kwargs)
+        try:
+            while True:
+                chunk = await asyncio.to_thread(next, chunks, None)
+                if chunk is None:
+                    break
+                if run_manager is not None:
+                    await run_manager.on_llm_new_token(chunk.text)
+                yield chunk
+        finally:
+            # 提前结束时关闭响应，连接归还连接池
+            chunks.close()
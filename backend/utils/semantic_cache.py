@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+LLM响应语义缓存
+"""
+
+import logging
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import numpy as np
+
+
+logger = logging.getLogger('EduAI.SemanticCache')
+
+
+class SemanticCache:
+    """
+    语义缓存类，按问题文本嵌入向量的余弦相似度复用已生成的LLM响应
+    
+    相同命名空间（如模型名+年级）内，问题完全相同时直接命中；否则计算问题的嵌入向量，
+    与已缓存向量做一次矩阵乘法求余弦相似度，超过阈值即复用对应响应。
+    缓存条目数达到上限后按最近最少使用淘汰。
+    """
+    
+    def __init__(self, embed_fn: Callable[[str], List[float]], similarity_threshold: float = 0.95,
+                 max_entries: int = 10000, enabled: bool = True):
+        """
+        初始化语义缓存
+        
+        Args:
+            embed_fn (Callable[[str], List[float]]): 文本嵌入函数
+            similarity_threshold (float): 判定命中的最小余弦相似度
+            max_entries (int): 最大缓存条目数
+            enabled (bool): 是否启用缓存
+        """
+        self.embed_fn = embed_fn
+        self.similarity_threshold = similarity_threshold
+        self.max_entries = max_entries
+        self.enabled = enabled
+        
+        self._lock = threading.Lock()
+        # 向量矩阵在首次写入时按嵌入维度分配
+        self._vectors: Optional[np.ndarray] = None
+        self._namespace_ids = np.zeros(max_entries, dtype=np.int32)
+        self._last_used = np.zeros(max_entries, dtype=np.int64)
+        self._responses: List[Optional[str]] = [None] * max_entries
+        self._slot_keys: List[Optional[Tuple[str, str]]] = [None] * max_entries
+        self._exact_slots: Dict[Tuple[str, str], int] = {}
+        self._namespaces: Dict[str, int] = {}
+        self._size = 0
+        self._clock = 0
+    
+    def lookup(self, text: str, namespace: str = '') -> Tuple[Optional[str], Optional[np.ndarray]]:
+        """
+        查询缓存
+        
+        Args:
+            text (str): 问题文本
+            namespace (str): 命名空间，只在相同命名空间内匹配
+        
+        Returns:
+            Tuple[Optional[str], Optional[np.ndarray]]: (命中的响应, 问题的嵌入向量)，
+            嵌入向量可传给put以避免重复计算
+        """
+        if not self.enabled:
+            return None, None
+        
+        key = (namespace, text)
+        with self._lock:
+            slot = self._exact_slots.get(key)
+            if slot is not None:
+                self._touch(slot)
+                return self._responses[slot], None
+            if namespace not in self._namespaces:
+                return None, None
+        
+        embedding = self._embed(text)
+        if embedding is None:
+            return None, None
+        
+        with self._lock:
+            size = self._size
+            if size == 0:
+                return None, embedding
+            similarities = self._vectors[:size] @ embedding
+            similarities[self._namespace_ids[:size] != self._namespaces[namespace]] = -1.0
+            best = int(np.argmax(similarities))
+            if similarities[best] >= self.similarity_threshold:
+                self._touch(best)
+                return self._responses[best], embedding
+        
+        return None, embedding
+    
+    def put(self, text: str, namespace: str, response: str, embedding: Optional[np.ndarray] = None):
+        """
+        写入缓存
+        
+        Args:
+            text (str): 问题文本
+            namespace (str): 命名空间
+            response (str): LLM响应
+            embedding (np.ndarray, optional): lookup返回的嵌入向量
+        """
+        if not self.enabled:
+            return
+        
+        if embedding is None:
+            embedding = self._embed(text)
+            if embedding is None:
+                return
+        
+        key = (namespace, text)
+        with self._lock:
+            slot = self._exact_slots.get(key)
+            if slot is None:
+                if self._vectors is None:
+                    self._vectors = np.zeros((self.max_entries, embedding.shape[0]), dtype=np.float32)
+                if self._size < self.max_entries:
+                    slot = self._size
+                    self._size += 1
+                else:
+                    # 淘汰最近最少使用的条目
+                    slot = int(np.argmin(self._last_used))
+                    del self._exact_slots[self._slot_keys[slot]]
+                self._exact_slots[key] = slot
+                self._slot_keys[slot] = key
+            
+            namespace_id = self._namespaces.setdefault(namespace, len(self._namespaces))
+            self._vectors[slot] = embedding
+            self._namespace_ids[slot] = namespace_id
+            self._responses[slot] = response
+            self._touch(slot)
+    
+    def clear(self):
+        """清空缓存"""
+        with self._lock:
+            self._exact_slots.clear()
+            self._namespaces.clear()
+            self._responses = [None] * self.max_entries
+            self._slot_keys = [None] * self.max_entries
+            self._last_used[:] = 0
+            self._size = 0
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    def _touch(self, slot: int):
+        """更新条目的最近使用时间（调用方需持有锁）"""
+        self._clock += 1
+        self._last_used[slot] = self._clock
+    
+    def _embed(self, text: str) -> Optional[np.ndarray]:
+        """
+        计算归一化的嵌入向量
+        
+        Args:
+            text (str): 文本
+        
+        Returns:
+            Optional[np.ndarray]: 单位长度的float32向量，嵌入服务不可用时返回None
+        """
+        try:
+            vector = np.asarray(self.embed_fn(text), dtype=np.float32)
+        except Exception as e:
+            logger.warning("计算文本嵌入时出错: %s", e)
+            return None
+        
+        norm = np.linalg.norm(vector)
+        if norm == 0:
+            return None
+        return vector / norm
+
+
+def create_ollama_semantic_cache(config: Dict[str, Any]) -> SemanticCache:
+    """
+    根据配置创建使用Ollama嵌入模型的语义缓存
+    
+    Args:
+        config (Dict[str, Any]): semantic_cache配置
+    
+    Returns:
+        SemanticCache: 语义缓存实例
+    """
+    from langchain.embeddings import OllamaEmbeddings
+    
+    embeddings = OllamaEmbeddings(model=config.get('embedding_model', 'nomic-embed-text'))
+    return SemanticCache(
+        embeddings.embed_query,
+        similarity_threshold=config.get('similarity_threshold', 0.95),
+        max_entries=config.get('max_entries', 10000),
+        enabled=config.get('enabled', False)
+    )
\ No newline at end of file
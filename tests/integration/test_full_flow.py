@@ -10,6 +10,7 @@ import json
 import tempfile
 import os
 from backend.app import create_app
+from backend.api.routes import flush_persistence
 from backend.database.manager import DatabaseManager
 
 
@@ -52,7 +53,8 @@ class TestFullFlow(unittest.TestCase):
         self.assertIn('response', data)
         self.assertIn('agent', data)
         
-        # 检查对话历史
+        # 检查对话历史（等待后台持久化完成）
+        flush_persistence()
         history_response = self.client.get(f'/api/user/{user_id}/history')
         self.assertEqual(history_response.status_code, 200)
         
@@ -86,7 +88,8 @@ class TestFullFlow(unittest.TestCase):
             data = json.loads(response.data)
             self.assertEqual(data['status'], 'success')
         
-        # 检查对话历史
+        # 检查对话历史（等待后台持久化完成）
+        flush_persistence()
         history_response = self.client.get(f'/api/user/{user_id}/history?limit=10')
         self.assertEqual(history_response.status_code, 200)
         
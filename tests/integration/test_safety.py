@@ -9,6 +9,7 @@ import unittest
 import json
 from unittest.mock import patch
 from backend.app import create_app
+from backend.api.routes import flush_persistence
 
 
 class TestSafetyFlow(unittest.TestCase):
@@ -113,9 +114,10 @@ class TestSafetyFlow(unittest.TestCase):
         # 检查响应
         self.assertEqual(response.status_code, 200)
         
-        # 验证数据库调用
-        mock_db.insert_safety_log.assert_called_once()
-        mock_db.insert_conversation.assert_called_once()
+        # 验证数据库调用（等待后台持久化完成）
+        flush_persistence()
+        mock_db.insert_safety_logs.assert_called_once()
+        mock_db.insert_conversations.assert_called_once()
     
     def test_safety_violations_endpoint(self):
         """测试安全违规记录接口"""
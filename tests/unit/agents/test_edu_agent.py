@@ -5,6 +5,7 @@
 EduAgent单元测试
 """
 
+import asyncio
 import unittest
 from backend.agents.edu_agent import EduAgent
 
@@ -34,6 +35,32 @@ class TestEduAgent(unittest.TestCase):
         self.assertEqual(result["agent"], "EduAgent")
         self.assertEqual(result["status"], "success")
     
+    def test_aprocess_request(self):
+        """测试异步处理请求"""
+        input_data = {
+            "text": "什么是光合作用？",
+            "user_id": "test_user"
+        }
+        
+        result = asyncio.run(self.agent.aprocess(input_data))
+        self.assertIn("response", result)
+        self.assertEqual(result["agent"], "EduAgent")
+        self.assertEqual(result["status"], "success")
+    
+    def test_process_stream(self):
+        """测试流式处理请求"""
+        input_data = {
+            "text": "你好",
+            "user_id": "test_user"
+        }
+        
+        async def collect():
+            return [chunk async for chunk in self.agent.process_stream(input_data)]
+        
+        chunks = asyncio.run(collect())
+        self.assertGreater(len(chunks), 0)
+        self.assertGreater(len(''.join(chunks)), 0)
+    
     def test_generate_educational_response(self):
         """测试生成教育响应"""
         response = self.agent._generate_educational_response("你好")
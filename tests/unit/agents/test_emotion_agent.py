@@ -5,6 +5,7 @@
 EmotionAgent单元测试
 """
 
+import asyncio
 import unittest
 from backend.agents.emotion_agent import EmotionAgent
 
@@ -35,6 +36,33 @@ class TestEmotionAgent(unittest.TestCase):
         self.assertEqual(result["agent"], "EmotionAgent")
         self.assertEqual(result["status"], "success")
     
+    def test_aprocess_request(self):
+        """测试异步处理请求"""
+        input_data = {
+            "text": "我今天很开心",
+            "user_id": "test_user",
+            "emotion": "happy"
+        }
+        
+        result = asyncio.run(self.agent.aprocess(input_data))
+        self.assertIn("response", result)
+        self.assertEqual(result["agent"], "EmotionAgent")
+        self.assertEqual(result["status"], "success")
+    
+    def test_process_stream(self):
+        """测试流式处理请求"""
+        input_data = {
+            "text": "你好",
+            "user_id": "test_user"
+        }
+        
+        async def collect():
+            return [chunk async for chunk in self.agent.process_stream(input_data)]
+        
+        chunks = asyncio.run(collect())
+        self.assertGreater(len(chunks), 0)
+        self.assertGreater(len(''.join(chunks)), 0)
+    
     def test_generate_emotional_response(self):
         """测试生成情感响应"""
         response = self.agent._generate_emotional_response("我很 sad", "sad")
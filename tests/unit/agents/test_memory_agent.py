@@ -5,8 +5,10 @@
 MemoryAgent单元测试
 """
 
+import json
 import unittest
 import os
+import tempfile
 from backend.agents.memory_agent import MemoryAgent
 
 
@@ -19,7 +21,8 @@ class TestMemoryAgent(unittest.TestCase):
     
     def tearDown(self):
         """测试后清理"""
-        # 删除测试产生的内存文件
+        # 等待后台写入完成后删除测试产生的内存文件
+        self.agent._flush()
         if os.path.exists(self.agent.memory_file):
             os.remove(self.agent.memory_file)
     
@@ -68,6 +71,22 @@ class TestMemoryAgent(unittest.TestCase):
         self.assertIn("history", result)
         self.assertGreater(len(result["history"]), 0)
     
+    def test_user_memory(self):
+        """测试添加和获取用户内存"""
+        self.agent.process({
+            "action": "add_to_memory",
+            "user_id": "memory_test_user",
+            "human_message": "你好",
+            "ai_message": "你好！有什么可以帮助你的吗？"
+        })
+        
+        result = self.agent.process({"action": "get_memory", "user_id": "memory_test_user"})
+        memory = result["memory"]
+        self.assertEqual(len(memory), 2)
+        self.assertEqual(memory[0].content, "你好")
+        self.assertEqual(memory[-1].content, "你好！有什么可以帮助你的吗？")
+        self.assertEqual([m.content for m in memory[:1]], ["你好"])
+    
     def test_memory_persistence(self):
         """测试记忆持久化"""
         # 存储一些数据
@@ -85,6 +104,29 @@ class TestMemoryAgent(unittest.TestCase):
         history = new_agent._retrieve_conversation_history("persistence_test_user")
         self.assertGreater(len(history), 0)
         self.assertEqual(history[0]["user_input"], "测试持久化")
+    
+    def test_import_legacy_memory(self):
+        """测试JSONL文件不存在时导入旧版JSON记忆文件"""
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(temp_dir.name)
+        
+        with open("memory_data.json", "w", encoding="utf-8") as f:
+            json.dump({
+                "conversations": {"legacy_user": [{"user_input": "旧对话", "agent_response": "旧回复"}]},
+                "user_profiles": {"legacy_user": {"grade": "小学"}}
+            }, f, ensure_ascii=False)
+        
+        agent = MemoryAgent()
+        self.assertEqual(agent._retrieve_conversation_history("legacy_user")[0]["user_input"], "旧对话")
+        self.assertEqual(agent.user_profiles["legacy_user"], {"grade": "小学"})
+        self.assertTrue(os.path.exists(agent.memory_file))
+        
+        # 之后从JSONL文件加载
+        reloaded = MemoryAgent()
+        self.assertEqual(reloaded._retrieve_conversation_history("legacy_user")[0]["user_input"], "旧对话")
+        self.assertEqual(reloaded.user_profiles["legacy_user"], {"grade": "小学"})
 
 
 if __name__ == '__main__':
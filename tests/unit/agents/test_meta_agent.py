@@ -47,6 +47,20 @@ class TestMetaAgent(unittest.TestCase):
             intent = self.agent._identify_intent(text)
             self.assertEqual(intent, "emotion", f"Failed for text: {text}")
     
+    def test_overlapping_keywords_without_automaton(self):
+        """测试未安装pyahocorasick时重叠关键词的计数与自动机一致"""
+        text = "为什么我很开心快乐"
+        self.agent._intent_automaton = None
+        self.agent._any_keyword_pattern = self.agent._compile_keywords(
+            self.agent.edu_keywords + self.agent.emotion_keywords
+        )
+        self.agent._category_patterns = {
+            'edu': self.agent._compile_keywords(self.agent.edu_keywords, overlapping=True),
+            'emotion': self.agent._compile_keywords(self.agent.emotion_keywords, overlapping=True),
+        }
+        self.assertEqual(self.agent._identify_intent(text), "edu")
+        self.assertEqual(self.agent._identify_intent("今天天气"), "unknown")
+    
     def test_process_edu_request(self):
         """测试处理教育请求"""
         input_data = {
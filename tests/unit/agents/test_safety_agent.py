@@ -6,7 +6,8 @@ SafetyAgent单元测试
 """
 
 import unittest
-from backend.agents.safety_agent import SafetyAgent
+from unittest.mock import patch
+from backend.agents.safety_agent import SafetyAgent, hyperscan
 
 
 class TestSafetyAgent(unittest.TestCase):
@@ -45,6 +46,30 @@ class TestSafetyAgent(unittest.TestCase):
         self.assertEqual(result["status"], "rejected")
         self.assertIn("reason", result)
     
+    def test_fullwidth_digits_match_patterns(self):
+        """测试全角数字的手机号和身份证号同样被识别"""
+        self.assertEqual(self.agent._find_unsafe_pattern("电话１３８１２３４５６７８"), "phone")
+        self.assertIsNotNone(self.agent._find_unsafe_pattern("号码１１０１０１２００００１０１１２３Ｘ"))
+        self.assertIsNone(self.agent._find_unsafe_pattern("今天学了１２３"))
+    
+    @unittest.skipIf(hyperscan is None, "未安装Hyperscan")
+    def test_fullwidth_digits_match_hyperscan_database(self):
+        """测试Hyperscan数据库与re使用相同的模式，同样识别全角数字"""
+        self.assertIsNotNone(self.agent._pattern_db)
+        self.assertEqual(self.agent._find_unsafe_pattern("电话１３８１２３４５６７８"), "phone")
+        self.assertEqual(self.agent._find_unsafe_pattern("电话13812345678"), "phone")
+    
+    def test_model_variant_does_not_change_shared_llm(self):
+        """测试A/B测试模型只用于当前请求，不修改共享的模型"""
+        default_llm = self.agent.llm
+        with patch.object(self.agent, 'get_model_config', return_value={'model_name': 'variant-model'}), \
+             patch.object(self.agent, '_check_content_safety_with_llm', return_value=(True, "LLM检查通过")) as check:
+            result = self.agent.process({"response": "这是一个安全的响应", "agent": "TestAgent"})
+        
+        self.assertEqual(result["status"], "approved")
+        self.assertEqual(check.call_args[0][1].model, 'variant-model')
+        self.assertIs(self.agent.llm, default_llm)
+    
     def test_generate_safe_response(self):
         """测试生成安全响应"""
         response = self.agent.generate_safe_response("危险请求")
@@ -62,6 +62,34 @@ class TestAPIRoutes(unittest.TestCase):
         self.assertIn('agent', data)
         self.assertEqual(data['status'], 'success')
     
+    @patch('backend.api.routes.meta_agent')
+    @patch('backend.api.routes.safety_agent')
+    @patch('backend.api.routes.db_manager')
+    def test_chat_endpoint_null_grade_and_emotion(self, mock_db, mock_safety, mock_meta):
+        """测试年级和情绪为null时使用默认值"""
+        mock_meta.process.return_value = {
+            'response': '这是一个测试响应',
+            'agent': 'TestAgent'
+        }
+        
+        mock_safety.process.return_value = {
+            'status': 'approved',
+            'message': 'Content approved',
+            'original_response': '这是一个测试响应'
+        }
+        
+        response = self.client.post('/api/chat',
+                                  json={
+                                      'text': '你好',
+                                      'grade': None,
+                                      'emotion': None
+                                  })
+        
+        self.assertEqual(response.status_code, 200)
+        input_data = mock_meta.process.call_args[0][0]
+        self.assertEqual(input_data['grade'], '小学')
+        self.assertEqual(input_data['emotion'], 'neutral')
+    
     @patch('backend.api.routes.meta_agent')
     @patch('backend.api.routes.safety_agent')
     @patch('backend.api.routes.db_manager')
@@ -111,7 +139,7 @@ class TestAPIRoutes(unittest.TestCase):
     def test_user_history_endpoint(self, mock_queries):
         """测试用户历史接口"""
         # 模拟查询结果
-        mock_queries.get_user_conversation_history.return_value = []
+        mock_queries.iter_user_conversation_history.return_value = iter([])
         
         response = self.client.get('/api/user/test_user/history')
         
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+音频编解码单元测试
+"""
+
+import io
+import unittest
+import wave
+import numpy as np
+from backend.audio.codecs import AudioCodec
+
+
+class TestAudioCodec(unittest.TestCase):
+    """AudioCodec测试类"""
+    
+    def setUp(self):
+        """测试前准备"""
+        self.codec = AudioCodec()
+    
+    def test_encode_wav_readable_by_wave(self):
+        """测试编码结果可被标准库wave模块读取"""
+        audio_data = np.array([0, 1000, -1000, 32767, -32768], dtype=np.int16)
+        wav_data = self.codec.encode_wav(audio_data, sample_rate=16000)
+        
+        with wave.open(io.BytesIO(wav_data), 'rb') as wav_file:
+            self.assertEqual(wav_file.getnchannels(), 1)
+            self.assertEqual(wav_file.getsampwidth(), 2)
+            self.assertEqual(wav_file.getframerate(), 16000)
+            frames = wav_file.readframes(wav_file.getnframes())
+        
+        np.testing.assert_array_equal(np.frombuffer(frames, dtype='<i2'), audio_data)
+    
+    def test_encode_decode_roundtrip(self):
+        """测试浮点音频编码后解码"""
+        audio_data = np.array([0.0, 0.5, -1.0, 1.0], dtype=np.float32)
+        result = self.codec.decode_wav(self.codec.encode_wav(audio_data, sample_rate=22050))
+        
+        self.assertEqual(result['sample_rate'], 22050)
+        np.testing.assert_array_equal(result['audio_data'], [0, 16384, -32767, 32767])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,6 +5,7 @@
 STT服务单元测试
 """
 
+import asyncio
 import unittest
 import numpy as np
 from backend.audio.stt_service import STTService
@@ -49,6 +50,21 @@ class TestSTTService(unittest.TestCase):
         self.assertIn("language", result)
         self.assertIn("timestamps", result)
         self.assertIsInstance(result["timestamps"], list)
+    
+    def test_transcribe_async(self):
+        """测试并发异步语音转文本"""
+        audios = [np.random.randn(length).astype(np.float32) for length in (500, 1000, 800)]
+        
+        async def run():
+            return await asyncio.gather(*(self.stt_service.transcribe_async(audio) for audio in audios))
+        
+        results = asyncio.run(run())
+        
+        # 检查每个请求都得到结果
+        self.assertEqual(len(results), len(audios))
+        for result in results:
+            self.assertIn("text", result)
+            self.assertIn("confidence", result)
 
 
 if __name__ == '__main__':
@@ -5,6 +5,7 @@
 TTS服务单元测试
 """
 
+import asyncio
 import unittest
 import numpy as np
 from backend.audio.tts_service import TTSService
@@ -56,6 +57,21 @@ class TestTTSService(unittest.TestCase):
         self.assertEqual(result["text"], text)
         self.assertEqual(result["emotion"], emotion)
     
+    def test_synthesize_async(self):
+        """测试并发异步文本转语音"""
+        texts = ["你好", "再见", "谢谢"]
+        
+        async def run():
+            return await asyncio.gather(*(self.tts_service.synthesize_async(text) for text in texts))
+        
+        results = asyncio.run(run())
+        
+        # 检查每个请求都得到结果
+        self.assertEqual(len(results), len(texts))
+        for result in results:
+            self.assertIn("audio_data", result)
+            self.assertIsInstance(result["audio_data"], np.ndarray)
+    
     def test_get_emotion_voice_params(self):
         """测试获取情感语音参数"""
         emotions = ["happy", "sad", "neutral", "angry"]
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+声纹验证单元测试
+"""
+
+import os
+import tempfile
+import unittest
+import numpy as np
+from backend.audio.verification import VoiceVerification
+from backend.database.manager import DatabaseManager
+
+
+class TestVoiceVerification(unittest.TestCase):
+    """VoiceVerification测试类"""
+    
+    def setUp(self):
+        """测试前准备"""
+        self.verification = VoiceVerification()
+        rng = np.random.default_rng(0)
+        self.samples = {f"user{i}": rng.standard_normal(8000, dtype=np.float32) for i in range(4)}
+        for user_id, sample in self.samples.items():
+            self.verification.register_user(user_id, sample)
+    
+    def test_verify_user(self):
+        """测试单个用户验证"""
+        result = self.verification.verify_user("user1", self.samples["user1"])
+        self.assertTrue(result["verified"])
+        self.assertAlmostEqual(result["similarity"], 1.0, places=5)
+    
+    def test_reject_different_signal(self):
+        """测试其它声音不能通过验证"""
+        rng = np.random.default_rng(1)
+        t = np.arange(8000, dtype=np.float32) / self.verification.sample_rate
+        tone = 0.5 * np.sin(2 * np.pi * 440 * t) + 0.1 * rng.standard_normal(8000, dtype=np.float32)
+        
+        for sample in (rng.standard_normal(8000, dtype=np.float32), tone):
+            result = self.verification.verify_user("user1", sample)
+            self.assertFalse(result["verified"])
+            self.assertLess(result["similarity"], result["threshold"])
+    
+    def test_pcm_bytes_sample(self):
+        """测试奇数长度的PCM字节串丢弃末尾字节后正常提取，非数值样本返回明确的错误"""
+        pcm = (self.samples["user1"] * 8000).astype(np.int16).tobytes() + b"\x01"
+        self.assertTrue(self.verification.register_user("pcm_user", pcm))
+        self.assertTrue(self.verification.verify_user("pcm_user", pcm)["verified"])
+        
+        result = self.verification.verify_user("pcm_user", "sample")
+        self.assertFalse(result["verified"])
+        self.assertIn("不支持的声音样本类型", result["message"])
+    
+    def test_verify_batch(self):
+        """测试与全部注册用户批量比对"""
+        result = self.verification.verify_batch(self.samples["user2"], top_k=2)
+        
+        self.assertTrue(result["verified"])
+        self.assertEqual(result["user_id"], "user2")
+        self.assertEqual(len(result["matches"]), 2)
+        self.assertGreaterEqual(result["matches"][0]["similarity"], result["matches"][1]["similarity"])
+    
+    def test_verify_batch_with_candidates(self):
+        """测试只与候选用户比对"""
+        result = self.verification.verify_batch(self.samples["user2"], candidate_ids=["user0", "user3"])
+        self.assertNotIn("user2", [match["user_id"] for match in result["matches"]])
+    
+    def test_score_matrix(self):
+        """测试多个查询与多个用户的相似度矩阵"""
+        queries = np.stack([
+            self.verification._extract_voiceprint_for_model(self.samples[user_id]) for user_id in ("user0", "user3")
+        ])
+        scores, ids = self.verification.score_matrix(queries, candidate_ids=["user3", "user0"])
+        
+        self.assertEqual(ids, ["user3", "user0"])
+        self.assertEqual(scores.shape, (2, 2))
+        np.testing.assert_allclose(np.diag(scores[:, ::-1]), [1.0, 1.0], rtol=1e-5)
+    
+    def test_voiceprints_persisted(self):
+        """测试声纹持久化到数据库后由新实例加载"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db_manager = DatabaseManager(os.path.join(temp_dir, "test.db"))
+            VoiceVerification(db_manager).register_user("user1", self.samples["user1"])
+            
+            result = VoiceVerification(db_manager).verify_user("user1", self.samples["user1"])
+            self.assertTrue(result["verified"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+数据库管理器单元测试
+"""
+
+import os
+import tempfile
+import unittest
+from backend.database.manager import DatabaseManager
+
+
+class TestDatabaseManager(unittest.TestCase):
+    """DatabaseManager测试类"""
+    
+    def setUp(self):
+        """测试前准备"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_manager = DatabaseManager(os.path.join(self.temp_dir.name, "test.db"))
+        self.db_manager.insert_conversations([
+            {'user_id': 'user1', 'user_input': '我想学习数学分数', 'agent_response': '好的，我们开始吧', 'agent_name': 'EduAgent'},
+            {'user_id': 'user1', 'user_input': '今天有点难过', 'agent_response': '别担心', 'agent_name': 'EmotionAgent'},
+        ])
+    
+    def tearDown(self):
+        """测试后清理"""
+        self.temp_dir.cleanup()
+    
+    def test_search_conversations(self):
+        """测试全文检索对话记录"""
+        results = self.db_manager.search_conversations("学习数学")
+        self.assertEqual([row['agent_name'] for row in results], ['EduAgent'])
+        
+        # 短关键词退回LIKE检索
+        results = self.db_manager.search_conversations("难过")
+        self.assertEqual([row['agent_name'] for row in results], ['EmotionAgent'])
+    
+    def test_search_index_follows_updates(self):
+        """测试对话修改和删除后全文索引同步"""
+        self.db_manager.execute_update("UPDATE conversations SET user_input = '我想学习语文' WHERE agent_name = 'EduAgent'")
+        self.assertEqual(self.db_manager.search_conversations("学习数学"), [])
+        self.assertEqual(len(self.db_manager.search_conversations("学习语文")), 1)
+        
+        self.db_manager.execute_update("DELETE FROM conversations WHERE agent_name = 'EduAgent'")
+        self.assertEqual(self.db_manager.search_conversations("学习语文"), [])
+    
+    def test_summary_counts(self):
+        """测试统计汇总表随对话增删改同步"""
+        self.assertEqual(self.db_manager.get_summary_counts('conversation_agent_counts'),
+                         {'EduAgent': 1, 'EmotionAgent': 1})
+        
+        self.db_manager.execute_update("UPDATE conversations SET agent_name = 'EduAgent' WHERE agent_name = 'EmotionAgent'")
+        self.assertEqual(self.db_manager.get_summary_counts('conversation_agent_counts'), {'EduAgent': 2})
+        
+        self.db_manager.execute_update("DELETE FROM conversations WHERE user_input = '今天有点难过'")
+        self.assertEqual(self.db_manager.get_summary_counts('conversation_agent_counts'), {'EduAgent': 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
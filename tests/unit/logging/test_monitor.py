@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+SystemMonitor单元测试
+"""
+
+import unittest
+from unittest.mock import patch
+
+from backend.logging.monitor import MetricSeries, SystemMonitor
+
+
+class TestSystemMonitor(unittest.TestCase):
+    """SystemMonitor测试类"""
+    
+    def setUp(self):
+        """测试前准备"""
+        self.monitor = SystemMonitor()
+    
+    def test_metric_stats(self):
+        """测试指标统计"""
+        for value in (1.0, 2.0, 6.0):
+            self.monitor.record_metric('response_time', value)
+        
+        stats = self.monitor.get_metric_stats('response_time')
+        self.assertEqual(stats['count'], 3)
+        self.assertEqual(stats['min'], 1.0)
+        self.assertEqual(stats['max'], 6.0)
+        self.assertAlmostEqual(stats['avg'], 3.0)
+        self.assertEqual(stats['latest'], 6.0)
+    
+    def test_unknown_metric(self):
+        """测试未记录的指标"""
+        self.assertEqual(self.monitor.get_metric_stats('missing'), {})
+    
+    def test_time_window(self):
+        """测试只统计时间窗口内的数据点"""
+        with patch('backend.logging.monitor.time.monotonic', side_effect=[0.0, 1000.0, 1001.0, 1010.0]):
+            self.monitor.record_metric('error_rate', 0.5)
+            self.monitor.record_metric('error_rate', 0.1)
+            self.monitor.record_metric('error_rate', 0.2)
+            stats = self.monitor.get_metric_stats('error_rate', time_window_minutes=1)
+        
+        self.assertEqual(stats['count'], 2)
+        self.assertAlmostEqual(stats['avg'], 0.15)
+    
+    def test_alert_fires_once_when_average_crosses_threshold(self):
+        """测试平均值越过阈值时只告警一次，回落后可再次告警"""
+        alerts = []
+        self.monitor.add_alert_callback(lambda alert_type, info: alerts.append(info))
+        self.monitor.start_monitoring()
+        
+        self.monitor.record_metric('error_rate', 0.5)
+        self.monitor.record_metric('error_rate', 0.5)
+        self.assertEqual(len(alerts), 1)
+        self.assertEqual(alerts[0]['metric'], 'error_rate')
+        self.assertEqual(alerts[0]['threshold'], 0.05)
+        
+        for _ in range(50):
+            self.monitor.record_metric('error_rate', 0.0)
+        self.monitor.record_metric('error_rate', 1.0)
+        self.assertEqual(len(alerts), 2)
+    
+    def test_no_alert_when_not_monitoring(self):
+        """测试未开始监控时不告警"""
+        alerts = []
+        self.monitor.add_alert_callback(lambda alert_type, info: alerts.append(info))
+        self.monitor.record_metric('response_time', 100.0)
+        self.assertEqual(alerts, [])
+
+
+class TestMetricSeries(unittest.TestCase):
+    """MetricSeries测试类"""
+    
+    def test_wraps_around(self):
+        """测试缓冲区满后覆盖最早的数据点且保持时间顺序"""
+        series = MetricSeries(capacity=3)
+        for i in range(5):
+            series.append(float(i), float(i * 10), {})
+        
+        self.assertEqual(series.count, 3)
+        self.assertEqual(series.window(0.0).tolist(), [20.0, 30.0, 40.0])
+        self.assertEqual(series.window(3.0).tolist(), [30.0, 40.0])
+        self.assertEqual(series.window(5.0).tolist(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+异步工具单元测试
+"""
+
+import asyncio
+import unittest
+from backend.utils.async_utils import AsyncMicroBatcher, LoopLocalSemaphore, iterate_async_sync, run_coroutine_sync
+
+
+class TestAsyncMicroBatcher(unittest.TestCase):
+    """AsyncMicroBatcher测试类"""
+    
+    def setUp(self):
+        """测试前准备"""
+        self.batches = []
+        
+        async def handler(items):
+            self.batches.append(list(items))
+            return [item * 2 for item in items]
+        
+        self.handler = handler
+    
+    def test_concurrent_requests_are_batched(self):
+        """测试并发请求被合并为一批"""
+        batcher = AsyncMicroBatcher(self.handler, max_batch_size=8, max_wait=0.01)
+        
+        async def run():
+            return await asyncio.gather(*(batcher.submit(i) for i in range(5)))
+        
+        results = asyncio.run(run())
+        self.assertEqual(results, [0, 2, 4, 6, 8])
+        self.assertEqual(self.batches, [[0, 1, 2, 3, 4]])
+    
+    def test_max_batch_size(self):
+        """测试达到单批上限时立即提交"""
+        batcher = AsyncMicroBatcher(self.handler, max_batch_size=2, max_wait=1.0)
+        
+        async def run():
+            return await asyncio.gather(*(batcher.submit(i) for i in range(4)))
+        
+        results = asyncio.run(run())
+        self.assertEqual(results, [0, 2, 4, 6])
+        self.assertEqual(self.batches, [[0, 1], [2, 3]])
+    
+    def test_key_fn_groups_requests(self):
+        """测试不同分组键的请求不会被合并"""
+        batcher = AsyncMicroBatcher(self.handler, max_batch_size=8, max_wait=0.01,
+                                    key_fn=lambda item: item % 2)
+        
+        async def run():
+            return await asyncio.gather(*(batcher.submit(i) for i in range(4)))
+        
+        asyncio.run(run())
+        self.assertEqual(sorted(self.batches), [[0, 2], [1, 3]])
+    
+    def test_handler_error_propagates(self):
+        """测试批处理函数出错时每个请求都收到异常"""
+        async def failing_handler(items):
+            raise ValueError("batch failed")
+        
+        batcher = AsyncMicroBatcher(failing_handler, max_batch_size=8, max_wait=0.01)
+        
+        with self.assertRaises(ValueError):
+            asyncio.run(batcher.submit(1))
+    
+    def test_run_coroutine_sync(self):
+        """测试在后台事件循环中同步执行协程"""
+        batcher = AsyncMicroBatcher(self.handler, max_batch_size=8, max_wait=0.01)
+        self.assertEqual(run_coroutine_sync(batcher.submit(21)), 42)
+    
+    def test_iterate_async_sync(self):
+        """测试同步逐项消费异步生成器"""
+        async def numbers():
+            for i in range(3):
+                await asyncio.sleep(0)
+                yield i
+        
+        self.assertEqual(list(iterate_async_sync(numbers())), [0, 1, 2])
+
+
+class TestLoopLocalSemaphore(unittest.TestCase):
+    """LoopLocalSemaphore测试类"""
+    
+    def test_limits_concurrency_on_background_loop(self):
+        """测试在创建线程以外的事件循环中争用时正常限流"""
+        semaphore = LoopLocalSemaphore(2)
+        active = []
+        peak = []
+        
+        async def worker():
+            async with semaphore:
+                active.append(1)
+                peak.append(len(active))
+                await asyncio.sleep(0.01)
+                active.pop()
+        
+        async def run():
+            await asyncio.gather(*(worker() for _ in range(6)))
+        
+        run_coroutine_sync(run())
+        self.assertEqual(max(peak), 2)
+    
+    def test_separate_semaphore_per_loop(self):
+        """测试不同事件循环各自创建信号量"""
+        semaphore = LoopLocalSemaphore(1)
+        
+        async def get():
+            return semaphore.get()
+        
+        first = asyncio.run(get())
+        self.assertIsNot(first, run_coroutine_sync(get()))
+        self.assertIs(run_coroutine_sync(get()), run_coroutine_sync(get()))
+
+
+if __name__ == '__main__':
+    unittest.main()
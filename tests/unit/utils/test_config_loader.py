@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+ConfigLoader单元测试
+"""
+
+import os
+import tempfile
+import unittest
+from backend.utils.config_loader import ConfigLoader
+
+
+class TestConfigLoader(unittest.TestCase):
+    """ConfigLoader测试类"""
+    
+    def setUp(self):
+        """测试前准备"""
+        fd, self.path = tempfile.mkstemp(suffix=".yaml")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write("audio:\n  sample_rate: 22050\n")
+    
+    def tearDown(self):
+        """测试后清理"""
+        os.remove(self.path)
+    
+    def test_load_yaml_returns_copy(self):
+        """测试缓存的YAML配置以副本返回"""
+        config = ConfigLoader.load_config(self.path)
+        config["audio"]["sample_rate"] = 16000
+        self.assertEqual(ConfigLoader.load_config(self.path), {"audio": {"sample_rate": 22050}})
+    
+    def test_load_yaml_reloads_modified_file(self):
+        """测试文件修改后重新加载"""
+        self.assertEqual(ConfigLoader.load_config(self.path)["audio"]["sample_rate"], 22050)
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write("audio:\n  sample_rate: 16000\n")
+        stat = os.stat(self.path)
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        self.assertEqual(ConfigLoader.load_config(self.path)["audio"]["sample_rate"], 16000)
+    
+    def test_load_json_reloads_modified_file(self):
+        """测试JSON配置同样缓存并在文件修改后重新加载"""
+        fd, path = tempfile.mkstemp(suffix=".json")
+        self.addCleanup(os.remove, path)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write('{"sample_rate": 22050}')
+        config = ConfigLoader.load_config(path)
+        config["sample_rate"] = 0
+        self.assertEqual(ConfigLoader.load_config(path), {"sample_rate": 22050})
+        
+        with open(path, "w", encoding="utf-8") as f:
+            f.write('{"sample_rate": 8000}')
+        self.assertEqual(ConfigLoader.load_config(path), {"sample_rate": 8000})
+
+
+if __name__ == "__main__":
+    unittest.main()
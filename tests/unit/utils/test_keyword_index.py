@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+LeadCharIndex单元测试
+"""
+
+import unittest
+from backend.utils.keyword_index import LeadCharIndex
+
+
+class TestLeadCharIndex(unittest.TestCase):
+    """LeadCharIndex测试类"""
+    
+    def setUp(self):
+        """测试前准备"""
+        self.index = LeadCharIndex([('你好', 0), ('数学', 1), ('数字', 2), ('英语', 3)])
+    
+    def test_first_match(self):
+        """测试返回序号最小的命中规则"""
+        self.assertEqual(self.index.first_match("我喜欢英语和数学"), 1)
+        self.assertEqual(self.index.first_match("你好，数学老师"), 0)
+        self.assertEqual(self.index.first_match("数字游戏"), 2)
+    
+    def test_no_match(self):
+        """测试未命中时返回None"""
+        self.assertIsNone(self.index.first_match("今天天气很好"))
+        self.assertIsNone(self.index.first_match(""))
+    
+    def test_limit(self):
+        """测试只考虑序号小于limit的规则"""
+        self.assertIsNone(self.index.first_match("我喜欢英语", 3))
+        self.assertEqual(self.index.first_match("我喜欢英语和数学", 3), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
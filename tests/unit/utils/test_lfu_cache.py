@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+LFUCache单元测试
+"""
+
+import unittest
+from backend.utils.lfu_cache import LFUCache
+
+
+class TestLFUCache(unittest.TestCase):
+    """LFUCache测试类"""
+    
+    def setUp(self):
+        """测试前准备"""
+        self.cache = LFUCache(capacity=2, track_stats=True)
+    
+    def test_get_and_put(self):
+        """测试读写缓存"""
+        self.assertIsNone(self.cache.get("a"))
+        self.cache.put("a", (True, "内容安全"))
+        self.assertEqual(self.cache.get("a"), (True, "内容安全"))
+        self.assertEqual(self.cache.hits, 1)
+        self.assertEqual(self.cache.misses, 1)
+    
+    def test_evicts_least_frequently_used(self):
+        """测试淘汰访问频次最低的条目"""
+        self.cache.put("a", 1)
+        self.cache.put("b", 2)
+        self.cache.get("a")
+        self.cache.put("c", 3)
+        self.assertEqual(self.cache.get("a"), 1)
+        self.assertIsNone(self.cache.get("b"))
+        self.assertEqual(self.cache.get("c"), 3)
+        self.assertEqual(len(self.cache), 2)
+    
+    def test_evicts_oldest_on_tie(self):
+        """测试频次相同时淘汰最早的条目"""
+        self.cache.put("a", 1)
+        self.cache.put("b", 2)
+        self.cache.put("c", 3)
+        self.assertIsNone(self.cache.get("a"))
+        self.assertEqual(self.cache.get("b"), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
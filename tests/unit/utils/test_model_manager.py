@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+ModelManager单元测试
+"""
+
+import unittest
+from backend.utils.model_manager import ModelManager
+
+
+class TestModelManager(unittest.TestCase):
+    """ModelManager测试类"""
+    
+    def setUp(self):
+        """测试前准备"""
+        self.manager = ModelManager()
+        self.manager.start_ab_test("edu_agent_test", [
+            {"name": "control", "model": "qwen:0.5b", "traffic_percentage": 30},
+            {"name": "treatment", "model": "qwen:1.8b", "traffic_percentage": 70}
+        ])
+    
+    def test_variant_is_sticky(self):
+        """测试同一用户总是分配到同一变体"""
+        variant = self.manager.get_ab_test_variant("edu_agent_test", "test_user")
+        for _ in range(3):
+            self.assertEqual(self.manager.get_ab_test_variant("edu_agent_test", "test_user"), variant)
+    
+    def test_traffic_split(self):
+        """测试流量按比例分配"""
+        variants = [self.manager.get_ab_test_variant("edu_agent_test", f"user_{i}") for i in range(2000)]
+        ratio = variants.count("control") / len(variants)
+        self.assertAlmostEqual(ratio, 0.3, delta=0.05)
+    
+    def test_stop_ab_test(self):
+        """测试停止A/B测试后不再分配变体"""
+        self.manager.get_ab_test_variant("edu_agent_test", "test_user")
+        self.manager.stop_ab_test("edu_agent_test")
+        self.assertIsNone(self.manager.get_ab_test_variant("edu_agent_test", "test_user"))
+        self.assertEqual(self.manager.get_agent_model_config("edu_agent", "test_user")["model_name"],
+                         self.manager.agent_config["edu_agent"].get("ollama_model", "qwen:0.5b"))
+
+
+if __name__ == '__main__':
+    unittest.main()
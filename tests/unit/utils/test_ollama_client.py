@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+PooledOllama单元测试
+"""
+
+import asyncio
+import unittest
+from unittest.mock import MagicMock, patch
+from backend.utils import ollama_client
+from backend.utils.ollama_client import PooledOllama
+
+
+def fake_response(status_code=200):
+    """构造返回两段文本的流式响应"""
+    response = MagicMock(status_code=status_code, text="error")
+    response.iter_lines.return_value = [
+        b'{"response": "\xe4\xbd\xa0\xe5\xa5\xbd", "done": false}',
+        b'',
+        b'{"response": "!", "done": true}',
+    ]
+    return response
+
+
+class TestPooledOllama(unittest.TestCase):
+    """PooledOllama测试类"""
+    
+    def setUp(self):
+        """测试前准备"""
+        self.session = MagicMock()
+        self.session.post.side_effect = lambda **kwargs: fake_response()
+        patcher = patch.object(ollama_client, 'get_http_session', return_value=self.session)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.llm = PooledOllama(model="qwen:0.5b", temperature=0.2)
+    
+    def test_invoke_uses_shared_session(self):
+        """测试同步调用经共享会话发送请求并拼接流式响应"""
+        self.assertEqual(self.llm.invoke("问题"), "你好!")
+        
+        payload = self.session.post.call_args.kwargs['json']
+        self.assertEqual(payload['model'], "qwen:0.5b")
+        self.assertEqual(payload['options']['temperature'], 0.2)
+        self.assertTrue(self.session.post.call_args.kwargs['stream'])
+    
+    def test_agenerate_and_astream(self):
+        """测试异步批量生成和流式生成"""
+        async def run():
+            result = await self.llm.agenerate(["问题1", "问题2"])
+            chunks = [chunk async for chunk in self.llm.astream("问题")]
+            return result, chunks
+        
+        result, chunks = asyncio.run(run())
+        self.assertEqual([generations[0].text for generations in result.generations], ["你好!", "你好!"])
+        self.assertEqual(chunks, ["你好", "!"])
+    
+    def test_error_status(self):
+        """测试非200响应抛出异常"""
+        self.session.post.side_effect = lambda **kwargs: fake_response(status_code=404)
+        with self.assertRaises(ValueError):
+            self.llm.invoke("问题")
+
+
+class TestHTTPSession(unittest.TestCase):
+    """共享HTTP会话测试类"""
+    
+    def test_close_http_session(self):
+        """测试关闭共享会话后重新创建"""
+        session = ollama_client.get_http_session()
+        ollama_client.close_http_session()
+        self.assertIsNot(ollama_client.get_http_session(), session)
+        ollama_client.close_http_session()
+
+
+if __name__ == '__main__':
+    unittest.main()
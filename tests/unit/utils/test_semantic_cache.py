@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+SemanticCache单元测试
+"""
+
+import unittest
+from backend.utils.semantic_cache import SemanticCache
+
+
+def fake_embed(text):
+    """按字符计数构造的简易嵌入函数"""
+    return [text.count('光'), text.count('合'), text.count('数'), text.count('学') + 0.01]
+
+
+class TestSemanticCache(unittest.TestCase):
+    """SemanticCache测试类"""
+    
+    def setUp(self):
+        """测试前准备"""
+        self.cache = SemanticCache(fake_embed, similarity_threshold=0.95, max_entries=2)
+    
+    def test_exact_hit(self):
+        """测试完全相同的问题命中缓存"""
+        self.cache.put("什么是光合作用", "qwen|小学", "响应")
+        response, _ = self.cache.lookup("什么是光合作用", "qwen|小学")
+        self.assertEqual(response, "响应")
+    
+    def test_semantic_hit(self):
+        """测试相似问题命中缓存"""
+        self.cache.put("什么是光合作用", "qwen|小学", "响应")
+        response, embedding = self.cache.lookup("光合作用是什么", "qwen|小学")
+        self.assertEqual(response, "响应")
+        self.assertIsNotNone(embedding)
+    
+    def test_namespace_isolation(self):
+        """测试不同命名空间互不命中"""
+        self.cache.put("什么是光合作用", "qwen|小学", "响应")
+        response, _ = self.cache.lookup("光合作用是什么", "qwen|初中")
+        self.assertIsNone(response)
+    
+    def test_miss_on_dissimilar_text(self):
+        """测试不相似问题未命中"""
+        self.cache.put("什么是光合作用", "qwen|小学", "响应")
+        response, _ = self.cache.lookup("数学怎么学", "qwen|小学")
+        self.assertIsNone(response)
+    
+    def test_lru_eviction(self):
+        """测试超过容量时淘汰最近最少使用的条目"""
+        self.cache.put("光合", "ns", "A")
+        self.cache.put("数学", "ns", "B")
+        self.cache.lookup("光合", "ns")
+        self.cache.put("学学", "ns", "C")
+        
+        self.assertEqual(len(self.cache), 2)
+        self.assertEqual(self.cache.lookup("光合", "ns")[0], "A")
+        self.assertEqual(self.cache.lookup("学学", "ns")[0], "C")
+    
+    def test_disabled(self):
+        """测试禁用缓存"""
+        cache = SemanticCache(fake_embed, enabled=False)
+        cache.put("光合", "ns", "A")
+        self.assertEqual(cache.lookup("光合", "ns"), (None, None))
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file